@@ -0,0 +1,264 @@
+# analytics.py
+"""Laporan pemakaian ruangan dari seluruh riwayat booking (arsip + aktif).
+
+Riwayat dimuat sekali menjadi tabel kolom pandas: ruangan, dosen dan mata
+kuliah sebagai kategori, tanggal sebagai datetime64, jam sebagai menit int.
+Arsip dan penyimpanan aktif di-cache terpisah menurut versinya, jadi booking
+baru hanya membangun ulang bagian aktif yang kecil. Semua laporan dihitung
+dengan groupby/bincount di atas kolom tersebut, tanpa loop per booking.
+
+    python analytics.py --first 2024-01-01 --last 2024-12-31
+"""
+
+import argparse
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from archive import ArchiveReader, partition_path
+from booking_index import BookingIndex, get_booking_index
+from booking_service import CLOSING_HOUR, OPENING_HOUR
+from storage import BookingRecord, file_version
+
+GROUPS = {"room": "Ruangan", "booked_by": "Dosen", "matkul": "Mata Kuliah"}
+HOURS = np.arange(OPENING_HOUR, CLOSING_HOUR)
+WEEKDAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+# Hari yang dihitung sebagai jam buka untuk utilisasi (0 = Senin)
+OPERATING_WEEKDAYS = (0, 1, 2, 3, 4)
+CATEGORIES = ("room", "booked_by", "matkul")
+
+
+def records_frame(records: List[BookingRecord]) -> pd.DataFrame:
+    """Record booking sebagai tabel kolom, satu baris per booking"""
+    if not records:
+        empty = pd.Series([], dtype=str)
+        return pd.DataFrame(
+            {
+                "room": pd.Categorical(empty),
+                "date": pd.to_datetime(empty),
+                "start": np.array([], dtype=np.int16),
+                "end": np.array([], dtype=np.int16),
+                "hours": np.array([], dtype=np.float32),
+                "booked_by": pd.Categorical(empty),
+                "matkul": pd.Categorical(empty),
+            }
+        )
+    start = np.fromiter((r.start for r in records), np.int16, len(records))
+    end = np.fromiter((r.end for r in records), np.int16, len(records))
+    # Tanggal berulang ribuan kali: parse nilai uniknya saja
+    codes, dates = pd.factorize(np.array([r.date for r in records], dtype=object))
+    return pd.DataFrame(
+        {
+            "room": pd.Categorical([r.room for r in records]),
+            "date": pd.to_datetime(dates, format="%Y-%m-%d")[codes],
+            "start": start,
+            "end": end,
+            "hours": (end - start).astype(np.float32) / 60,
+            "booked_by": pd.Categorical([r.booked_by for r in records]),
+            "matkul": pd.Categorical([r.matkul or "-" for r in records]),
+        }
+    )
+
+
+def _days(first: str, last: str) -> int:
+    return (pd.Timestamp(last) - pd.Timestamp(first)).days + 1
+
+
+def select(
+    frame: pd.DataFrame,
+    first: Optional[str] = None,
+    last: Optional[str] = None,
+    rooms: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Baris antara dua tanggal (inklusif), opsional hanya ruangan tertentu"""
+    mask = np.ones(len(frame), dtype=bool)
+    if first:
+        mask &= (frame["date"] >= pd.Timestamp(first)).to_numpy()
+    if last:
+        mask &= (frame["date"] <= pd.Timestamp(last)).to_numpy()
+    if rooms is not None:
+        mask &= frame["room"].isin(list(rooms)).to_numpy()
+    return frame[mask]
+
+
+def usage_summary(
+    frame: pd.DataFrame,
+    by: str,
+    first: str,
+    last: str,
+    rooms: Optional[List[str]] = None,
+    weekdays: Iterable[int] = OPERATING_WEEKDAYS,
+) -> pd.DataFrame:
+    """Jumlah booking, total jam dan rata-rata jam per minggu per ruangan/dosen/matkul.
+
+    Untuk ruangan juga dihitung utilisasi: jam terpakai dibagi jam buka
+    selama rentang tanggal, hanya pada `weekdays` (default Senin-Jumat).
+    `rooms` menambahkan ruangan yang tidak pernah dibooking sebagai baris 0.
+    """
+    frame = select(frame, first, last, rooms)
+    grouped = frame.groupby(by, observed=True)["hours"].agg(["size", "sum"])
+    if by == "room" and rooms is not None:
+        grouped = grouped.reindex(rooms, fill_value=0)
+    weeks = _days(first, last) / 7
+    summary = pd.DataFrame(
+        {
+            "Booking": grouped["size"].astype(np.int64),
+            "Total Jam": grouped["sum"].astype(np.float64).round(1),
+            "Jam per Minggu": (grouped["sum"] / weeks).astype(np.float64).round(1),
+        }
+    )
+    if by == "room":
+        open_days = pd.date_range(first, last).weekday.isin(list(weekdays)).sum()
+        open_hours = max(int(open_days), 1) * len(HOURS)
+        summary["Utilisasi"] = (grouped["sum"] / open_hours).astype(np.float64)
+    summary.index.name = GROUPS[by]
+    return summary.sort_values("Total Jam", ascending=False)
+
+
+def weekly_hours(
+    frame: pd.DataFrame,
+    by: str,
+    first: str,
+    last: str,
+    rooms: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Jam terpakai per minggu (kolom = Senin awal minggu) untuk setiap grup"""
+    frame = select(frame, first, last, rooms)
+    week = frame["date"] - pd.to_timedelta(frame["date"].dt.weekday, unit="D")
+    table = (
+        frame.groupby([frame[by], week], observed=True)["hours"]
+        .sum()
+        .unstack(fill_value=0)
+    )
+    table.columns = [column.strftime("%Y-%m-%d") for column in table.columns]
+    table.index.name = GROUPS[by]
+    return table.astype(np.float64).round(1)
+
+
+def peak_hours(
+    frame: pd.DataFrame,
+    first: str,
+    last: str,
+    rooms: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Rata-rata jumlah ruangan terpakai per hari (baris) dan jam (kolom).
+
+    Setiap booking dipotong ke setiap slot jam buka (overlap dalam menit),
+    lalu dijumlahkan per hari dengan bincount, satu kolom jam sekaligus.
+    """
+    frame = select(frame, first, last, rooms)
+    start = frame["start"].to_numpy(np.int32)
+    end = frame["end"].to_numpy(np.int32)
+    weekday = frame["date"].dt.weekday.to_numpy()
+    # Berapa kali setiap hari (Senin..Minggu) muncul dalam rentang
+    days = pd.date_range(first, last).weekday
+    occurrences = np.maximum(np.bincount(days, minlength=7), 1)
+    table = np.empty((7, len(HOURS)))
+    for i, hour in enumerate(HOURS):
+        overlap = np.clip(
+            np.minimum(end, (hour + 1) * 60) - np.maximum(start, hour * 60), 0, 60
+        )
+        table[:, i] = np.bincount(weekday, weights=overlap / 60, minlength=7)
+    return pd.DataFrame(
+        (table / occurrences[:, None]).round(2),
+        index=pd.Index(WEEKDAYS, name="Hari"),
+        columns=[f"{hour:02d}:00" for hour in HOURS],
+    )
+
+
+class BookingAnalytics:
+    """Riwayat booking sebagai satu tabel kolom, dibangun ulang hanya jika berubah"""
+
+    def __init__(
+        self,
+        index: Optional[BookingIndex] = None,
+        archive: Optional[ArchiveReader] = None,
+    ):
+        self.index = index or get_booking_index()
+        self.archive = archive or ArchiveReader()
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Hashable, pd.DataFrame]] = {}
+        self._frame: Optional[Tuple[Hashable, pd.DataFrame]] = None
+
+    def _part(self, name: str, version: Hashable, load) -> pd.DataFrame:
+        cached = self._cache.get(name)
+        if cached is None or cached[0] != version:
+            cached = (version, records_frame(load()))
+            self._cache[name] = cached
+        return cached[1]
+
+    def frame(self) -> pd.DataFrame:
+        """Semua booking, arsip dulu lalu penyimpanan aktif"""
+        with self._lock:
+            months = self.archive.months()
+            archive_version = tuple(
+                (month, file_version(partition_path(month, self.archive.archive_dir)))
+                for month in months
+            )
+            version = (archive_version, self.index.version())
+            if self._frame is not None and self._frame[0] == version:
+                return self._frame[1]
+            archived = self._part("archive", archive_version, self.archive.records)
+            active = self._part("active", version[1], self.index.load_records)
+            frame = pd.concat([archived, active], ignore_index=True)
+            for column in CATEGORIES:
+                frame[column] = union_categoricals([archived[column], active[column]])
+            # Kompaksi yang terputus bisa meninggalkan booking di kedua sumber
+            if len(archived) and len(active):
+                if archived["date"].max() >= active["date"].min():
+                    frame = frame.drop_duplicates(
+                        ["room", "date", "start"], keep="last", ignore_index=True
+                    )
+            self._frame = (version, frame)
+            return frame
+
+    def date_range(self) -> Optional[Tuple[str, str]]:
+        frame = self.frame()
+        if frame.empty:
+            return None
+        return (
+            frame["date"].min().strftime("%Y-%m-%d"),
+            frame["date"].max().strftime("%Y-%m-%d"),
+        )
+
+
+_shared_analytics: Optional[BookingAnalytics] = None
+_shared_lock = threading.Lock()
+
+
+def get_booking_analytics() -> BookingAnalytics:
+    global _shared_analytics
+    with _shared_lock:
+        if _shared_analytics is None:
+            _shared_analytics = BookingAnalytics()
+        return _shared_analytics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--first", help="YYYY-MM-DD, default booking pertama")
+    parser.add_argument("--last", help="YYYY-MM-DD, default booking terakhir")
+    parser.add_argument("--by", choices=sorted(GROUPS), default="room")
+    parser.add_argument(
+        "--weekend", action="store_true", help="Sabtu-Minggu ikut dihitung jam buka"
+    )
+    args = parser.parse_args()
+    analytics = get_booking_analytics()
+    span = analytics.date_range()
+    if span is None:
+        print("Belum ada booking")
+        return
+    first, last = args.first or span[0], args.last or span[1]
+    frame = analytics.frame()
+    with pd.option_context("display.width", 120, "display.max_rows", 50):
+        weekdays = range(7) if args.weekend else OPERATING_WEEKDAYS
+        print(usage_summary(frame, args.by, first, last, weekdays=weekdays))
+        print()
+        print(peak_hours(frame, first, last))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+# api.py
+"""HTTP/JSON API kecil di atas BookingService, tanpa Streamlit.
+
+    python api.py --port 8080
+
+Endpoint:
+    GET    /health
+    GET    /rooms[?building=A10][&floor=1][&min_capacity=30][&facilities=AC]
+    GET    /rooms/free?date=2025-02-03&start_hour=9&duration=2[&students=35][&facilities=..]
+    GET    /status?date=2025-02-03&hour=9
+    GET    /availability?room=A10.01.01&date=2025-02-03&start_hour=9&duration=2
+    GET    /free?duration=2&from=2025-02-03&to=2025-02-07[&rooms=..][&hours=8,9][&students=..]
+    GET    /bookings?date=2025-02-03[&room=A10.01.01]
+    GET    /bookings/user?user=...[&from=2025-02-03]
+    POST   /bookings         {"date", "start_hour", "duration", "room", "user", "matkul"}
+    POST   /bookings/bulk    {"bookings": [...], "skip_conflicts": false}
+    DELETE /bookings?room=A10.01.01&date=2025-02-03&hour=9&user=...
+    DELETE /bookings?id=2025-02-03-0900-A10.01.01&user=...
+    GET    /waitlist?user=...
+    POST   /waitlist         {"date", "start_hour", "duration", "room", "user", "matkul", "priority"}
+    DELETE /waitlist?id=W12&user=...
+    GET    /export?room=A10.01.01|user=...|matkul=...[&format=ics|csv]
+
+Setiap booking punya `id` (tanggal, jam mulai dan ruangan); DELETE dengan id
+menghapus seluruh booking, berapa pun durasinya.
+
+Booking yang bentrok (409) bisa diantrekan lewat POST /waitlist dengan
+priority "reguler" atau "adhoc"; saat slotnya dibatalkan, antrean dengan
+prioritas tertinggi langsung dibooking.
+
+Booking dan pencarian bisa membawa kebutuhan kelas: `students` (jumlah
+mahasiswa) dan `facilities` (misalnya Proyektor,PC Lab); /rooms/free mengurutkan
+ruangan dari kapasitas yang paling pas.
+
+/export mengembalikan file kalender atau CSV dengan header ETag; kirim ulang
+ETag itu di If-None-Match dan selama booking-nya tidak berubah jawabannya 304
+tanpa isi.
+
+POST dan DELETE wajib memakai header `Authorization: Bearer <token>` sesuai
+BOOKING_API_TOKEN; selama token belum diisi keduanya ditolak (401). DELETE
+booking juga wajib menyebut `user`, dan hanya booking milik user itu yang
+terhapus.
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import os
+from datetime import date as Date, datetime, timedelta
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from booking_export import CONTENT_TYPES, BookingExporter, ExportFeed
+from booking_service import (
+    BookingConflictError,
+    BookingError,
+    BookingNotFoundError,
+    BookingPermissionError,
+    BookingService,
+    InvalidBookingError,
+    get_booking_service,
+    make_booking,
+)
+from room_catalog import RoomRequirements
+from storage import BookingRecord
+
+API_TOKEN = os.environ.get("BOOKING_API_TOKEN", "")
+MAX_BODY = 1024 * 1024
+IDLE_TIMEOUT = 15
+# Parameter query /export -> kunci BookingExporter
+EXPORT_PARAMS = {"room": "room", "user": "booked_by", "matkul": "matkul"}
+
+ERROR_STATUS = {
+    InvalidBookingError: HTTPStatus.BAD_REQUEST,
+    BookingConflictError: HTTPStatus.CONFLICT,
+    BookingNotFoundError: HTTPStatus.NOT_FOUND,
+    BookingPermissionError: HTTPStatus.FORBIDDEN,
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _param(query: Dict[str, list], name: str, cast: Callable = str, default=None):
+    if name not in query:
+        if default is not None:
+            return default
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Parameter '{name}' wajib diisi")
+    try:
+        return cast(query[name][0])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Parameter '{name}' tidak valid")
+
+
+def _whole(value) -> int:
+    """Bilangan bulat; jam seperti 9.7 ditolak, bukan dibulatkan ke bawah"""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"Bukan bilangan bulat: {value}")
+    return int(value)
+
+
+def _iso_date(value: str) -> str:
+    """Tanggal YYYY-MM-DD; tanggal rusak ditolak sebelum sampai ke storage"""
+    return Date.fromisoformat(value).isoformat()
+
+
+def _date_range(first: str, last: str):
+    try:
+        current = datetime.strptime(first, "%Y-%m-%d")
+        end = datetime.strptime(last, "%Y-%m-%d")
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Format tanggal harus YYYY-MM-DD")
+    if (end - current).days > 366:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Rentang tanggal maksimal satu tahun")
+    dates = []
+    while current <= end:
+        dates.append(current.strftime("%Y-%m-%d"))
+        current += timedelta(days=1)
+    return dates
+
+
+def _csv(value: str):
+    return [item for item in value.split(",") if item]
+
+
+def _query_requirements(query: Dict[str, list]) -> RoomRequirements:
+    return RoomRequirements(
+        _param(query, "students", int, 0), _param(query, "facilities", _csv, [])
+    )
+
+
+def _body_requirements(data: dict) -> RoomRequirements:
+    facilities = data.get("facilities", [])
+    try:
+        if not isinstance(facilities, list):
+            raise TypeError
+        return RoomRequirements(
+            int(data.get("students", 0)), [str(item) for item in facilities]
+        )
+    except (TypeError, ValueError):
+        raise ApiError(
+            HTTPStatus.BAD_REQUEST, "students harus angka dan facilities berupa list"
+        )
+
+
+def _record_json(record: BookingRecord) -> dict:
+    return {"id": record.id, **record.to_dict()}
+
+
+class BookingApi:
+    """Router request -> BookingService. Semua handler sinkron dan dijalankan
+    di thread pool, jadi I/O storage tidak memblokir event loop."""
+
+    def __init__(
+        self,
+        service: BookingService,
+        token: str = API_TOKEN,
+        exporter: Optional[BookingExporter] = None,
+    ):
+        self.service = service
+        self.token = token
+        self.exporter = exporter or BookingExporter(service.index)
+        self.routes: Dict[Tuple[str, str], Callable] = {
+            ("GET", "/health"): self.health,
+            ("GET", "/rooms"): self.rooms,
+            ("GET", "/rooms/free"): self.free_rooms,
+            ("GET", "/status"): self.status,
+            ("GET", "/availability"): self.availability,
+            ("GET", "/free"): self.free,
+            ("GET", "/bookings"): self.list_bookings,
+            ("GET", "/bookings/user"): self.user_bookings,
+            ("POST", "/bookings"): self.create_booking,
+            ("POST", "/bookings/bulk"): self.create_bulk,
+            ("DELETE", "/bookings"): self.cancel_booking,
+            ("GET", "/waitlist"): self.list_waitlist,
+            ("POST", "/waitlist"): self.join_waitlist,
+            ("DELETE", "/waitlist"): self.leave_waitlist,
+            ("GET", "/export"): self.export,
+        }
+
+    def health(self, query, body):
+        return HTTPStatus.OK, {"status": "ok"}
+
+    def rooms(self, query, body):
+        catalog = self.service.catalog
+        room_ids = catalog.filter(
+            _param(query, "building", _csv, []),
+            _param(query, "floor", lambda v: [int(f) for f in _csv(v)], []),
+            _param(query, "min_capacity", int, 0),
+            _param(query, "facilities", _csv, []),
+        )
+        return HTTPStatus.OK, {
+            "rooms": [catalog.get(room_id).to_dict() for room_id in room_ids]
+        }
+
+    def free_rooms(self, query, body):
+        rooms = self.service.find_rooms(
+            _param(query, "date", _iso_date),
+            _param(query, "start_hour", _whole),
+            _param(query, "duration", _whole, 1),
+            _query_requirements(query),
+        )
+        return HTTPStatus.OK, {"rooms": rooms}
+
+    def status(self, query, body):
+        statuses = self.service.get_room_status(
+            _param(query, "date", _iso_date), _param(query, "hour", _whole)
+        )
+        return HTTPStatus.OK, {
+            room: status.to_dict() for room, status in statuses.items()
+        }
+
+    def availability(self, query, body):
+        free = self.service.is_available(
+            _param(query, "date", _iso_date),
+            _param(query, "start_hour", _whole),
+            _param(query, "duration", _whole, 1),
+            _param(query, "room"),
+        )
+        return HTTPStatus.OK, {"available": free}
+
+    def free(self, query, body):
+        slots = self.service.find_free_slots(
+            _param(query, "duration", _whole),
+            _date_range(_param(query, "from"), _param(query, "to")),
+            _param(query, "rooms", _csv, []),
+            _param(query, "hours", lambda v: [_whole(h) for h in _csv(v)], []),
+            requirements=_query_requirements(query),
+        )
+        return HTTPStatus.OK, {
+            "slots": [
+                {"room": room, "date": date, "start_hour": start // 60}
+                for room, date, start in slots
+            ]
+        }
+
+    def list_bookings(self, query, body):
+        date = _param(query, "date", _iso_date)
+        rooms = [_param(query, "room")] if "room" in query else self.service.rooms
+        return HTTPStatus.OK, {
+            "bookings": [
+                _record_json(record)
+                for room in rooms
+                for record in self.service.index.day_bookings(date, room)
+            ]
+        }
+
+    def user_bookings(self, query, body):
+        records = self.service.my_bookings(
+            _param(query, "user"),
+            _param(query, "from", _iso_date) if "from" in query else None,
+        )
+        return HTTPStatus.OK, {"bookings": [_record_json(r) for r in records]}
+
+    def _booking_fields(self, data: dict):
+        try:
+            return (
+                _iso_date(str(data["date"])),
+                _whole(data["start_hour"]),
+                _whole(data["duration"]),
+                str(data["room"]),
+                str(data["user"]),
+                str(data.get("matkul", "-")),
+            )
+        except (KeyError, TypeError, ValueError):
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                "Booking butuh date, start_hour, duration, room dan user",
+            )
+
+    def create_booking(self, query, body):
+        record = self.service.create_booking(
+            *self._booking_fields(body), _body_requirements(body)
+        )
+        return HTTPStatus.CREATED, _record_json(record)
+
+    def create_bulk(self, query, body):
+        entries = []
+        for item in body.get("bookings", []):
+            date, start_hour, duration, room, user, matkul = self._booking_fields(item)
+            entries.append(
+                (
+                    date,
+                    make_booking(
+                        room,
+                        start_hour,
+                        duration,
+                        user,
+                        matkul,
+                        _body_requirements(item),
+                    ),
+                )
+            )
+        result = self.service.create_bookings_bulk(
+            entries, bool(body.get("skip_conflicts", False))
+        )
+
+        def rows(items):
+            return [
+                {
+                    "date": date,
+                    "room": booking.room,
+                    "start_hour": booking.start_hour,
+                    "duration": booking.duration,
+                }
+                for date, booking in items
+            ]
+
+        status = HTTPStatus.CREATED if result.booked else HTTPStatus.CONFLICT
+        return status, {
+            "booked": rows(result.booked),
+            "conflicts": rows(result.conflicts),
+            "invalid": rows(result.invalid),
+        }
+
+    def cancel_booking(self, query, body):
+        user = _param(query, "user")
+        if "id" in query:
+            record = self.service.cancel_booking_by_id(_param(query, "id"), user)
+        else:
+            record = self.service.cancel_booking(
+                _param(query, "room"),
+                _param(query, "date", _iso_date),
+                _param(query, "hour", _whole),
+                user,
+            )
+        return HTTPStatus.OK, _record_json(record)
+
+    def list_waitlist(self, query, body):
+        entries = self.service.waitlist.entries_of(_param(query, "user"))
+        return HTTPStatus.OK, {
+            "waitlist": [{"id": entry.id, **entry.to_dict()} for entry in entries]
+        }
+
+    def join_waitlist(self, query, body):
+        entry = self.service.join_waitlist(
+            *self._booking_fields(body),
+            str(body.get("priority", "reguler")),
+            _body_requirements(body),
+        )
+        return HTTPStatus.CREATED, {"id": entry.id, **entry.to_dict()}
+
+    def leave_waitlist(self, query, body):
+        self.service.leave_waitlist(_param(query, "id"), _param(query, "user"))
+        return HTTPStatus.OK, {"removed": query["id"][0]}
+
+    def export(self, query, body):
+        selected = [name for name in EXPORT_PARAMS if name in query]
+        if len(selected) != 1:
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST, "Isi tepat satu dari room, user atau matkul"
+            )
+        fmt = _param(query, "format", str, "ics")
+        if fmt not in CONTENT_TYPES:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "format harus ics atau csv")
+        value = _param(query, selected[0])
+        if selected[0] == "room" and value not in self.service.catalog:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Ruangan {value} tidak ditemukan")
+        return HTTPStatus.OK, self.exporter.feed(EXPORT_PARAMS[selected[0]], value, fmt)
+
+    def handle(
+        self, method: str, target: str, headers: Dict[str, str], raw_body: bytes
+    ) -> Tuple[HTTPStatus, Union[dict, ExportFeed]]:
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Method tidak didukung"}
+            return HTTPStatus.NOT_FOUND, {"error": "Endpoint tidak ditemukan"}
+        if method != "GET":
+            # Tanpa token yang dikonfigurasi, semua perubahan ditolak
+            if not self.token:
+                return HTTPStatus.UNAUTHORIZED, {
+                    "error": "BOOKING_API_TOKEN belum diisi, POST dan DELETE nonaktif"
+                }
+            supplied = headers.get("authorization", "")
+            if not hmac.compare_digest(supplied, f"Bearer {self.token}"):
+                return HTTPStatus.UNAUTHORIZED, {"error": "Token tidak valid"}
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Body harus objek JSON")
+            status, payload = handler(parse_qs(url.query), body)
+            if isinstance(payload, ExportFeed):
+                etags = headers.get("if-none-match", "")
+                if payload.etag in (tag.strip() for tag in etags.split(",")):
+                    return HTTPStatus.NOT_MODIFIED, payload
+            return status, payload
+        except json.JSONDecodeError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Body bukan JSON yang valid"}
+        except ApiError as e:
+            return e.status, {"error": str(e)}
+        except BookingError as e:
+            return ERROR_STATUS.get(type(e), HTTPStatus.BAD_REQUEST), {"error": str(e)}
+        except Exception as e:
+            print(f"Error handling {method} {target}: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Kesalahan server"}
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+    if not request_line:
+        return None
+    method, target, version = request_line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body terlalu besar")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version, headers, body
+
+
+def _response(
+    status: HTTPStatus, payload: Union[dict, ExportFeed], keep_alive: bool
+) -> bytes:
+    if isinstance(payload, ExportFeed):
+        # 304 hanya membawa ETag, isi feed tidak dikirim ulang
+        body = b"" if status == HTTPStatus.NOT_MODIFIED else payload.body
+        headers = (
+            f"Content-Type: {payload.content_type}\r\n"
+            f"ETag: {payload.etag}\r\n"
+            "Cache-Control: no-cache\r\n"
+            f'Content-Disposition: attachment; filename="{payload.filename}"\r\n'
+        )
+    else:
+        body = json.dumps(payload).encode()
+        headers = "Content-Type: application/json\r\n"
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"{headers}"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def serve(api: BookingApi, host: str, port: int):
+    loop = asyncio.get_running_loop()
+
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ApiError as e:
+                    writer.write(_response(e.status, {"error": str(e)}, False))
+                    break
+                except (ValueError, asyncio.IncompleteReadError):
+                    writer.write(
+                        _response(
+                            HTTPStatus.BAD_REQUEST, {"error": "Request rusak"}, False
+                        )
+                    )
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = (
+                    connection == "keep-alive"
+                    if version == "HTTP/1.0"
+                    else connection != "close"
+                )
+                status, payload = await loop.run_in_executor(
+                    None, api.handle, method, target, headers, body
+                )
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle_connection, host, port)
+    print(f"Booking API berjalan di http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(BookingApi(get_booking_service()), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# archive.py
+"""Arsip booking lama, dipartisi per bulan dalam file JSON lines terkompresi.
+
+Booking sebelum tanggal batas dipindahkan dari penyimpanan aktif ke
+data/archive/bookings-YYYY-MM.jsonl.gz. File arsip hanya pernah ditambah
+(satu member gzip baru per kompaksi), jadi tidak ada penulisan ulang.
+
+    python archive.py                     # arsipkan yang lebih lama dari ARCHIVE_KEEP_DAYS
+    python archive.py --before 2025-01-01
+"""
+
+import argparse
+import gzip
+import json
+import os
+import threading
+from datetime import date as Date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from storage import BookingRecord, BookingStorage, file_lock, get_storage
+
+ARCHIVE_DIR = "data/archive"
+# Berapa hari ke belakang yang tetap di penyimpanan aktif. Default 30 supaya
+# booking minggu lalu masih terlihat di halaman dan laporan setelah start.
+KEEP_DAYS = int(os.environ.get("ARCHIVE_KEEP_DAYS", "30"))
+
+
+def partition_path(month: str, archive_dir: str = ARCHIVE_DIR) -> str:
+    return os.path.join(archive_dir, f"bookings-{month}.jsonl.gz")
+
+
+def write_archive(records: List[BookingRecord], archive_dir: str = ARCHIVE_DIR):
+    """Tambahkan record ke partisi bulanan dan fsync sebelum kembali"""
+    os.makedirs(archive_dir, exist_ok=True)
+    by_month: Dict[str, List[BookingRecord]] = {}
+    for record in records:
+        by_month.setdefault(record.date[:7], []).append(record)
+    for month, month_records in sorted(by_month.items()):
+        lines = "".join(
+            json.dumps(record.to_dict(), separators=(",", ":")) + "\n"
+            for record in month_records
+        )
+        with open(partition_path(month, archive_dir), "ab") as f:
+            with gzip.GzipFile(fileobj=f, mode="ab") as gz:
+                gz.write(lines.encode())
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def compact(
+    storage: Optional[BookingStorage] = None,
+    before: Optional[str] = None,
+    archive_dir: str = ARCHIVE_DIR,
+) -> int:
+    """Pindahkan booking sebelum `before` (default hari ini - KEEP_DAYS) ke arsip.
+
+    Arsip ditulis di dalam commit storage sebelum booking dihapus. Jika proses
+    mati di antaranya, kompaksi berikutnya menulis ulang record yang sama dan
+    pembaca arsip membuang duplikatnya.
+    """
+    storage = storage or get_storage()
+    if before is None:
+        before = (Date.today() - timedelta(days=KEEP_DAYS)).strftime("%Y-%m-%d")
+    os.makedirs(archive_dir, exist_ok=True)
+    # Lock terpisah supaya dua kompaksi tidak menulis partisi bersamaan
+    with file_lock(os.path.join(archive_dir, "archive")):
+        return storage.remove_before(
+            before, lambda records: write_archive(records, archive_dir)
+        )
+
+
+AUTO_ARCHIVE = os.environ.get("AUTO_ARCHIVE", "1") != "0"
+_last_compacted: Optional[Date] = None
+_compact_lock = threading.Lock()
+
+
+def _compact_quietly(storage: BookingStorage, archive_dir: str):
+    try:
+        total = compact(storage, archive_dir=archive_dir)
+        if total:
+            print(f"{total} booking lama dipindahkan ke arsip")
+    except Exception as e:
+        print(f"Error archiving bookings: {e}")
+
+
+def schedule_compaction(storage: BookingStorage, archive_dir: str = ARCHIVE_DIR):
+    """Jalankan kompaksi di thread latar, paling banyak sekali per hari per proses"""
+    global _last_compacted
+    if not AUTO_ARCHIVE:
+        return
+    with _compact_lock:
+        today = Date.today()
+        if _last_compacted == today:
+            return
+        _last_compacted = today
+    threading.Thread(
+        target=_compact_quietly, args=(storage, archive_dir), daemon=True
+    ).start()
+
+
+def _months(first_date: str, last_date: str) -> List[str]:
+    current = datetime.strptime(first_date[:7], "%Y-%m")
+    last = datetime.strptime(last_date[:7], "%Y-%m")
+    months = []
+    while current <= last:
+        months.append(current.strftime("%Y-%m"))
+        current = (current + timedelta(days=32)).replace(day=1)
+    return months
+
+
+class ArchiveReader:
+    """Baca arsip untuk laporan, hanya membuka partisi bulan yang diminta"""
+
+    def __init__(self, archive_dir: str = ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+
+    def months(self) -> List[str]:
+        if not os.path.isdir(self.archive_dir):
+            return []
+        return sorted(
+            name[len("bookings-") : -len(".jsonl.gz")]
+            for name in os.listdir(self.archive_dir)
+            if name.startswith("bookings-") and name.endswith(".jsonl.gz")
+        )
+
+    def _read_month(self, month: str) -> Iterator[BookingRecord]:
+        path = partition_path(month, self.archive_dir)
+        if not os.path.exists(path):
+            return
+        # gzip.open membaca semua member yang sudah ditambahkan
+        with gzip.open(path, "rt") as f:
+            for line in f:
+                if line.strip():
+                    yield BookingRecord.from_dict(json.loads(line))
+
+    def records(
+        self,
+        first_date: Optional[str] = None,
+        last_date: Optional[str] = None,
+        room: Optional[str] = None,
+    ) -> List[BookingRecord]:
+        """Booking di arsip antara dua tanggal (inklusif), urut tanggal/ruangan/jam"""
+        months = self.months()
+        if not months:
+            return []
+        months = _months(first_date or months[0], last_date or months[-1])
+        unique: Dict[tuple, BookingRecord] = {}
+        for month in months:
+            for record in self._read_month(month):
+                if first_date and record.date < first_date:
+                    continue
+                if last_date and record.date > last_date:
+                    continue
+                if room and record.room != room:
+                    continue
+                unique[(record.date, record.room, record.start)] = record
+        return [unique[key] for key in sorted(unique)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--before", help="YYYY-MM-DD, default hari ini")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    args = parser.parse_args()
+    total = compact(before=args.before, archive_dir=args.archive_dir)
+    print(f"{total} booking dipindahkan ke {args.archive_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""Benchmark jalur utama booking pada riwayat booking sintetis.
+
+Untuk setiap backend dan ukuran riwayat (jumlah slot jam yang terisi), data
+dibangkitkan di direktori sementara lalu diukur: baca pertama, muat index,
+memori per booking, status ruangan (dict, tabel dan polling perubahan), cek
+ketersediaan, cari ruangan sesuai kebutuhan kelas, booking milik satu dosen,
+laporan utilisasi atas seluruh riwayat, ekspor .ics per ruangan (pertama dan
+dari cache), commit tunggal, commit massal, pembatalan dengan promosi daftar
+tunggu, login, dan skenario penulis paralel antar-proses.
+Output satu objek JSON per baris.
+
+    python -m benchmarks.bench_booking --sizes 1000,100000 --backend json,partitioned
+    python -m benchmarks.bench_booking --sizes 1000000 --backend sqlite --ops 500
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import wait
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import verifikasi  # noqa: E402
+from analytics import (  # noqa: E402
+    BookingAnalytics,
+    peak_hours,
+    usage_summary,
+    weekly_hours,
+)
+from archive import ArchiveReader  # noqa: E402
+from benchmarks.stress_booking import run as run_stress  # noqa: E402
+from booking_export import BookingExporter  # noqa: E402
+from booking_index import BookingIndex  # noqa: E402
+from booking_service import (  # noqa: E402
+    CLOSING_HOUR,
+    OPENING_HOUR,
+    BookingService,
+    make_booking,
+)
+from room_catalog import Room, RoomCatalog, RoomRequirements  # noqa: E402
+from storage import (  # noqa: E402
+    BookingRecord,
+    JournalBookingStorage,
+    JsonBookingStorage,
+    PartitionedBookingStorage,
+    SQLiteBookingStorage,
+)
+from waitlist import Waitlist  # noqa: E402
+
+FIRST_DATE = datetime(2020, 1, 6)
+FACILITIES = ["AC", "Proyektor", "PC Lab", "Smart Board", "Sound System"]
+
+
+def synthetic_records(slots: int, rooms: list, fill: float = 0.6, seed: int = 1):
+    """Booking 1-4 jam acak sampai total slot jam terisi mencapai `slots`"""
+    rng = random.Random(seed)
+    records = []
+    filled = 0
+    day = 0
+    while filled < slots:
+        date = (FIRST_DATE + timedelta(days=day)).strftime("%Y-%m-%d")
+        for room in rooms:
+            hour = OPENING_HOUR
+            while hour < CLOSING_HOUR and filled < slots:
+                duration = min(rng.randint(1, 4), CLOSING_HOUR - hour, slots - filled)
+                if rng.random() < fill:
+                    records.append(
+                        BookingRecord(
+                            room,
+                            date,
+                            hour * 60,
+                            (hour + duration) * 60,
+                            f"Dosen {rng.randrange(200)}",
+                            f"MK{rng.randrange(500)}",
+                        )
+                    )
+                    filled += duration
+                hour += duration
+        day += 1
+    return records, day
+
+
+def synthetic_catalog(rooms: list, seed: int = 3) -> RoomCatalog:
+    """Kapasitas dan fasilitas acak untuk setiap ruangan"""
+    rng = random.Random(seed)
+    return RoomCatalog.from_rooms(
+        Room(
+            room,
+            room.split(".")[0],
+            int(room.split(".")[1]),
+            rng.choice([20, 30, 40, 60, 100]),
+            [facility for facility in FACILITIES if rng.random() < 0.5],
+        )
+        for room in rooms
+    )
+
+
+def make_storage(backend: str, workdir: str, records: list):
+    if backend == "sqlite":
+        storage = SQLiteBookingStorage(os.path.join(workdir, "ruangans.db"))
+        with storage._transaction() as conn:
+            storage._insert(conn, records)
+            storage._bump_version(conn)
+    elif backend == "partitioned":
+        storage = PartitionedBookingStorage(os.path.join(workdir, "bookings"))
+        by_date = {}
+        for record in records:
+            by_date.setdefault(record.date, []).append(record)
+        for date, date_records in by_date.items():
+            storage._write_partition(date, date_records)
+    elif backend == "journal":
+        storage = JournalBookingStorage(os.path.join(workdir, "journal"))
+        with storage._commit():
+            storage._append(
+                {"op": "add", "bookings": [record.to_dict() for record in records]}
+            )
+            storage._write_snapshot()
+    else:
+        storage = JsonBookingStorage(os.path.join(workdir, "ruangans.json"))
+        storage._write(records)
+    return storage
+
+
+def summarize(name: str, latencies: list, **extra) -> dict:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    total = sum(latencies)
+    return {
+        "op": name,
+        "n": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "ops_per_s": round(len(latencies) / total, 1) if total else None,
+        **extra,
+    }
+
+
+def timed(fn, args_list: list) -> list:
+    latencies = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def index_memory(storage) -> dict:
+    """Memori Python yang dipegang index berisi semua booking"""
+    gc.collect()
+    tracemalloc.start()
+    index = BookingIndex(storage, check_interval=0)
+    with index._lock:
+        index._refresh_all()
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = sum(
+        len(day.records) for rooms in index._days.values() for day in rooms.values()
+    )
+    return {
+        "mb": round(used / 2**20, 2),
+        "bytes_per_booking": round(used / count, 1) if count else None,
+    }
+
+
+def bench_storage(backend: str, slots: int, rooms: list, ops: int, commit_ops: int):
+    rng = random.Random(2)
+    records, days = synthetic_records(slots, rooms)
+    workdir = tempfile.mkdtemp()
+    storage = make_storage(backend, workdir, records)
+    meta = {"backend": backend, "slots": slots, "records": len(records)}
+    dates = [(FIRST_DATE + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(days)]
+    del records
+
+    # Baca pertama pada index baru: backend biasa memuat semua booking,
+    # backend berpartisi hanya memuat tanggal yang diminta
+    # check_interval=0: setiap baca juga mengecek versi storage, kasus terburuk
+    index = BookingIndex(storage, check_interval=0)
+    service = BookingService(
+        index=index,
+        catalog=synthetic_catalog(rooms),
+        waitlist=Waitlist(os.path.join(workdir, "waitlist.json")),
+    )
+    started = time.perf_counter()
+    service.get_room_status(dates[len(dates) // 2], 9)
+    yield summarize("cold_status", [time.perf_counter() - started], **meta)
+
+    started = time.perf_counter()
+    index.load_records()
+    yield summarize("index_load_all", [time.perf_counter() - started], **meta)
+    yield {"op": "index_memory", **index_memory(storage), **meta}
+    hours = range(OPENING_HOUR, CLOSING_HOUR)
+    # Jam mulai booking 2 jam yang masih selesai sebelum jam tutup
+    starts = range(OPENING_HOUR, CLOSING_HOUR - 2 + 1)
+    yield summarize(
+        "room_status",
+        timed(
+            service.get_room_status,
+            [(rng.choice(dates), rng.choice(hours)) for _ in range(ops)],
+        ),
+        **meta,
+    )
+    yield summarize(
+        "status_frame",
+        timed(
+            service.status_frame,
+            [(rng.choice(dates), rng.choice(hours)) for _ in range(ops // 10 or 1)],
+        ),
+        rooms=len(rooms),
+        **meta,
+    )
+    # Satu polling tabel live pada sesi yang idle: tidak ada perubahan baru
+    yield summarize(
+        "status_poll",
+        timed(
+            index.changes_since,
+            [(index.sequence, rng.choice(dates)) for _ in range(ops)],
+        ),
+        **meta,
+    )
+    # "Booking saya" lewat index per dosen, bukan memindai semua booking
+    yield summarize(
+        "my_bookings",
+        timed(
+            service.my_bookings,
+            [(f"Dosen {rng.randrange(200)}", dates[0]) for _ in range(ops)],
+        ),
+        **meta,
+    )
+    yield summarize(
+        "availability",
+        timed(
+            service.is_available,
+            [
+                (rng.choice(dates), rng.choice(starts), 2, rng.choice(rooms))
+                for _ in range(ops)
+            ],
+        ),
+        **meta,
+    )
+    yield summarize(
+        "find_rooms",
+        timed(
+            service.find_rooms,
+            [
+                (
+                    rng.choice(dates),
+                    rng.choice(starts),
+                    2,
+                    RoomRequirements(
+                        rng.choice([0, 30, 50]), rng.sample(FACILITIES[:3], 1)
+                    ),
+                )
+                for _ in range(ops)
+            ],
+        ),
+        rooms=len(rooms),
+        **meta,
+    )
+
+    # Laporan atas seluruh riwayat: tabel kolom dibangun sekali, lalu
+    # setiap laporan hanya groupby/bincount
+    analytics = BookingAnalytics(index, ArchiveReader(os.path.join(workdir, "arsip")))
+    started = time.perf_counter()
+    frame = analytics.frame()
+    yield summarize("analytics_frame", [time.perf_counter() - started], **meta)
+
+    def report(frame, by):
+        usage_summary(frame, by, dates[0], dates[-1], rooms)
+        weekly_hours(frame, by, dates[0], dates[-1])
+        peak_hours(frame, dates[0], dates[-1])
+
+    yield summarize(
+        "analytics_report",
+        timed(report, [(frame, by) for by in ("room", "booked_by", "matkul")] * 3),
+        days=days,
+        **meta,
+    )
+    del analytics, frame
+
+    # Feed pertama membangun file, berikutnya dilayani dari cache
+    exporter = BookingExporter(index)
+    feeds = [("room", rng.choice(rooms), "ics") for _ in range(ops)]
+    yield summarize("export_first", timed(exporter.feed, feeds[:5]), **meta)
+    yield summarize("export_cached", timed(exporter.feed, feeds), **meta)
+    del exporter
+
+    # Commit di tanggal setelah riwayat supaya semuanya berhasil
+    future = FIRST_DATE + timedelta(days=days + 7)
+    singles = [
+        (
+            (future + timedelta(days=i // len(rooms))).strftime("%Y-%m-%d"),
+            OPENING_HOUR,
+            1,
+            rooms[i % len(rooms)],
+            "Bench",
+            "-",
+        )
+        for i in range(commit_ops)
+    ]
+    yield summarize("commit_single", timed(service.create_booking, singles), **meta)
+
+    bulk_start = future + timedelta(days=commit_ops // len(rooms) + 7)
+    bulks = []
+    for i in range(commit_ops):
+        first = bulk_start + timedelta(weeks=16 * (i // len(rooms)))
+        entries = [
+            (
+                (first + timedelta(weeks=w)).strftime("%Y-%m-%d"),
+                make_booking(rooms[i % len(rooms)], 9, 2, "Bench", "-"),
+            )
+            for w in range(16)
+        ]
+        bulks.append((entries,))
+    yield summarize(
+        "commit_bulk_16", timed(service.create_bookings_bulk, bulks), **meta
+    )
+
+    # Batalkan booking yang punya antrean: hapus + promosi permintaan
+    # berprioritas tertinggi dalam satu panggilan. Antrean hanya menerima
+    # tanggal mendatang, jadi pakai tanggal setahun dari sekarang
+    waiting = []
+    for i in range(commit_ops):
+        date = (datetime.now() + timedelta(days=365 + i // len(rooms))).strftime(
+            "%Y-%m-%d"
+        )
+        room = rooms[i % len(rooms)]
+        service.create_booking(date, OPENING_HOUR, 1, room, "Bench", "-")
+        for n, priority in enumerate(["adhoc", "reguler", "reguler"]):
+            service.join_waitlist(
+                date, OPENING_HOUR, 1, room, f"Antre {n}", "-", priority
+            )
+        waiting.append((room, date, OPENING_HOUR, "Bench"))
+    yield summarize(
+        "cancel_promote",
+        timed(service.cancel_booking, waiting),
+        **meta,
+    )
+
+
+def bench_login(ops: int) -> list:
+    workdir = tempfile.mkdtemp()
+    users_file = os.path.join(workdir, "mahasiswa.json")
+    users = {f"user{i}": {"password": f"pw{i}", "role": "User"} for i in range(1000)}
+    users["bench"] = {
+        "password": verifikasi.hash_password("rahasia"),
+        "role": "Dosen",
+        "name": "Bench",
+    }
+    with open(users_file, "w") as f:
+        json.dump(users, f)
+    verifikasi._user_store = verifikasi.UserStore(users_file)
+
+    def login(password):
+        return verifikasi._login_pool.submit(
+            verifikasi._check_login, "bench", password
+        ).result()
+
+    results = [
+        summarize("login", timed(login, [("rahasia",)] * ops)),
+        summarize("login_wrong_password", timed(login, [("salah",)] * ops)),
+    ]
+
+    # Banyak login sekaligus: throughput dibatasi LOGIN_WORKERS
+    burst = verifikasi.LOGIN_WORKERS * 4
+    started = time.perf_counter()
+    wait(
+        [
+            verifikasi._login_pool.submit(verifikasi._check_login, "bench", "rahasia")
+            for _ in range(burst)
+        ]
+    )
+    elapsed = time.perf_counter() - started
+    results.append(
+        {
+            "op": "login_burst",
+            "n": burst,
+            "workers": verifikasi.LOGIN_WORKERS,
+            "seconds": round(elapsed, 3),
+            "ops_per_s": round(burst / elapsed, 1),
+        }
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000")
+    parser.add_argument("--backend", default="json,sqlite,partitioned,journal")
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--commit-ops", type=int, default=20)
+    parser.add_argument("--login-ops", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=16)
+    parser.add_argument("--attempts", type=int, default=10)
+    parser.add_argument("--output", help="simpan hasil JSON lines ke file ini")
+    args = parser.parse_args()
+
+    rooms = [f"A{10 + i // 10}.01.{i % 10 + 1:02d}" for i in range(args.rooms)]
+    out = open(args.output, "w") if args.output else None
+
+    def emit(result: dict):
+        line = json.dumps(result)
+        print(line, flush=True)
+        if out:
+            out.write(line + "\n")
+
+    for backend in args.backend.split(","):
+        for size in args.sizes.split(","):
+            for result in bench_storage(
+                backend, int(size), rooms, args.ops, args.commit_ops
+            ):
+                emit(result)
+        emit(
+            {
+                "op": "concurrent_writers",
+                **run_stress(backend, args.processes, args.attempts),
+            }
+        )
+    if args.login_ops:
+        for result in bench_login(args.login_ops):
+            emit(result)
+    if out:
+        out.close()
+
+
+if __name__ == "__main__":
+    main()
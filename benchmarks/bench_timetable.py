@@ -0,0 +1,170 @@
+"""Benchmark impor jadwal semester: waktu solver dan commit massal.
+
+Untuk setiap jumlah mata kuliah dibangkitkan CSV sintetis (durasi 1-3 jam,
+sebagian dengan hari/jam tetap atau butuh PC Lab) dan penyimpanan baru yang
+sudah berisi sedikit booking lain selama semester. Ruangan diambil dari
+data/rooms.json (gedung A10), atau dibangkitkan dengan --rooms. Output satu
+objek JSON per baris: jumlah pertemuan yang ditempatkan dan gagal, waktu
+solver, waktu commit dan utilisasi mingguan yang dihasilkan.
+
+    python -m benchmarks.bench_timetable --courses 100,200,250
+    python -m benchmarks.bench_timetable --courses 1000 --rooms 50 --backend sqlite
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date as Date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_booking import synthetic_catalog  # noqa: E402
+from benchmarks.stress_booking import make_storage  # noqa: E402
+from booking_index import BookingIndex  # noqa: E402
+from booking_service import (  # noqa: E402
+    CLOSING_HOUR,
+    OPENING_HOUR,
+    BookingService,
+)
+from room_catalog import ROOMS_FILE, RoomCatalog  # noqa: E402
+from storage import BookingRecord  # noqa: E402
+from timetable import (  # noqa: E402
+    CSV_COLUMNS,
+    DEFAULT_WEEKDAYS,
+    WEEKDAYS,
+    commit_plan,
+    plan_timetable,
+    read_courses,
+)
+from waitlist import Waitlist  # noqa: E402
+
+FIRST_DATE = Date(2025, 2, 3)
+WEEKS = 16
+
+
+def synthetic_csv(courses: int, seed: int = 5) -> str:
+    rng = random.Random(seed)
+    lecturers = [f"Dosen {i}" for i in range(max(1, courses // 4))]
+    buffer = io.StringIO()
+    buffer.write(",".join(CSV_COLUMNS) + "\n")
+    for i in range(courses):
+        duration = rng.choices([1, 2, 3], [1, 7, 2])[0]
+        lab = rng.random() < 0.15
+        weekday = WEEKDAYS[rng.choice(DEFAULT_WEEKDAYS)] if rng.random() < 0.3 else ""
+        start = (
+            str(rng.randrange(OPENING_HOUR, CLOSING_HOUR - duration + 1))
+            if weekday and rng.random() < 0.3
+            else ""
+        )
+        buffer.write(
+            ",".join(
+                [
+                    rng.choice(lecturers),
+                    f"MK{i:04d}",
+                    weekday,
+                    str(duration),
+                    str(rng.randint(15, 30 if lab else 40)),
+                    "PC Lab" if lab else "Proyektor",
+                    start,
+                    "",
+                ]
+            )
+            + "\n"
+        )
+    return buffer.getvalue()
+
+
+def existing_bookings(rooms: list, share: float, seed: int = 6) -> list:
+    """Booking ad-hoc yang sudah ada selama semester, `share` dari semua slot"""
+    rng = random.Random(seed)
+    records = []
+    for day in range(WEEKS * 7):
+        date = FIRST_DATE + timedelta(days=day)
+        if date.weekday() >= 5:
+            continue
+        for room in rooms:
+            for hour in range(OPENING_HOUR, CLOSING_HOUR):
+                if rng.random() < share:
+                    records.append(
+                        BookingRecord(
+                            room,
+                            date.strftime("%Y-%m-%d"),
+                            hour * 60,
+                            (hour + 1) * 60,
+                            "Ad-hoc",
+                            "-",
+                        )
+                    )
+    return records
+
+
+def bench_timetable(backend: str, courses: int, catalog: RoomCatalog, share: float):
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "bookings.json" if backend == "json" else "bookings")
+    if backend == "sqlite":
+        path = os.path.join(workdir, "ruangans.db")
+    storage = make_storage(backend, path)
+    storage.add_bookings(existing_bookings(catalog.ids(), share))
+    service = BookingService(
+        index=BookingIndex(storage, check_interval=0),
+        catalog=catalog,
+        waitlist=Waitlist(os.path.join(workdir, "waitlist.json")),
+    )
+    last_date = FIRST_DATE + timedelta(weeks=WEEKS) - timedelta(days=1)
+
+    parsed, errors = read_courses(io.StringIO(synthetic_csv(courses)))
+    plan = plan_timetable(service, parsed, FIRST_DATE, last_date)
+    entries = plan.entries()
+    started = time.perf_counter()
+    result = commit_plan(service, plan)
+    commit_seconds = time.perf_counter() - started
+
+    hours = sum(placement.course.duration for placement in plan.placed)
+    open_hours = (
+        len(catalog.ids()) * len(DEFAULT_WEEKDAYS) * (CLOSING_HOUR - OPENING_HOUR)
+    )
+    return {
+        "op": "timetable",
+        "backend": backend,
+        "courses": courses,
+        "rooms": len(catalog.ids()),
+        "placed": len(plan.placed),
+        "unplaced": len(plan.unplaced) + len(errors),
+        "solve_ms": round(plan.solve_seconds * 1000, 1),
+        "bookings": len(entries),
+        "committed": len(result.booked),
+        "commit_ms": round(commit_seconds * 1000, 1),
+        "utilization": round(hours / open_hours, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", default="100,200,250")
+    parser.add_argument("--backend", default="journal")
+    parser.add_argument(
+        "--rooms", type=int, default=0, help="ruangan sintetis (0 = data/rooms.json)"
+    )
+    parser.add_argument(
+        "--existing", type=float, default=0.005, help="porsi slot yang sudah dibooking"
+    )
+    args = parser.parse_args()
+
+    if args.rooms:
+        rooms = [f"A{10 + i // 10}.01.{i % 10 + 1:02d}" for i in range(args.rooms)]
+        catalog = synthetic_catalog(rooms)
+    else:
+        catalog = RoomCatalog(ROOMS_FILE)
+    for backend in args.backend.split(","):
+        for courses in args.courses.split(","):
+            result = bench_timetable(backend, int(courses), catalog, args.existing)
+            print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
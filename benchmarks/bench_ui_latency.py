@@ -0,0 +1,155 @@
+"""Latensi alur login, booking dan hapus booking per aksi, plus waktu start halaman.
+
+Setiap alur dijalankan headless lewat streamlit.testing (AppTest) di salinan
+repo sementara, jadi data asli tidak tersentuh. Waktu start diukur di proses
+Python baru per halaman: import modul yang dipakai halaman, render pertama,
+dan rerun berikutnya.
+
+    python -m benchmarks.bench_ui_latency --repeat 3
+"""
+
+import argparse
+import ast
+import importlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOSEN = {"role": "Dosen", "name": "Fikri Nendra Fadlurrahman", "matkul": ["PBO"]}
+PAGES = [
+    "streamlit_app.py",
+    "pages/halaman_siswa.py",
+    "pages/halaman_dosen.py",
+    "pages/halaman_dosen_pbo.py",
+]
+
+
+def timed(at: AppTest) -> float:
+    started = time.perf_counter()
+    at.run(timeout=30)
+    return time.perf_counter() - started
+
+
+def login(workdir: str) -> float:
+    at = AppTest.from_file(os.path.join(workdir, "streamlit_app.py"))
+    at.run(timeout=30)
+    at.text_input[0].input("fikrin")
+    at.text_input[1].input("fnf123")
+    at.button[0].click()
+    return timed(at)
+
+
+def dosen_page(workdir: str) -> AppTest:
+    at = AppTest.from_file(os.path.join(workdir, "pages", "halaman_dosen.py"))
+    at.session_state["user"] = DOSEN
+    at.run(timeout=30)
+    return at
+
+
+def book(workdir: str, room: str) -> float:
+    at = dosen_page(workdir)
+    next(s for s in at.selectbox if s.label == "Pilih Ruangan").select(room)
+    next(b for b in at.button if b.label == "Book Ruangan").click()
+    return timed(at)
+
+
+def delete(workdir: str, room: str) -> float:
+    at = dosen_page(workdir)
+    # Booking dari book(): hari ini jam 07:00, dihapus lewat panel Booking Saya
+    today = datetime.now().strftime("%Y-%m-%d")
+    at.selectbox(key="booking_saya").select(f"{today}-0700-{room}")
+    next(b for b in at.button if "Hapus" in b.label).click()
+    return timed(at)
+
+
+def page_imports(path: str) -> list:
+    """Modul yang di-import di level atas halaman"""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+def startup(page: str) -> dict:
+    """Dijalankan di proses baru (--startup): import, render pertama dan rerun.
+
+    streamlit sudah ter-import oleh AppTest, jadi import_ms adalah biaya modul
+    aplikasi (dan pustaka yang mereka tarik, misalnya pandas) di atasnya.
+    """
+    sys.path.insert(0, os.getcwd())
+    started = time.perf_counter()
+    for module in page_imports(page):
+        importlib.import_module(module)
+    import_time = time.perf_counter() - started
+
+    at = AppTest.from_file(os.path.abspath(page))
+    at.session_state["user"] = DOSEN
+    first_render = timed(at)
+    reruns = [timed(at) for _ in range(5)]
+    return {
+        "import_ms": round(import_time * 1000, 1),
+        "first_render_ms": round(first_render * 1000, 1),
+        "rerun_ms": round(statistics.median(reruns) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--startup", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.startup:
+        print(json.dumps(startup(args.startup)))
+        return
+
+    workdir = tempfile.mkdtemp()
+    shutil.copytree(
+        ROOT, workdir, dirs_exist_ok=True, ignore=shutil.ignore_patterns(".git")
+    )
+    os.chdir(workdir)
+    sys.path.insert(0, workdir)
+
+    rooms = ["A10.01.08", "A10.01.09", "A10.01.10"]
+    results = {"login": [], "book": [], "delete": []}
+    for i in range(args.repeat):
+        room = rooms[i % len(rooms)]
+        results["login"].append(login(workdir))
+        results["book"].append(book(workdir, room))
+        results["delete"].append(delete(workdir, room))
+
+    report = {
+        action: {
+            "median_ms": round(statistics.median(times) * 1000, 1),
+            "max_ms": round(max(times) * 1000, 1),
+        }
+        for action, times in results.items()
+    }
+    for page in PAGES:
+        # Proses baru supaya import dan cache Streamlit benar-benar dingin
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--startup", page],
+            cwd=workdir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        report[f"startup {page}"] = json.loads(output.strip().splitlines()[-1])
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Stress test booking paralel antar-proses.
+
+Setiap proses membooking slot miliknya sendiri dan sekaligus berebut satu slot
+yang sama. Di akhir, setiap booking yang dilaporkan berhasil harus ada di
+penyimpanan, dan slot rebutan harus punya tepat satu pemenang.
+
+    python -m benchmarks.stress_booking --backend json --processes 32
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import (  # noqa: E402
+    BookingRecord,
+    JournalBookingStorage,
+    JsonBookingStorage,
+    PartitionedBookingStorage,
+    SQLiteBookingStorage,
+)
+
+DATE = "2025-02-03"
+CONTENDED = (DATE, 7, "A10.01.01")
+
+
+def make_storage(backend: str, path: str):
+    if backend == "sqlite":
+        return SQLiteBookingStorage(path)
+    if backend == "partitioned":
+        return PartitionedBookingStorage(path)
+    if backend == "journal":
+        return JournalBookingStorage(path)
+    return JsonBookingStorage(path)
+
+
+def worker(args):
+    backend, path, worker_id, attempts = args
+    storage = make_storage(backend, path)
+    user = f"worker-{worker_id}"
+
+    def book(date, hour, room):
+        record = BookingRecord(room, date, hour * 60, (hour + 1) * 60, user, "Stress")
+        return storage.add_bookings([record])
+
+    won = []
+    if book(*CONTENDED):
+        won.append(CONTENDED)
+    for i in range(attempts):
+        # Ruangan unik per (worker, percobaan), jadi semua harus berhasil
+        slot = (DATE, 8 + i % 9, f"W{worker_id:03d}.{i // 9:03d}")
+        if book(*slot):
+            won.append(slot)
+    return user, won
+
+
+def run(backend: str, processes: int, attempts: int) -> dict:
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(
+        workdir,
+        {"sqlite": "ruangans.db", "partitioned": "bookings", "journal": "journal"}.get(
+            backend, "ruangans.json"
+        ),
+    )
+    make_storage(backend, path)
+
+    started = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(
+            worker, [(backend, path, i, attempts) for i in range(processes)]
+        )
+    elapsed = time.perf_counter() - started
+
+    stored = {
+        (r.date, r.start // 60, r.room): r.booked_by
+        for r in make_storage(backend, path).load_records()
+    }
+    reported = sum(len(won) for _, won in results)
+    lost = 0
+    for user, won in results:
+        for slot in won:
+            if stored.get(slot) != user:
+                lost += 1
+    contended_winners = sum(CONTENDED in won for _, won in results)
+    return {
+        "backend": backend,
+        "processes": processes,
+        "reported_success": reported,
+        "lost_bookings": lost,
+        "contended_winners": contended_winners,
+        "seconds": round(elapsed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backend",
+        choices=["json", "sqlite", "partitioned", "journal"],
+        default="json",
+    )
+    parser.add_argument("--processes", type=int, default=32)
+    parser.add_argument("--attempts", type=int, default=20)
+    args = parser.parse_args()
+
+    result = run(args.backend, args.processes, args.attempts)
+    print(result)
+    expected = args.processes * args.attempts + 1
+    if (
+        result["lost_bookings"]
+        or result["contended_winners"] != 1
+        or result["reported_success"] != expected
+    ):
+        print("GAGAL: ada booking yang hilang atau bentrok")
+        sys.exit(1)
+    print("OK: tidak ada booking yang hilang")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# booking_export.py
+"""Ekspor booking sebagai iCalendar (.ics) atau CSV per ruangan, dosen atau matkul.
+
+Feed dibuat saat pertama kali diminta, dari index di memori (bukan dengan
+membaca ulang file booking), lalu disimpan bersama ETag-nya selama versi
+storage tidak berubah. ETag adalah hash isi feed, jadi feed yang isinya tetap
+setelah booking lain berubah juga tetap punya ETag yang sama dan klien
+kalender yang polling mendapat 304.
+"""
+
+import csv
+import hashlib
+import io
+import re
+import threading
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+from booking_index import BookingIndex, get_booking_index
+from storage import BookingRecord
+
+EXPORT_KEYS = {"room": "Ruangan", "booked_by": "Dosen", "matkul": "Mata Kuliah"}
+CONTENT_TYPES = {
+    "ics": "text/calendar; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+CSV_FIELDS = ["room", "date", "start", "end", "status", "bookedBy", "matkul", "type"]
+
+
+class ExportFeed:
+    __slots__ = ("body", "etag", "content_type", "filename")
+
+    def __init__(self, body: bytes, content_type: str, filename: str):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.content_type = content_type
+        self.filename = filename
+
+
+def _ics_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_line(line: str) -> str:
+    """Lipat baris lebih dari 75 oktet sesuai RFC 5545"""
+    if len(line.encode()) <= 75:
+        return line + "\r\n"
+    parts, current = [], ""
+    for char in line:
+        if len((current + char).encode()) > 75:
+            parts.append(current)
+            current = " "
+        current += char
+    parts.append(current)
+    return "\r\n".join(parts) + "\r\n"
+
+
+def _ics_time(date: str, minutes: int) -> str:
+    return f"{date.replace('-', '')}T{minutes // 60:02d}{minutes % 60:02d}00"
+
+
+def ics_lines(records: List[BookingRecord], name: str) -> Iterator[str]:
+    """Kalender dengan satu VEVENT per booking, jam lokal (floating)"""
+    yield from map(
+        _ics_line,
+        [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//booking-ruang//Booking Ruangan//ID",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{_ics_text(name)}",
+        ],
+    )
+    for record in records:
+        matkul = record.matkul or "-"
+        yield from map(
+            _ics_line,
+            [
+                "BEGIN:VEVENT",
+                f"UID:{record.date}-{record.room}-{record.start}@booking-ruang",
+                # Tetap per booking supaya isi (dan ETag) hanya berubah jika
+                # booking-nya berubah
+                f"DTSTAMP:{record.date.replace('-', '')}T000000Z",
+                f"DTSTART:{_ics_time(record.date, record.start)}",
+                f"DTEND:{_ics_time(record.date, record.end)}",
+                f"SUMMARY:{_ics_text(f'{matkul} - {record.room}')}",
+                f"LOCATION:{_ics_text(record.room)}",
+                f"DESCRIPTION:{_ics_text(f'Dibooking oleh {record.booked_by}')}",
+                "END:VEVENT",
+            ],
+        )
+    yield _ics_line("END:VCALENDAR")
+
+
+def csv_lines(records: List[BookingRecord]) -> Iterator[str]:
+    """CSV dengan kolom yang sama seperti BookingRecord.to_dict"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_FIELDS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record.to_dict())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_filename(by: str, value: str, fmt: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9.]+", "-", value).strip("-") or "booking"
+    return f"booking-{by.replace('_', '-')}-{slug}.{fmt}"
+
+
+class BookingExporter:
+    """Feed ekspor per (kunci, nilai, format), dibuat ulang hanya jika booking berubah"""
+
+    def __init__(self, index: Optional[BookingIndex] = None):
+        self.index = index or get_booking_index()
+        self._lock = threading.Lock()
+        self._version: Hashable = None
+        self._groups: Dict[str, Dict[str, List[BookingRecord]]] = {}
+        self._feeds: Dict[Tuple[str, str, str], Tuple[Hashable, ExportFeed]] = {}
+
+    def _grouped(self, version: Hashable) -> Dict[str, Dict[str, List[BookingRecord]]]:
+        """Booking dikelompokkan sekali per versi untuk semua kunci"""
+        if version != self._version:
+            groups: Dict[str, Dict[str, List[BookingRecord]]] = {
+                by: {} for by in EXPORT_KEYS
+            }
+            # load_records sudah urut tanggal, ruangan lalu jam
+            for record in self.index.load_records():
+                groups["room"].setdefault(record.room, []).append(record)
+                groups["booked_by"].setdefault(record.booked_by, []).append(record)
+                groups["matkul"].setdefault(record.matkul or "-", []).append(record)
+            self._groups = groups
+            self._version = version
+        return self._groups
+
+    def feed(self, by: str, value: str, fmt: str) -> ExportFeed:
+        """Feed untuk booking dengan `by` == `value`, by: room/booked_by/matkul"""
+        if by not in EXPORT_KEYS:
+            raise ValueError(f"Kunci ekspor tidak dikenal: {by}")
+        if fmt not in CONTENT_TYPES:
+            raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+        key = (by, value, fmt)
+        with self._lock:
+            version = self.index.version()
+            cached = self._feeds.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            records = self._grouped(version)[by].get(value, [])
+            if fmt == "ics":
+                lines = ics_lines(records, f"Booking {EXPORT_KEYS[by]} {value}")
+            else:
+                lines = csv_lines(records)
+            feed = ExportFeed(
+                "".join(lines).encode(),
+                CONTENT_TYPES[fmt],
+                export_filename(by, value, fmt),
+            )
+            if cached is not None and cached[1].etag == feed.etag:
+                feed = cached[1]
+            # Nilai tanpa booking tidak di-cache supaya query acak tidak
+            # menumpuk di memori
+            if records:
+                self._feeds[key] = (version, feed)
+            return feed
+
+
+_shared_exporter: Optional[BookingExporter] = None
+_shared_lock = threading.Lock()
+
+
+def get_booking_exporter() -> BookingExporter:
+    global _shared_exporter
+    with _shared_lock:
+        if _shared_exporter is None:
+            _shared_exporter = BookingExporter()
+        return _shared_exporter
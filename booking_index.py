@@ -0,0 +1,426 @@
+# booking_index.py
+"""Index booking di memori yang dipakai bersama oleh semua sesi Streamlit."""
+
+import threading
+import time
+from array import array
+from collections import deque
+from bisect import bisect_left, bisect_right
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from archive import schedule_compaction
+from storage import BookingRecord, BookingStorage, RemovedSink, get_storage
+
+_UNLOADED = object()
+# Jumlah perubahan (tanggal, ruangan) terakhir yang disimpan untuk changes_since
+CHANGE_LOG_SIZE = 2048
+
+
+class RoomDay:
+    """Booking satu ruangan pada satu tanggal, urut berdasarkan jam mulai.
+
+    Booking dalam satu ruangan tidak pernah tumpang tindih, jadi start dan end
+    sama-sama terurut dan cek bentrok cukup satu bisect.
+    """
+
+    __slots__ = ("starts", "records")
+
+    def __init__(self):
+        # array 'H' (2 byte per menit) lebih hemat dari list berisi objek int
+        self.starts = array("H")
+        self.records: List[BookingRecord] = []
+
+    def add(self, record: BookingRecord):
+        i = bisect_right(self.starts, record.start)
+        self.starts.insert(i, record.start)
+        self.records.insert(i, record)
+
+    def remove(self, start: int) -> Optional[BookingRecord]:
+        i = bisect_left(self.starts, start)
+        if i < len(self.starts) and self.starts[i] == start:
+            del self.starts[i]
+            return self.records.pop(i)
+        return None
+
+    def at(self, minute: int) -> Optional[BookingRecord]:
+        """Booking yang sedang berjalan pada menit tertentu"""
+        i = bisect_right(self.starts, minute) - 1
+        if i >= 0 and self.records[i].end > minute:
+            return self.records[i]
+        return None
+
+    def is_free(self, start: int, end: int) -> bool:
+        i = bisect_left(self.starts, end) - 1
+        return i < 0 or self.records[i].end <= start
+
+    def signature(self) -> tuple:
+        return tuple(
+            (r.start, r.end, r.booked_by, r.matkul, r.status) for r in self.records
+        )
+
+
+def _signature(room_day: Optional[RoomDay]) -> tuple:
+    return room_day.signature() if room_day is not None else ()
+
+
+class BookingIndex(BookingStorage):
+    """Cache interval booking {date: {room: RoomDay}} di atas BookingStorage lain.
+
+    Cache disimpan per partisi storage: backend biasa hanya punya satu
+    partisi, backend per tanggal dimuat satu tanggal sekali saat pertama
+    dibaca. Partisi dimuat ulang hanya jika versinya berubah karena proses
+    lain; commit lewat index ini langsung diterapkan tanpa membaca ulang.
+
+    Setiap perubahan juga dicatat sebagai (seq, tanggal, ruangan) dengan seq
+    yang selalu naik, jadi tampilan bisa memperbarui baris yang berubah saja
+    lewat changes_since().
+
+    Index kedua {dosen: [record]} dijaga bersamaan, jadi "booking saya"
+    tidak perlu memindai semua booking.
+    """
+
+    def __init__(self, storage: BookingStorage, check_interval: float = 0.5):
+        super().__init__()
+        self.storage = storage
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._days: Dict[str, Dict[str, RoomDay]] = {}
+        self._versions: Dict[Hashable, Hashable] = {}
+        self._dates: Dict[Hashable, Set[str]] = {}
+        self._checked_at: Dict[Hashable, float] = {}
+        self._loaded: Set[Hashable] = set()
+        self._seq = 0
+        self._changes: deque = deque(maxlen=CHANGE_LOG_SIZE)
+        # List, bukan set: 8 byte per booking, dan booking satu dosen sedikit
+        self._by_user: Dict[str, List[BookingRecord]] = {}
+        storage.add_listener(self._on_commit)
+
+    def _refresh(self, key: Hashable):
+        """Muat ulang partisi jika versinya berubah, paling sering sekali per
+        check_interval"""
+        now = time.monotonic()
+        if (
+            key in self._versions
+            and now - self._checked_at.get(key, 0.0) < self.check_interval
+        ):
+            return
+        self._checked_at[key] = now
+        # Versi dibaca sebelum data: commit di antaranya hanya memicu reload berikutnya
+        version = self.storage.partition_version(key)
+        if self._versions.get(key, _UNLOADED) == version:
+            return
+        old = {date: self._days.pop(date, {}) for date in self._dates.pop(key, ())}
+        self._unindex_days(old.values())
+        for record in self.storage.load_partition(key):
+            self._add(record)
+        self._versions[key] = version
+        if key in self._loaded:
+            # Ditulis proses lain: bandingkan per ruangan supaya hanya ruangan
+            # yang benar-benar berubah yang masuk log
+            for date in old.keys() | self._dates.get(key, set()):
+                before, after = old.get(date, {}), self._days.get(date, {})
+                for room in before.keys() | after.keys():
+                    if _signature(before.get(room)) != _signature(after.get(room)):
+                        self._log(date, room)
+        self._loaded.add(key)
+
+    def _refresh_dates(self, dates: Iterable[str]):
+        for key in {self.storage.partition_of(date) for date in dates}:
+            self._refresh(key)
+
+    def _refresh_all(self):
+        for key in self.storage.partitions():
+            self._refresh(key)
+
+    def _add(self, record: BookingRecord):
+        self._days.setdefault(record.date, {}).setdefault(record.room, RoomDay()).add(
+            record
+        )
+        self._dates.setdefault(self.storage.partition_of(record.date), set()).add(
+            record.date
+        )
+        self._by_user.setdefault(record.booked_by, []).append(record)
+
+    def _unindex(self, record: BookingRecord):
+        records = self._by_user.get(record.booked_by)
+        if records is not None:
+            # BookingRecord tanpa __eq__: remove mencari objek yang sama persis
+            records.remove(record)
+            if not records:
+                del self._by_user[record.booked_by]
+
+    def _unindex_days(self, days: Iterable[Dict[str, RoomDay]]):
+        """Buang banyak booking sekaligus: setiap list dosen disaring sekali"""
+        removed: Dict[str, Set[int]] = {}
+        for rooms in days:
+            for room_day in rooms.values():
+                for record in room_day.records:
+                    removed.setdefault(record.booked_by, set()).add(id(record))
+        for user, ids in removed.items():
+            kept = [r for r in self._by_user.get(user, ()) if id(r) not in ids]
+            if kept:
+                self._by_user[user] = kept
+            else:
+                self._by_user.pop(user, None)
+
+    def _log(self, date: str, room: Optional[str]):
+        """Catat perubahan; room None berarti seluruh tanggal berubah"""
+        self._seq += 1
+        self._changes.append((self._seq, date, room))
+
+    def _on_commit(self, change: dict, before: Hashable, after: Hashable):
+        records = change["records"] if "records" in change else [change["record"]]
+        key = self.storage.partition_of(records[0].date)
+        with self._lock:
+            if self._versions.get(key, _UNLOADED) != before:
+                # Partisi belum dimuat atau ada commit lain yang belum terlihat,
+                # muat ulang saat dibaca
+                self._versions.pop(key, None)
+            else:
+                if change["op"] == "add":
+                    for record in records:
+                        self._add(record)
+                        self._log(record.date, record.room)
+                elif change["op"] == "remove":
+                    record = change["record"]
+                    room_day = self._days.get(record.date, {}).get(record.room)
+                    removed = room_day.remove(record.start) if room_day else None
+                    if removed is not None:
+                        self._unindex(removed)
+                    self._log(record.date, record.room)
+                elif change["op"] == "purge":
+                    # Tanggal yang diarsipkan selalu dihapus seluruhnya
+                    for date in {record.date for record in records}:
+                        self._unindex_days([self._days.pop(date, {})])
+                        self._dates.get(key, set()).discard(date)
+                        self._log(date, None)
+                self._versions[key] = after
+        self._notify(change, before, after)
+
+    def partitions(self) -> List[Hashable]:
+        return self.storage.partitions()
+
+    def partition_of(self, date: str) -> Hashable:
+        return self.storage.partition_of(date)
+
+    def partition_version(self, key: Hashable) -> Hashable:
+        with self._lock:
+            self._refresh(key)
+            return self._versions[key]
+
+    def load_partition(self, key: Hashable) -> List[BookingRecord]:
+        with self._lock:
+            self._refresh(key)
+            return [
+                record
+                for date in sorted(self._dates.get(key, ()))
+                for room in sorted(self._days.get(date, {}))
+                for record in self._days[date][room].records
+            ]
+
+    def version(self) -> Hashable:
+        with self._lock:
+            self._refresh_all()
+            return self.storage.version()
+
+    def load_records(self) -> List[BookingRecord]:
+        with self._lock:
+            self._refresh_all()
+            return [
+                record
+                for date in sorted(self._days)
+                for room in sorted(self._days[date])
+                for record in self._days[date][room].records
+            ]
+
+    def add_bookings(self, records: List[BookingRecord]) -> bool:
+        return self.storage.add_bookings(records)
+
+    def remove_booking(
+        self,
+        room: str,
+        date: str,
+        start: int,
+        booked_by: Optional[str] = None,
+        actor: Optional[str] = None,
+    ) -> bool:
+        return self.storage.remove_booking(room, date, start, booked_by, actor)
+
+    def remove_before(self, date: str, sink: RemovedSink) -> int:
+        return self.storage.remove_before(date, sink)
+
+    @property
+    def sequence(self) -> int:
+        """Nomor perubahan terakhir; naik setiap ada booking berubah"""
+        with self._lock:
+            return self._seq
+
+    def changes_since(self, seq: int, date: str) -> Tuple[int, Optional[Set[str]]]:
+        """(seq terbaru, ruangan yang berubah pada `date` setelah `seq`).
+
+        Mengembalikan None sebagai himpunan ruangan jika log tidak lagi
+        mencakup `seq` atau seluruh tanggal berubah; pemanggil harus memuat
+        ulang semuanya.
+        """
+        with self._lock:
+            self._refresh_dates([date])
+            if seq >= self._seq:
+                return self._seq, set()
+            if not self._changes or self._changes[0][0] > seq + 1:
+                return self._seq, None
+            rooms: Set[str] = set()
+            # Log urut seq, jadi cukup baca dari belakang sampai seq lama
+            for change_seq, change_date, room in reversed(self._changes):
+                if change_seq <= seq:
+                    break
+                if change_date == date:
+                    if room is None:
+                        return self._seq, None
+                    rooms.add(room)
+            return self._seq, rooms
+
+    def status_at(self, date: str, minute: int) -> Dict[str, BookingRecord]:
+        """Booking yang berjalan di setiap ruangan pada menit tertentu"""
+        with self._lock:
+            self._refresh_dates([date])
+            status = {}
+            for room, room_day in self._days.get(date, {}).items():
+                record = room_day.at(minute)
+                if record is not None:
+                    status[room] = record
+            return status
+
+    def booking_at(self, room: str, date: str, minute: int) -> Optional[BookingRecord]:
+        with self._lock:
+            self._refresh_dates([date])
+            room_day = self._days.get(date, {}).get(room)
+            return room_day.at(minute) if room_day else None
+
+    def bookings_of(
+        self, user: str, first_date: Optional[str] = None
+    ) -> List[BookingRecord]:
+        """Booking milik user (mulai first_date), urut tanggal lalu jam.
+
+        Lewat index per dosen, tanpa memindai booking orang lain. Semua
+        partisi dimuat sekali karena booking user bisa di tanggal mana saja.
+        """
+        with self._lock:
+            self._refresh_all()
+            records = self._by_user.get(user, ())
+            return sorted(
+                (r for r in records if first_date is None or r.date >= first_date),
+                key=lambda r: (r.date, r.start, r.room),
+            )
+
+    def is_free(self, room: str, date: str, start: int, end: int) -> bool:
+        with self._lock:
+            self._refresh_dates([date])
+            room_day = self._days.get(date, {}).get(room)
+            return room_day is None or room_day.is_free(start, end)
+
+    def day_bookings(self, date: str, room: str) -> List[BookingRecord]:
+        """Booking satu ruangan pada satu tanggal, urut jam mulai"""
+        with self._lock:
+            self._refresh_dates([date])
+            room_day = self._days.get(date, {}).get(room)
+            return list(room_day.records) if room_day else []
+
+    def occupancy(
+        self,
+        dates: List[str],
+        rooms: List[str],
+        first_hour: int = 7,
+        last_hour: int = 17,
+        slot_minutes: int = 60,
+    ) -> np.ndarray:
+        """Array boolean (hari, slot, ruangan), True jika slot terisi booking.
+
+        Semua booking pada rentang tanggal dikumpulkan sekali lalu ditandai
+        sekaligus: +1 di slot mulai, -1 di slot selesai, kemudian cumsum.
+        """
+        n_slots = (last_hour - first_hour) * 60 // slot_minutes
+        day_pos = {date: i for i, date in enumerate(dates)}
+        room_pos = {room: i for i, room in enumerate(rooms)}
+        rows = []
+        with self._lock:
+            self._refresh_dates(dates)
+            for date in dates:
+                for room, room_day in self._days.get(date, {}).items():
+                    if room in room_pos:
+                        for record in room_day.records:
+                            rows.append(
+                                (
+                                    day_pos[date],
+                                    room_pos[room],
+                                    record.start,
+                                    record.end,
+                                )
+                            )
+
+        diff = np.zeros((len(dates), n_slots + 1, len(rooms)), dtype=np.int16)
+        if rows:
+            days, room_idx, starts, ends = np.array(rows, dtype=np.int64).T
+            origin = first_hour * 60
+            # Slot dihitung terisi jika tumpang tindih sebagian dengan booking
+            first = np.clip((starts - origin) // slot_minutes, 0, n_slots)
+            last = np.clip(-(-(ends - origin) // slot_minutes), 0, n_slots)
+            np.add.at(diff, (days, first, room_idx), 1)
+            np.add.at(diff, (days, last, room_idx), -1)
+        return np.cumsum(diff, axis=1)[:, :n_slots, :] > 0
+
+    def find_free_slots(
+        self,
+        duration_minutes: int,
+        dates: List[str],
+        rooms: List[str],
+        first_hour: int = 7,
+        last_hour: int = 17,
+        preferred_rooms: Optional[List[str]] = None,
+        preferred_hours: Optional[List[int]] = None,
+        slot_minutes: int = 60,
+    ) -> List[Tuple[str, str, int]]:
+        """Semua (room, date, start) yang kosong selama durasi, urut preferensi.
+
+        Urutan: ruangan pilihan, jam mulai pilihan, tanggal paling awal, jam
+        paling awal, lalu urutan ruangan.
+        """
+        occupied = self.occupancy(dates, rooms, first_hour, last_hour, slot_minutes)
+        n_days, n_slots, n_rooms = occupied.shape
+        width = -(-duration_minutes // slot_minutes)
+        if width <= 0 or width > n_slots or n_days == 0 or n_rooms == 0:
+            return []
+
+        # Jendela [s, s + width) kosong jika jumlah slot terisi di dalamnya nol
+        filled = np.zeros((n_days, n_slots + 1, n_rooms), dtype=np.int32)
+        filled[:, 1:, :] = np.cumsum(occupied, axis=1)
+        free_window = (filled[:, width:, :] - filled[:, :-width, :]) == 0
+        days, starts, room_idx = np.nonzero(free_window)
+
+        start_minutes = first_hour * 60 + starts * slot_minutes
+        room_rank = np.ones(len(rooms), dtype=bool)
+        if preferred_rooms:
+            room_rank = ~np.isin(np.array(rooms), preferred_rooms)
+        hour_rank = np.zeros(len(starts), dtype=bool)
+        if preferred_hours:
+            hour_rank = ~np.isin(start_minutes // 60, preferred_hours)
+        order = np.lexsort((room_idx, starts, days, hour_rank, room_rank[room_idx]))
+        return [
+            (rooms[room_idx[i]], dates[days[i]], int(start_minutes[i])) for i in order
+        ]
+
+
+_shared_index: Optional[BookingIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_booking_index() -> BookingIndex:
+    """Satu index per proses, dipakai bersama semua sesi dan halaman"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = BookingIndex(get_storage())
+    # Booking lama dipindah ke arsip agar penyimpanan aktif tetap kecil
+    schedule_compaction(_shared_index.storage)
+    return _shared_index
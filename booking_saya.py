@@ -0,0 +1,48 @@
+# booking_saya.py
+"""Panel "Booking Saya": booking dosen yang login, dibaca dari index per dosen."""
+
+import streamlit as st
+
+from booking_service import BookingError, BookingNotFoundError, BookingService
+from notifikasi import flash
+from storage import format_minutes
+
+
+def my_bookings_panel(service: BookingService, name: str):
+    """Booking mendatang milik `name`; hapus membatalkan seluruh booking sekaligus"""
+    records = {record.id: record for record in service.my_bookings(name)}
+    if not records:
+        st.info("Belum ada booking mendatang")
+        return
+    st.dataframe(
+        [
+            {
+                "Tanggal": record.date,
+                "Jam": f"{format_minutes(record.start)} - {format_minutes(record.end)}",
+                "Ruangan": record.room,
+                "Mata Kuliah": record.matkul,
+            }
+            for record in records.values()
+        ],
+        hide_index=True,
+    )
+    booking_id = st.selectbox(
+        "Pilih Booking untuk Dihapus",
+        list(records),
+        format_func=lambda booking_id: (
+            f"{records[booking_id].date} "
+            f"{format_minutes(records[booking_id].start)} {records[booking_id].room}"
+        ),
+        key="booking_saya",
+    )
+    if st.button("🗑️Hapus Booking"):
+        try:
+            record = service.cancel_booking_by_id(booking_id, user=name)
+            flash(f"Booking ruangan {record.room} berhasil dihapus!", "🚮")
+            st.rerun()
+        except BookingNotFoundError as e:
+            st.warning(str(e))
+        except BookingError as e:
+            st.error(f"❌ {e}")
+        except Exception as e:
+            st.error(f"Terjadi kesalahan: {e}")
@@ -0,0 +1,569 @@
+# booking_service.py
+"""Logika booking ruangan tanpa Streamlit, dipakai halaman UI dan api.py."""
+
+import threading
+from abc import ABC, abstractmethod
+from datetime import date as Date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from booking_index import BookingIndex, get_booking_index
+from room_catalog import RoomCatalog, RoomRequirements, get_room_catalog
+from storage import BookingRecord, find_conflicts, parse_booking_id
+from waitlist import PRIORITIES, Waitlist, WaitlistEntry, get_waitlist
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+OPENING_HOUR = 7
+CLOSING_HOUR = 17
+
+
+class BookingError(Exception):
+    """Dasar semua error booking; pesannya siap ditampilkan ke user"""
+
+
+class InvalidBookingError(BookingError):
+    pass
+
+
+class BookingConflictError(BookingError):
+    pass
+
+
+class BookingNotFoundError(BookingError):
+    pass
+
+
+class BookingPermissionError(BookingError):
+    pass
+
+
+class RoomStatus:
+    __slots__ = ("status", "booked_by", "duration", "matkul")
+
+    def __init__(
+        self,
+        status: str = "Free",
+        booked_by: str = "-",
+        duration: int = 0,
+        matkul: str = "-",
+    ):
+        self.status = status
+        self.booked_by = booked_by
+        self.duration = duration
+        self.matkul = matkul
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "bookedBy": self.booked_by,
+            "duration": self.duration,
+            "matkul": self.matkul,
+        }
+
+
+class Booking(ABC):
+    __slots__ = ("room", "start_hour", "duration", "user", "matkul", "requirements")
+
+    def __init__(
+        self,
+        room: str,
+        start_hour: int,
+        duration: int,
+        user: str,
+        matkul: str,
+        requirements: Optional[RoomRequirements] = None,
+    ):
+        self.room = room
+        self.start_hour = start_hour
+        self.duration = duration
+        self.user = user
+        self.matkul = matkul
+        # Hanya dicek saat booking dibuat, tidak ikut disimpan
+        self.requirements = requirements
+
+    @abstractmethod
+    def validate(self) -> bool:
+        pass
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        pass
+
+    def to_record(self, date: str) -> BookingRecord:
+        data = self.to_dict()
+        return BookingRecord(
+            self.room,
+            date,
+            self.start_hour * 60,
+            (self.start_hour + self.duration) * 60,
+            self.user,
+            self.matkul,
+            data["status"],
+            data["type"],
+        )
+
+
+class RegularBooking(Booking):
+    __slots__ = ()
+
+    def validate(self) -> bool:
+        return self.duration <= 2 and OPENING_HOUR <= self.start_hour < CLOSING_HOUR
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "Booked",
+            "bookedBy": self.user,
+            "duration": self.duration,
+            "endTime": f"{(self.start_hour + self.duration):02d}:00",
+            "matkul": self.matkul,
+            "type": "Regular",
+        }
+
+
+class ExtendedBooking(Booking):
+    __slots__ = ()
+
+    def validate(self) -> bool:
+        return self.duration <= 4 and OPENING_HOUR <= self.start_hour < CLOSING_HOUR
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "Booked (Extended)",
+            "bookedBy": self.user,
+            "duration": self.duration,
+            "endTime": f"{(self.start_hour + self.duration):02d}:00",
+            "matkul": self.matkul,
+            "type": "Extended",
+        }
+
+
+# Dipakai bersama untuk semua ruangan kosong; jangan diubah
+FREE_STATUS = RoomStatus()
+
+
+def make_booking(
+    room: str,
+    start_hour: int,
+    duration: int,
+    user: str,
+    matkul: str,
+    requirements: Optional[RoomRequirements] = None,
+) -> Booking:
+    if duration <= 2:
+        return RegularBooking(room, start_hour, duration, user, matkul, requirements)
+    return ExtendedBooking(room, start_hour, duration, user, matkul, requirements)
+
+
+class BulkBookingResult:
+    """Hasil booking massal per tanggal: berhasil, bentrok atau tidak valid"""
+
+    def __init__(self):
+        self.booked: List[Tuple[str, Booking]] = []
+        self.conflicts: List[Tuple[str, Booking]] = []
+        self.invalid: List[Tuple[str, Booking]] = []
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.booked) and not self.conflicts and not self.invalid
+
+
+class BookingService:
+    """Operasi booking di atas BookingIndex.
+
+    Semua method mengembalikan data biasa atau melempar BookingError, tidak
+    pernah menyentuh Streamlit, jadi bisa dipakai dari API atau skrip.
+    """
+
+    def __init__(
+        self,
+        rooms: Optional[List[str]] = None,
+        index: Optional[BookingIndex] = None,
+        catalog: Optional[RoomCatalog] = None,
+        waitlist: Optional[Waitlist] = None,
+    ):
+        if catalog is None:
+            catalog = (
+                RoomCatalog.from_ids(rooms) if rooms is not None else get_room_catalog()
+            )
+        self.catalog = catalog
+        self.index = index or get_booking_index()
+        self.waitlist = waitlist or get_waitlist()
+
+    @property
+    def rooms(self) -> List[str]:
+        return self.catalog.ids()
+
+    def _check_booking(self, date: str, booking: Booking):
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            raise InvalidBookingError(f"Tanggal tidak valid: {date}")
+        room = self.catalog.get(booking.room)
+        if room is None:
+            raise InvalidBookingError(f"Ruangan {booking.room} tidak dikenal")
+        if booking.requirements:
+            missing = booking.requirements.missing(room)
+            if missing:
+                raise InvalidBookingError(
+                    f"Ruangan {booking.room} tidak memenuhi kebutuhan: "
+                    + ", ".join(missing)
+                )
+        self._check_hours(booking.start_hour, booking.duration)
+
+    def _check_hours(self, start_hour: int, duration: int):
+        """Jam mulai dan durasi harus lolos validasi Regular/ExtendedBooking"""
+        booking = make_booking("-", start_hour, duration, "-", "-")
+        if duration < 1 or not booking.validate():
+            raise InvalidBookingError("Booking tidak valid")
+        if start_hour + duration > CLOSING_HOUR:
+            raise InvalidBookingError(
+                f"Booking melebihi jam operasional ({CLOSING_HOUR}:00)"
+            )
+
+    def is_available(
+        self, date: str, start_hour: int, duration: int, room: str
+    ) -> bool:
+        """Ruangan kosong selama seluruh interval"""
+        return self.index.is_free(
+            room, date, start_hour * 60, (start_hour + duration) * 60
+        )
+
+    def create_booking(
+        self,
+        date: str,
+        start_hour: int,
+        duration: int,
+        room: str,
+        user: str,
+        matkul: str,
+        requirements: Optional[RoomRequirements] = None,
+    ) -> BookingRecord:
+        booking = make_booking(room, start_hour, duration, user, matkul, requirements)
+        self._check_booking(date, booking)
+        record = booking.to_record(date)
+        # Ketersediaan dicek ulang di dalam commit storage, jadi dua sesi yang
+        # membooking slot yang sama tidak bisa sama-sama berhasil
+        if not self.index.add_bookings([record]):
+            raise BookingConflictError(
+                f"Ruangan {room} sudah dibooking untuk waktu yang dipilih"
+            )
+        return record
+
+    def cancel_booking(
+        self, room: str, date: str, hour: int, user: str, admin: bool = False
+    ) -> BookingRecord:
+        """Hapus booking yang berjalan pada jam tersebut.
+
+        Hanya pemilik booking yang boleh menghapus, kecuali admin=True.
+        """
+        record = self.index.booking_at(room, date, hour * 60)
+        if record is None:
+            raise BookingNotFoundError("Ruangan belum dibooking.")
+        return self._cancel(record, user, admin)
+
+    def cancel_booking_by_id(
+        self, booking_id: str, user: str, admin: bool = False
+    ) -> BookingRecord:
+        """Hapus seluruh booking (semua jamnya sekaligus) berdasarkan ID.
+
+        ID mudah ditebak dari tanggal, jam dan ruangan, jadi pemilik tetap
+        dicek seperti cancel_booking.
+        """
+        try:
+            room, date, start = parse_booking_id(booking_id)
+        except ValueError as e:
+            raise InvalidBookingError(str(e))
+        record = self.index.booking_at(room, date, start)
+        if record is None or record.start != start:
+            raise BookingNotFoundError(f"Booking {booking_id} tidak ditemukan.")
+        return self._cancel(record, user, admin)
+
+    def _cancel(
+        self, record: BookingRecord, user: Optional[str], admin: bool = False
+    ) -> BookingRecord:
+        # Tanpa user yang jelas tidak ada yang boleh dihapus
+        if not user:
+            raise BookingPermissionError("User wajib diisi untuk menghapus booking.")
+        if record.booked_by != user and not admin:
+            raise BookingPermissionError(
+                "Anda tidak memiliki izin untuk menghapus booking ini."
+            )
+        # Satu record mencakup semua jam booking, jadi satu commit menghapus
+        # seluruhnya tanpa menyisakan slot yatim
+        if not self.index.remove_booking(
+            record.room, record.date, record.start, record.booked_by, actor=user
+        ):
+            raise BookingNotFoundError("Booking sudah tidak ada.")
+        try:
+            self.promote_waitlist(record.room, record.date)
+        except Exception as e:
+            # Pembatalan sudah tersimpan; antrean dicoba lagi pada pembatalan berikutnya
+            print(f"Error promoting waitlist: {e}")
+        return record
+
+    def join_waitlist(
+        self,
+        date: str,
+        start_hour: int,
+        duration: int,
+        room: str,
+        user: str,
+        matkul: str,
+        priority: str = "reguler",
+        requirements: Optional[RoomRequirements] = None,
+    ) -> WaitlistEntry:
+        """Antrekan booking yang bentrok; dibooking otomatis saat slotnya kosong"""
+        booking = make_booking(room, start_hour, duration, user, matkul, requirements)
+        self._check_booking(date, booking)
+        if priority not in PRIORITIES:
+            raise InvalidBookingError(f"Prioritas tidak dikenal: {priority}")
+        if date < Date.today().strftime("%Y-%m-%d"):
+            raise InvalidBookingError("Tanggal sudah lewat")
+        if self.is_available(date, start_hour, duration, room):
+            raise InvalidBookingError(
+                f"Ruangan {room} masih kosong, silakan langsung booking"
+            )
+        entry = self.waitlist.add(
+            room, date, start_hour, duration, user, matkul, priority
+        )
+        if entry is None:
+            raise InvalidBookingError("Anda sudah ada di daftar tunggu slot ini")
+        return entry
+
+    def leave_waitlist(self, entry_id: str, user: str):
+        if not user:
+            raise BookingPermissionError("User wajib diisi untuk keluar dari antrean.")
+        if not self.waitlist.remove(entry_id, user):
+            raise BookingNotFoundError(f"Antrean {entry_id} tidak ditemukan.")
+
+    def promote_waitlist(self, room: str, date: str) -> List[WaitlistEntry]:
+        """Booking-kan antrean (room, date) yang kini muat, prioritas tertinggi dulu"""
+
+        def try_commit(entry: WaitlistEntry) -> Optional[bool]:
+            if entry.date < Date.today().strftime("%Y-%m-%d"):
+                return None
+            record = make_booking(
+                entry.room, entry.start_hour, entry.duration, entry.user, entry.matkul
+            ).to_record(entry.date)
+            if self.index.add_bookings([record]):
+                return True
+            existing = self.index.booking_at(entry.room, entry.date, record.start)
+            if existing is not None and (
+                existing.start,
+                existing.end,
+                existing.booked_by,
+            ) == (record.start, record.end, record.booked_by):
+                # Sudah di-commit oleh promosi yang terputus sebelum antrean
+                # sempat diperbarui
+                return None
+            return False
+
+        return self.waitlist.promote(room, date, try_commit)
+
+    def my_bookings(
+        self, user: str, first_date: Optional[str] = None
+    ) -> List[BookingRecord]:
+        """Booking milik user mulai first_date (default hari ini)"""
+        if first_date is None:
+            first_date = Date.today().strftime("%Y-%m-%d")
+        return self.index.bookings_of(user, first_date)
+
+    def create_bookings_bulk(
+        self, entries: List[Tuple[str, Booking]], skip_conflicts: bool = False
+    ) -> BulkBookingResult:
+        """Validasi semua (tanggal, booking) sekaligus lalu commit dalam satu tulis.
+
+        Tanpa skip_conflicts tidak ada yang disimpan jika satu saja bentrok atau
+        tidak valid; dengan skip_conflicts hanya yang kosong dan valid disimpan.
+        """
+        result = BulkBookingResult()
+        candidates: List[Tuple[str, Booking]] = []
+        for date, booking in entries:
+            try:
+                self._check_booking(date, booking)
+            except InvalidBookingError:
+                result.invalid.append((date, booking))
+                continue
+            if self.is_available(
+                date, booking.start_hour, booking.duration, booking.room
+            ):
+                candidates.append((date, booking))
+            else:
+                result.conflicts.append((date, booking))
+
+        records = [booking.to_record(date) for date, booking in candidates]
+        # Antar-entri juga bisa bentrok (misalnya tanggal yang sama dua kali)
+        clashing = {id(record) for record in find_conflicts([], records)}
+        accepted = []
+        for entry, record in zip(candidates, records):
+            if id(record) in clashing:
+                result.conflicts.append(entry)
+            else:
+                accepted.append((entry, record))
+
+        if not accepted or (
+            (result.conflicts or result.invalid) and not skip_conflicts
+        ):
+            return result
+        if self.index.add_bookings([record for _, record in accepted]):
+            result.booked = [entry for entry, _ in accepted]
+        else:
+            # Ada sesi lain yang membooking salah satu slot di antara cek dan commit
+            result.conflicts.extend(entry for entry, _ in accepted)
+        return result
+
+    def create_recurring_booking(
+        self,
+        room: str,
+        weekday: int,
+        start_hour: int,
+        duration: int,
+        first_date: Date,
+        last_date: Date,
+        user: str,
+        matkul: str,
+        skip_conflicts: bool = False,
+        requirements: Optional[RoomRequirements] = None,
+    ) -> BulkBookingResult:
+        """Booking mingguan setiap `weekday` (0 = Senin) di antara dua tanggal, inklusif"""
+        current = first_date + timedelta(days=(weekday - first_date.weekday()) % 7)
+        entries = []
+        while current <= last_date:
+            entries.append(
+                (
+                    current.strftime("%Y-%m-%d"),
+                    make_booking(
+                        room, start_hour, duration, user, matkul, requirements
+                    ),
+                )
+            )
+            current += timedelta(days=7)
+        return self.create_bookings_bulk(entries, skip_conflicts)
+
+    def get_room_status(
+        self, date: str, hour: int, rooms: Optional[List[str]] = None
+    ) -> Dict[str, RoomStatus]:
+        running = self.index.status_at(date, hour * 60)
+        status_dict: Dict[str, RoomStatus] = {}
+        for room in self.rooms if rooms is None else rooms:
+            if room in running:
+                record = running[room]
+                status_dict[room] = RoomStatus(
+                    status="Booked",
+                    booked_by=record.booked_by,
+                    duration=record.duration,
+                    matkul=record.matkul,
+                )
+            else:
+                status_dict[room] = FREE_STATUS
+        return status_dict
+
+    def status_frame(
+        self, date: str, hour: int, rooms: Optional[List[str]] = None
+    ) -> "pd.DataFrame":
+        """Tabel status + metadata ruangan untuk ditampilkan.
+
+        Metadata diambil dari tabel katalog yang sudah jadi; per rerun hanya
+        kolom status yang dibuat, dan hanya ruangan yang sedang dibooking
+        yang diisi satu per satu.
+        """
+        import pandas as pd  # hanya dimuat saat tabel pertama kali dibuat
+
+        meta = self.catalog.frame()
+        if rooms is not None:
+            meta = meta.iloc[self.catalog.positions(rooms)]
+        status = np.full(len(meta), "Free", dtype=object)
+        booked_by = np.full(len(meta), "-", dtype=object)
+        matkul = np.full(len(meta), "-", dtype=object)
+        running = self.index.status_at(date, hour * 60)
+        if running:
+            records = list(running.values())
+            rows = meta.index.get_indexer([record.room for record in records])
+            for row, record in zip(rows, records):
+                if row >= 0:
+                    status[row] = "Booked"
+                    booked_by[row] = record.booked_by
+                    matkul[row] = record.matkul
+        return pd.DataFrame(
+            {
+                "Nama Ruangan": meta.index,
+                "Status": status,
+                "Dosen": booked_by,
+                "Mata Kuliah": matkul,
+                **{column: meta[column].to_numpy() for column in meta.columns},
+            }
+        )
+
+    def matching_rooms(
+        self, requirements: RoomRequirements, rooms: Optional[List[str]] = None
+    ) -> List[str]:
+        """Ruangan yang memenuhi kebutuhan kelas, kapasitas terkecil dulu"""
+        return self.catalog.best_fit(requirements, rooms)
+
+    def find_rooms(
+        self,
+        date: str,
+        start_hour: int,
+        duration: int,
+        requirements: Optional[RoomRequirements] = None,
+        rooms: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Ruangan yang cocok dan kosong selama seluruh interval.
+
+        Kandidat diambil dari bitset katalog, lalu hanya kandidat itu yang
+        dicek di array occupancy, tidak semua ruangan.
+        """
+        self._check_hours(start_hour, duration)
+        candidates = self.catalog.best_fit(requirements or RoomRequirements(), rooms)
+        if not candidates:
+            return []
+        occupied = self.index.occupancy(
+            [date], candidates, start_hour, start_hour + duration
+        )
+        free = np.flatnonzero(~occupied[0].any(axis=0))
+        return [candidates[i] for i in free]
+
+    def find_free_slots(
+        self,
+        duration: int,
+        dates: List[str],
+        preferred_rooms: Optional[List[str]] = None,
+        preferred_hours: Optional[List[int]] = None,
+        rooms: Optional[List[str]] = None,
+        requirements: Optional[RoomRequirements] = None,
+    ) -> List[Tuple[str, str, int]]:
+        """(room, date, start_minute) yang kosong selama `duration` jam.
+
+        Dengan requirements, hanya ruangan yang cocok yang dicari dan ruangan
+        yang paling pas didahulukan pada tanggal/jam yang sama.
+        """
+        self._check_hours(OPENING_HOUR, duration)
+        if requirements:
+            rooms = self.catalog.best_fit(requirements, rooms)
+        return self.index.find_free_slots(
+            duration * 60,
+            dates,
+            self.rooms if rooms is None else rooms,
+            OPENING_HOUR,
+            CLOSING_HOUR,
+            preferred_rooms,
+            preferred_hours,
+        )
+
+
+_shared_service: Optional[BookingService] = None
+_shared_lock = threading.Lock()
+
+
+def get_booking_service() -> BookingService:
+    """Satu service per proses di atas index bersama, dipakai semua halaman"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = BookingService()
+    # Tetap lewat get_booking_index agar kompaksi harian ikut terjadwal
+    get_booking_index()
+    return _shared_service
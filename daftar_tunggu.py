@@ -0,0 +1,141 @@
+# daftar_tunggu.py
+"""Panel daftar tunggu: tawaran mengantre setelah booking bentrok dan antrean user."""
+
+from typing import List, Optional
+
+import streamlit as st
+
+from booking_service import BookingError, BookingService
+from notifikasi import flash
+from room_catalog import RoomRequirements
+from waitlist import PRIORITY_LABELS
+
+
+def offer_waitlist(
+    date: str,
+    start_hour: int,
+    duration: int,
+    room: str,
+    matkul: str,
+    requirements: Optional[RoomRequirements] = None,
+):
+    """Simpan permintaan yang bentrok agar panel menawarkan masuk daftar tunggu"""
+    st.session_state["_waitlist_offer"] = {
+        "date": date,
+        "start_hour": start_hour,
+        "duration": duration,
+        "room": room,
+        "matkul": matkul,
+        "requirements": requirements,
+    }
+
+
+def _join(service: BookingService, name: str, request: dict, priority: str):
+    try:
+        entry = service.join_waitlist(user=name, priority=priority, **request)
+        st.session_state.pop("_waitlist_offer", None)
+        flash(
+            f"Masuk daftar tunggu ruangan {entry.room}; booking dibuat otomatis "
+            "saat slotnya kosong",
+            "⏳",
+        )
+        st.rerun()
+    except BookingError as e:
+        st.error(f"❌ {e}")
+
+
+def waitlist_request(
+    service: BookingService,
+    name: str,
+    date: str,
+    start_hour: int,
+    duration: int,
+    rooms: List[str],
+    matkul_options: List[str],
+    requirements: Optional[RoomRequirements] = None,
+):
+    """Form mengantre langsung saat tidak ada ruangan kosong yang cocok"""
+    with st.form("waitlist_form"):
+        room = st.selectbox("Ruangan yang Ditunggu", rooms)
+        matkul = st.selectbox("Mata Kuliah", matkul_options)
+        priority = st.radio(
+            "Prioritas",
+            list(PRIORITY_LABELS),
+            format_func=PRIORITY_LABELS.get,
+            horizontal=True,
+        )
+        if st.form_submit_button("⏳ Masuk Daftar Tunggu"):
+            request = {
+                "date": date,
+                "start_hour": start_hour,
+                "duration": duration,
+                "room": room,
+                "matkul": matkul,
+                "requirements": requirements,
+            }
+            _join(service, name, request, priority)
+
+
+def waitlist_panel(service: BookingService, name: str):
+    """Pemberitahuan promosi, tawaran yang tertunda, dan antrean milik `name`"""
+    for message in service.waitlist.pop_notices(name):
+        st.toast(message, icon="🎉")
+
+    offer = st.session_state.get("_waitlist_offer")
+    if offer:
+        with st.container(border=True):
+            st.warning(
+                f"Ruangan {offer['room']} pada {offer['date']} jam "
+                f"{offer['start_hour']:02d}:00 - "
+                f"{offer['start_hour'] + offer['duration']:02d}:00 sudah dibooking. "
+                "Masuk daftar tunggu?"
+            )
+            priority = st.radio(
+                "Prioritas",
+                list(PRIORITY_LABELS),
+                format_func=PRIORITY_LABELS.get,
+                horizontal=True,
+                key="waitlist_offer_priority",
+            )
+            col1, col2 = st.columns(2)
+            if col1.button("⏳ Masuk Daftar Tunggu"):
+                _join(service, name, offer, priority)
+            if col2.button("Batal"):
+                st.session_state.pop("_waitlist_offer", None)
+                st.rerun()
+
+    entries = service.waitlist.entries_of(name)
+    if not entries:
+        return
+    st.subheader("Daftar Tunggu Saya")
+    st.dataframe(
+        [
+            {
+                "Tanggal": entry.date,
+                "Jam": f"{entry.start_hour:02d}:00 - "
+                f"{entry.start_hour + entry.duration:02d}:00",
+                "Ruangan": entry.room,
+                "Mata Kuliah": entry.matkul,
+                "Prioritas": PRIORITY_LABELS.get(entry.priority, entry.priority),
+            }
+            for entry in entries
+        ],
+        hide_index=True,
+    )
+    by_id = {entry.id: entry for entry in entries}
+    entry_id = st.selectbox(
+        "Pilih Antrean",
+        list(by_id),
+        format_func=lambda entry_id: (
+            f"{by_id[entry_id].date} {by_id[entry_id].start_hour:02d}:00 "
+            f"{by_id[entry_id].room}"
+        ),
+        key="daftar_tunggu",
+    )
+    if st.button("Keluar dari Daftar Tunggu"):
+        try:
+            service.leave_waitlist(entry_id, user=name)
+            flash("Anda keluar dari daftar tunggu", "🚮")
+            st.rerun()
+        except BookingError as e:
+            st.warning(str(e))
@@ -0,0 +1,22 @@
+# filter_ruangan.py
+"""Filter ruangan berdasarkan katalog, dipakai bersama oleh semua halaman."""
+
+from typing import List
+
+import streamlit as st
+
+from room_catalog import RoomCatalog
+
+
+def room_filter(catalog: RoomCatalog) -> List[str]:
+    """Tampilkan filter gedung/lantai/kapasitas/fasilitas, return id ruangan"""
+    with st.expander("Filter Ruangan"):
+        buildings = st.multiselect("Gedung", catalog.buildings())
+        floors = st.multiselect("Lantai", catalog.floors())
+        min_capacity = st.number_input("Kapasitas Minimal", min_value=0, step=5)
+        facilities = st.multiselect("Fasilitas", catalog.facilities())
+    rooms = catalog.filter(buildings, floors, min_capacity, facilities)
+    if not rooms:
+        st.warning("Tidak ada ruangan yang cocok dengan filter")
+        st.stop()
+    return rooms
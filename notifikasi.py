@@ -0,0 +1,15 @@
+# notifikasi.py
+"""Pesan yang disimpan di session_state dan ditampilkan sebagai toast setelah rerun."""
+
+import streamlit as st
+
+
+def flash(message: str, icon: str = "✅"):
+    """Simpan pesan untuk ditampilkan setelah st.rerun() atau st.switch_page()"""
+    st.session_state.setdefault("_flash", []).append((message, icon))
+
+
+def show_flash():
+    """Tampilkan lalu hapus semua pesan yang tertunda"""
+    for message, icon in st.session_state.pop("_flash", []):
+        st.toast(message, icon=icon)
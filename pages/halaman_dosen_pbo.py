@@ -1,45 +1,27 @@
 from abc import ABC, abstractmethod
 import streamlit as st
-import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-import json
-from typing import Dict, List, Optional
-import os
-
-ROOMS = [
-    "A10.01.01",
-    "A10.01.02",
-    "A10.01.03",
-    "A10.01.04",
-    "A10.01.05",
-    "A10.01.06",
-    "A10.01.07",
-    "A10.01.08",
-    "A10.01.09",
-    "A10.01.10",
-]
-
-
-class RoomStatus:
-    def __init__(
-        self,
-        status: str = "Free",
-        booked_by: str = "-",
-        duration: int = 0,
-        matkul: str = "-",
-    ):
-        self.status = status
-        self.booked_by = booked_by
-        self.duration = duration
-        self.matkul = matkul
-
-    def to_dict(self) -> dict:
-        return {
-            "status": self.status,
-            "bookedBy": self.booked_by,
-            "duration": self.duration,
-            "matkul": self.matkul,
-        }
+from typing import Dict, List, Optional, Tuple
+from booking_service import (
+    CLOSING_HOUR,
+    BookingConflictError,
+    BookingError,
+    BookingService,
+    BulkBookingResult,
+    InvalidBookingError,
+    RoomStatus,
+    get_booking_service,
+)
+from room_catalog import RoomRequirements
+from booking_saya import my_bookings_panel
+from daftar_tunggu import offer_waitlist, waitlist_panel, waitlist_request
+from filter_ruangan import room_filter
+from notifikasi import flash, show_flash
+from tabel_status import status_table
+from unduh_jadwal import schedule_downloads
+
+WEEKDAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
 
 
 class BookingInterface(ABC):
@@ -58,96 +40,22 @@ class BookingInterface(ABC):
         room: str,
         user: str,
         matkul: str,
+        requirements: Optional[RoomRequirements] = None,
     ) -> bool:
         pass
 
 
-class Booking(ABC):
-    def __init__(
-        self, room: str, start_hour: int, duration: int, user: str, matkul: str
-    ):
-        self.room = room
-        self.start_hour = start_hour
-        self.duration = duration
-        self.user = user
-        self.matkul = matkul
-
-    @abstractmethod
-    def validate(self) -> bool:
-        pass
-
-    @abstractmethod
-    def to_dict(self) -> dict:
-        pass
-
-
-class RegularBooking(Booking):
-    def validate(self) -> bool:
-        return self.duration <= 2 and 7 <= self.start_hour <= 16
-
-    def to_dict(self) -> dict:
-        return {
-            "status": "Booked",
-            "bookedBy": self.user,
-            "duration": self.duration,
-            "endTime": f"{(self.start_hour + self.duration):02d}:00",
-            "matkul": self.matkul,
-            "type": "Regular",
-        }
-
-
-class ExtendedBooking(Booking):
-    def validate(self) -> bool:
-        return self.duration <= 4 and 7 <= self.start_hour <= 16
-
-    def to_dict(self) -> dict:
-        return {
-            "status": "Booked (Extended)",
-            "bookedBy": self.user,
-            "duration": self.duration,
-            "endTime": f"{(self.start_hour + self.duration):02d}:00",
-            "matkul": self.matkul,
-            "type": "Extended",
-        }
-
-
 class RoomBookingSystem(BookingInterface):
-    def __init__(self, rooms: List[str] = ROOMS):
-        self.rooms = rooms
-        self.json_file = "data/ruangans.json"
-        self._initialize_json()
+    """Adapter Streamlit di atas BookingService: error ditampilkan, sukses rerun"""
 
-    def _initialize_json(self):
-        try:
-            if not os.path.exists(self.json_file):
-                with open(self.json_file, "w") as f:
-                    json.dump({}, f)
-        except Exception as e:
-            print(f"Error initializing JSON: {e}")
+    def __init__(self, service: Optional[BookingService] = None):
+        self.service = service or get_booking_service()
+        self.catalog = self.service.catalog
+        self.index = self.service.index
 
-    def _check_availability(
-        self, date: str, start_hour: int, duration: int, room: str
-    ) -> bool:
-        """Check if room is available for all required time slots"""
-        try:
-            with open(self.json_file, "r") as f:
-                bookings = json.load(f)
-
-            # Check each hour in the duration range
-            for i in range(duration):
-                current_hour = start_hour + i
-                booking_key = f"{date}_{current_hour:02d}:00"
-
-                if (
-                    booking_key in bookings
-                    and room in bookings[booking_key]
-                    and bookings[booking_key][room]["status"] == "Booked"
-                ):
-                    return False
-            return True
-        except Exception as e:
-            print(f"Error checking availability: {e}")
-            return False
+    @property
+    def rooms(self) -> List[str]:
+        return self.service.rooms
 
     def create_booking(
         self,
@@ -157,78 +65,61 @@ class RoomBookingSystem(BookingInterface):
         room: str,
         user: str,
         matkul: str,
+        requirements: Optional[RoomRequirements] = None,
     ) -> bool:
         try:
-            # Check availability first
-            if not self._check_availability(date, start_hour, duration, room):
-                st.error(f"Ruangan {room} sudah dibooking untuk waktu yang dipilih")
-                return False
-
-            # Create booking if available
-            booking: Booking
-            if duration <= 2:
-                booking = RegularBooking(room, start_hour, duration, user, matkul)
-            else:
-                booking = ExtendedBooking(room, start_hour, duration, user, matkul)
-
-            if not booking.validate():
-                st.error("Booking tidak valid")
-                return False
-
-            with open(self.json_file, "r") as f:
-                bookings = json.load(f)
-
-            for i in range(duration):
-                current_hour = start_hour + i
-                booking_key = f"{date}_{current_hour:02d}:00"
-
-                if booking_key not in bookings:
-                    bookings[booking_key] = {}
-
-                bookings[booking_key][room] = booking.to_dict()
-
-            with open(self.json_file, "w") as f:
-                json.dump(bookings, f, indent=4)
-            st.success(
-                f"Ruangan {room} berhasil dibooking untuk jam {start_hour:02d}:00 - {(start_hour + duration):02d}:00\n"
+            self.service.create_booking(
+                date, start_hour, duration, room, user, matkul, requirements
             )
-            st.rerun()
-            return True
-
+        except BookingConflictError as e:
+            # Keduluan sesi lain: tawarkan daftar tunggu daripada mencoba terus
+            st.error(str(e))
+            offer_waitlist(date, start_hour, duration, room, matkul, requirements)
+            return False
+        except BookingError as e:
+            st.error(str(e))
+            return False
         except Exception as e:
             print(f"Error creating booking: {e}")
+            st.error("Terjadi kesalahan saat menyimpan booking")
             return False
+        flash(
+            f"Ruangan {room} berhasil dibooking untuk jam {start_hour:02d}:00 - {(start_hour + duration):02d}:00"
+        )
+        st.rerun()
+        return True
+
+    def create_recurring_booking(self, *args, **kwargs) -> BulkBookingResult:
+        return self.service.create_recurring_booking(*args, **kwargs)
+
+    def find_free_slots(self, *args, **kwargs) -> List[Tuple[str, str, int]]:
+        return self.service.find_free_slots(*args, **kwargs)
+
+    def find_rooms(self, *args, **kwargs) -> List[str]:
+        return self.service.find_rooms(*args, **kwargs)
+
+    def matching_rooms(self, *args, **kwargs) -> List[str]:
+        return self.service.matching_rooms(*args, **kwargs)
 
     def get_room_status(
         self, selected_date: datetime, selected_time: int
     ) -> Dict[str, RoomStatus]:
         try:
-            with open(self.json_file, "r") as f:
-                bookings = json.load(f)
-
-            date_str = selected_date.strftime("%Y-%m-%d")
-            booking_key = f"{date_str}_{selected_time:02d}:00"
-
-            status_dict: Dict[str, RoomStatus] = {}
-            for room in self.rooms:
-                if booking_key in bookings and room in bookings[booking_key]:
-                    booking_data = bookings[booking_key][room]
-                    status_dict[room] = RoomStatus(
-                        status="Booked",
-                        booked_by=booking_data["bookedBy"],
-                        duration=booking_data["duration"],
-                        matkul=booking_data.get("matkul", "-"),
-                    )
-                else:
-                    status_dict[room] = RoomStatus()
-
-            return status_dict
-
+            return self.service.get_room_status(
+                selected_date.strftime("%Y-%m-%d"), selected_time
+            )
         except Exception as e:
             print(f"Error getting room status: {e}")
             return {room: RoomStatus() for room in self.rooms}
 
 
+def heatmap_color(free_ratio: float) -> str:
+    """Merah (penuh) sampai hijau (semua kosong)"""
+    red = int(200 * (1 - free_ratio))
+    green = int(160 * free_ratio)
+    return f"background-color: rgb({red}, {green}, 60); color: white"
+
+
 class BookingUI:
     def __init__(self, booking_system: BookingInterface):
         self.booking_system = booking_system
@@ -247,6 +138,7 @@ class BookingUI:
         self.user_info = st.session_state.user
         st.title("🎓 Sistem Booking Ruangan")
         st.header(f"Selamat datang {self.user_info['name']}!")
+        show_flash()
 
     def render_date_time_selection(self):
         today = datetime.now()
@@ -261,44 +153,187 @@ class BookingUI:
         )
 
     def render_room_status(self):
-        selected_hour = int(self.selected_time.split(":")[0])
-        room_status = self.booking_system.get_room_status(
-            self.selected_date, selected_hour
+        # Diperbarui sendiri lewat fragment, hanya baris yang berubah
+        status_table(
+            self.booking_system.service,
+            self.selected_date.strftime("%Y-%m-%d"),
+            int(self.selected_time.split(":")[0]),
+            self.rooms,
         )
 
-        df = pd.DataFrame(
-            {
-                "Nama Ruangan": ROOMS,
-                "Status": [room_status[room].status for room in ROOMS],
-                "Dosen": [room_status[room].booked_by for room in ROOMS],
-                "Mata Kuliah": [room_status[room].matkul for room in ROOMS],
-            }
-        )
+    def render_week_grid(self):
+        # Grid ratusan sel ber-style mahal dibuat ulang setiap rerun, jadi
+        # hanya dibuat jika memang ingin dilihat
+        if not st.toggle("Tampilkan Ketersediaan Satu Minggu"):
+            return
+        import pandas as pd
 
-        styled_df = df.style.apply(
-            lambda row: ["color: green" if x == "Free" else "color: red" for x in row],
-            subset=["Status"],
-        )
+        with st.container(border=True):
+            today = datetime.now().date()
+            week_start = st.date_input(
+                "Mulai Minggu", value=today - timedelta(days=today.weekday())
+            )
+            days = [week_start + timedelta(days=i) for i in range(7)]
+            hours = list(range(7, CLOSING_HOUR))
+            occupied = self.booking_system.index.occupancy(
+                [day.strftime("%Y-%m-%d") for day in days],
+                self.rooms,
+                hours[0],
+                CLOSING_HOUR,
+            )
+            day_labels = [
+                f"{WEEKDAYS[day.weekday()][:3]} {day.strftime('%d/%m')}" for day in days
+            ]
+            hour_labels = [f"{hour:02d}:00" for hour in hours]
+
+            # Ringkasan: jumlah ruangan kosong per (jam, hari)
+            free_rooms = pd.DataFrame(
+                (~occupied).sum(axis=2).T, index=hour_labels, columns=day_labels
+            )
+            st.dataframe(
+                free_rooms.style.apply(
+                    lambda df: df.map(lambda n: heatmap_color(n / len(self.rooms))),
+                    axis=None,
+                )
+            )
+
+            # Detail: baris (hari, jam), kolom ruangan
+            detail = pd.DataFrame(
+                np.where(occupied.reshape(-1, len(self.rooms)), "Booked", "Free"),
+                index=[f"{d} {h}" for d in day_labels for h in hour_labels],
+                columns=self.rooms,
+            )
+            st.dataframe(
+                detail.style.apply(
+                    lambda df: np.where(df == "Free", "color: green", "color: red"),
+                    axis=None,
+                ),
+                height=400,
+            )
+
+    def render_room_search(self):
+        with st.expander("Cari Ruangan Kosong"):
+            with st.form("search_form"):
+                duration = st.number_input(
+                    "Durasi (jam)", min_value=1, max_value=4, value=2
+                )
+                today = datetime.now().date()
+                date_range = st.date_input(
+                    "Rentang Tanggal",
+                    value=(today, today + timedelta(days=7)),
+                    min_value=today,
+                )
+                preferred_rooms = st.multiselect("Ruangan Favorit", self.rooms)
+                preferred_hours = st.multiselect(
+                    "Jam Mulai Favorit",
+                    options=list(range(7, CLOSING_HOUR)),
+                    format_func=lambda hour: f"{hour:02d}:00",
+                )
+                if st.form_submit_button("Cari"):
+                    start, end = date_range[0], date_range[-1]
+                    dates = [
+                        (start + timedelta(days=i)).strftime("%Y-%m-%d")
+                        for i in range((end - start).days + 1)
+                    ]
+                    st.session_state["search_results"] = (
+                        duration,
+                        self.booking_system.find_free_slots(
+                            duration,
+                            dates,
+                            preferred_rooms,
+                            preferred_hours,
+                            self.rooms,
+                            self.requirements,
+                        ),
+                    )
+
+            if "search_results" not in st.session_state:
+                return
+            duration, results = st.session_state["search_results"]
+            if not results:
+                st.warning("Tidak ada ruangan kosong untuk durasi tersebut")
+                return
+            labels = [
+                f"{date} {start // 60:02d}:00 - {start // 60 + duration:02d}:00 | {room}"
+                for room, date, start in results
+            ]
+            st.caption(f"{len(results)} slot ditemukan")
+            choice = st.selectbox(
+                "Slot yang tersedia",
+                options=range(len(results)),
+                format_func=labels.__getitem__,
+            )
+            matkul = st.selectbox(
+                "Mata Kuliah",
+                options=st.session_state.user.get("matkul", ["-"]),
+                key="search_matkul",
+            )
+            if st.button("Book Slot Ini"):
+                room, date, start = results[choice]
+                del st.session_state["search_results"]
+                self.booking_system.create_booking(
+                    date,
+                    start // 60,
+                    duration,
+                    room,
+                    self.user_info["name"],
+                    matkul,
+                    self.requirements,
+                )
 
-        st.dataframe(
-            styled_df,
-            column_config={
-                "Nama Ruangan": st.column_config.TextColumn("Nama Ruangan", width=200),
-                "Status": st.column_config.TextColumn("Status", width=150),
-                "Dosen": st.column_config.TextColumn("Dosen", width=200),
-                "Mata Kuliah": st.column_config.TextColumn("Mata Kuliah", width=250),
-            },
-            hide_index=True,
+    def render_requirements(self):
+        """Kebutuhan kelas, dipakai form booking, pencarian dan booking berulang"""
+        col1, col2 = st.columns(2)
+        students = col1.number_input("Jumlah Mahasiswa", min_value=0, step=5)
+        facilities = col2.multiselect(
+            "Fasilitas Wajib", self.booking_system.catalog.facilities()
         )
+        self.requirements = RoomRequirements(students, facilities)
 
     def render_booking_form(self):
-        with st.form("booking_form"):
-            room_choice = st.selectbox("Pilih Ruangan", ROOMS)
-            start_time = st.selectbox(
-                "Jam Mulai", options=[f"{hour:02d}:00" for hour in range(7, 17)]
+        start_time = st.selectbox(
+            "Jam Mulai",
+            options=[f"{hour:02d}:00" for hour in range(7, 17)],
+            key="booking_start",
+        )
+        duration = st.number_input(
+            "Durasi (jam)", min_value=1, max_value=4, value=1, key="booking_duration"
+        )
+        # Ruangan yang cocok dan masih kosong, yang paling pas di atas
+        try:
+            rooms = self.booking_system.find_rooms(
+                self.selected_date.strftime("%Y-%m-%d"),
+                int(start_time.split(":")[0]),
+                duration,
+                self.requirements,
+                self.rooms,
             )
-            duration = st.number_input(
-                "Durasi (jam)", min_value=1, max_value=4, value=1
+        except InvalidBookingError as e:
+            st.warning(str(e))
+            return
+        if not rooms:
+            st.warning("Tidak ada ruangan kosong yang memenuhi kebutuhan")
+            candidates = self.booking_system.matching_rooms(
+                self.requirements, self.rooms
+            )
+            if candidates:
+                waitlist_request(
+                    self.booking_system.service,
+                    self.user_info["name"],
+                    self.selected_date.strftime("%Y-%m-%d"),
+                    int(start_time.split(":")[0]),
+                    duration,
+                    candidates,
+                    st.session_state.user.get("matkul", ["-"]),
+                    self.requirements,
+                )
+            return
+        catalog = self.booking_system.catalog
+        with st.form("booking_form"):
+            room_choice = st.selectbox(
+                "Pilih Ruangan",
+                rooms,
+                format_func=lambda room: f"{room} ({catalog.get(room).capacity} kursi)",
             )
             matkul = st.selectbox(
                 "Pilih Mata Kuliah", options=st.session_state.user.get("matkul", ["-"])
@@ -312,45 +347,125 @@ class BookingUI:
     def handle_booking_submission(
         self, room_choice: str, start_time: str, duration: int, matkul: str
     ):
-        start_hour = int(start_time.split(":")[0])
-        end_hour = start_hour + duration
+        # Validasi, cek bentrok dan pesan hasil ditangani RoomBookingSystem
+        self.booking_system.create_booking(
+            self.selected_date.strftime("%Y-%m-%d"),
+            int(start_time.split(":")[0]),
+            duration,
+            room_choice,
+            self.user_info["name"],
+            matkul,
+            self.requirements,
+        )
 
-        if end_hour > 17:
-            st.error("Booking melebihi jam operasional (17:00)")
-            return
+    def render_recurring_form(self):
+        with st.expander("Booking Berulang (Mingguan)"):
+            rooms = self.booking_system.matching_rooms(self.requirements, self.rooms)
+            if not rooms:
+                st.warning("Tidak ada ruangan yang memenuhi kebutuhan")
+                return
+            with st.form("recurring_form"):
+                room_choice = st.selectbox("Ruangan", rooms)
+                weekday = st.selectbox(
+                    "Hari", options=range(5), format_func=lambda i: WEEKDAYS[i]
+                )
+                start_time = st.selectbox(
+                    "Jam Mulai", options=[f"{hour:02d}:00" for hour in range(7, 17)]
+                )
+                duration = st.number_input(
+                    "Durasi (jam)", min_value=1, max_value=4, value=2
+                )
+                today = datetime.now().date()
+                date_range = st.date_input(
+                    "Periode", value=(today, today + timedelta(weeks=16))
+                )
+                matkul = st.selectbox(
+                    "Mata Kuliah", options=st.session_state.user.get("matkul", ["-"])
+                )
+                skip_conflicts = st.checkbox("Lewati tanggal yang bentrok")
+
+                if st.form_submit_button("Book Semua"):
+                    if len(date_range) != 2:
+                        st.error("Pilih tanggal awal dan akhir")
+                        return
+                    result = self.booking_system.create_recurring_booking(
+                        room_choice,
+                        weekday,
+                        int(start_time.split(":")[0]),
+                        duration,
+                        date_range[0],
+                        date_range[1],
+                        self.user_info["name"],
+                        matkul,
+                        skip_conflicts,
+                        self.requirements,
+                    )
+                    self.render_bulk_result(result)
 
-        date_str = self.selected_date.strftime("%Y-%m-%d")
-        success = self.booking_system.create_booking(
-            date_str, start_hour, duration, room_choice, self.user_info["name"], matkul
-        )
+    def render_bulk_result(self, result: BulkBookingResult):
+        import pandas as pd
 
-        if success:
-            st.success(
-                f"Ruangan {room_choice} berhasil dibooking untuk {duration} jam!"
-            )
-            st.rerun()
+        if result.booked:
+            st.success(f"{len(result.booked)} booking berhasil disimpan")
+        elif result.conflicts or result.invalid:
+            st.error("Tidak ada booking yang disimpan")
         else:
-            st.error("Ruangan tidak tersedia untuk durasi yang dipilih")
+            st.warning("Tidak ada tanggal dalam periode yang dipilih")
+
+        problems = [(date, b, "Bentrok") for date, b in result.conflicts] + [
+            (date, b, "Tidak valid") for date, b in result.invalid
+        ]
+        if problems:
+            st.dataframe(
+                pd.DataFrame(
+                    {
+                        "Tanggal": [date for date, _, _ in problems],
+                        "Ruangan": [b.room for _, b, _ in problems],
+                        "Jam": [
+                            f"{b.start_hour:02d}:00 - {b.start_hour + b.duration:02d}:00"
+                            for _, b, _ in problems
+                        ],
+                        "Masalah": [reason for _, _, reason in problems],
+                    }
+                ).sort_values("Tanggal"),
+                hide_index=True,
+            )
 
     def render(self):
         self.render_date_time_selection()
+        self.rooms = room_filter(self.booking_system.catalog)
         st.divider()
 
         col1, col2 = st.columns([2, 1])
         with col1:
             st.subheader("Status Ruangan")
             self.render_room_status()
+            self.render_week_grid()
+            st.subheader("Booking Saya")
+            my_bookings_panel(self.booking_system.service, self.user_info["name"])
 
         with col2:
             st.subheader("Booking Ruangan")
+            self.render_requirements()
             self.render_booking_form()
+            waitlist_panel(self.booking_system.service, self.user_info["name"])
+            self.render_room_search()
+            self.render_recurring_form()
+            st.subheader("Unduh Jadwal Saya")
+            schedule_downloads(self.user_info["name"])
 
 
 # Constants
 
 
+@st.cache_resource
+def get_booking_system() -> RoomBookingSystem:
+    """Dibuat sekali per proses; adapter ini tidak menyimpan state per sesi"""
+    return RoomBookingSystem()
+
+
 # Main execution
 if __name__ == "__main__":
-    booking_system = RoomBookingSystem()
+    booking_system = get_booking_system()
     ui = BookingUI(booking_system)
     ui.render()
@@ -0,0 +1,113 @@
+import streamlit as st
+from datetime import datetime, timedelta
+from analytics import (
+    GROUPS,
+    HOURS,
+    OPERATING_WEEKDAYS,
+    get_booking_analytics,
+    peak_hours,
+    usage_summary,
+    weekly_hours,
+)
+from booking_service import get_booking_service
+from filter_ruangan import room_filter
+from notifikasi import show_flash
+
+# Laporan pemakaian hanya untuk admin dan dosen, bukan mahasiswa
+LAPORAN_ROLES = ("Admin", "Dosen")
+
+st.set_page_config(page_title="Laporan Ruangan", page_icon="📊", layout="wide")
+
+# Cek status login
+if "user" not in st.session_state:
+    st.warning("Silakan login terlebih dahulu")
+    if st.button("HOME"):
+        st.query_params.clear()
+        st.query_params[""] = ""
+    st.stop()
+
+if st.session_state.user.get("role") not in LAPORAN_ROLES:
+    st.error("Halaman laporan hanya untuk admin dan dosen")
+    st.stop()
+
+
+def heat(table):
+    """Warna latar makin merah untuk sel yang makin sibuk"""
+    alpha = (table / max(table.to_numpy().max(), 1e-9)).round(2)
+    return "background-color: rgba(255, 75, 75, " + alpha.astype(str) + ")"
+
+
+service = get_booking_service()
+analytics = get_booking_analytics()
+
+show_flash()
+st.title("📊 Laporan Pemakaian Ruangan")
+
+try:
+    frame = analytics.frame()
+except Exception as e:
+    st.error(f"Gagal memuat riwayat booking: {e}")
+    st.stop()
+
+span = analytics.date_range()
+if span is None:
+    st.info("Belum ada booking untuk dilaporkan")
+    st.stop()
+
+today = datetime.now().date()
+first_booking = datetime.strptime(span[0], "%Y-%m-%d").date()
+last_booking = datetime.strptime(span[1], "%Y-%m-%d").date()
+# Default: 12 minggu terakhir dari riwayat yang ada; jika semua booking masih
+# di masa depan, seluruh rentang booking
+default_last = min(last_booking, today)
+if default_last < first_booking:
+    default_last = last_booking
+selected = st.date_input(
+    "Rentang Tanggal",
+    value=(max(first_booking, default_last - timedelta(weeks=12)), default_last),
+    min_value=first_booking,
+    max_value=max(last_booking, today),
+)
+if len(selected) != 2:
+    st.info("Pilih tanggal akhir rentang")
+    st.stop()
+if selected[0] > selected[1]:
+    st.warning("Tanggal awal harus sebelum tanggal akhir")
+    st.stop()
+first, last = (day.strftime("%Y-%m-%d") for day in selected)
+rooms = room_filter(service.catalog)
+
+st.divider()
+
+weekend = st.checkbox("Hitung Sabtu dan Minggu sebagai hari buka")
+weekdays = range(7) if weekend else OPERATING_WEEKDAYS
+
+group_label = st.radio("Kelompokkan per", list(GROUPS.values()), horizontal=True)
+by = next(key for key, label in GROUPS.items() if label == group_label)
+
+col1, col2 = st.columns([1, 2])
+
+with col1:
+    st.subheader(f"Ringkasan per {group_label}")
+    st.caption(
+        f"Utilisasi = jam terpakai / jam buka ({HOURS[0]:02d}:00-"
+        f"{HOURS[-1] + 1:02d}:00, {'Senin-Minggu' if weekend else 'Senin-Jumat'})"
+    )
+    st.dataframe(
+        usage_summary(frame, by, first, last, rooms, weekdays),
+        column_config={
+            "Utilisasi": st.column_config.ProgressColumn(
+                "Utilisasi", format="percent", min_value=0, max_value=1
+            ),
+        },
+    )
+
+with col2:
+    st.subheader("Jam Terpakai per Minggu")
+    st.dataframe(weekly_hours(frame, by, first, last, rooms))
+
+st.subheader("Jam Sibuk")
+st.caption("Rata-rata jumlah ruangan yang terpakai pada setiap hari dan jam")
+peak = peak_hours(frame, first, last, rooms)
+st.dataframe(peak.style.apply(heat, axis=None).format("{:.2f}"))
+st.bar_chart(peak.mean(axis=0), x_label="Jam", y_label="Ruangan terpakai")
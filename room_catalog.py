@@ -0,0 +1,299 @@
+# room_catalog.py
+"""Katalog ruangan dari data/rooms.json, dimuat sekali dan diindeks per atribut."""
+
+import json
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+)
+
+import numpy as np
+
+from storage import file_version
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ROOMS_FILE = "data/rooms.json"
+
+
+class Room:
+    __slots__ = ("id", "building", "floor", "capacity", "facilities")
+
+    def __init__(
+        self,
+        id: str,
+        building: str = "-",
+        floor: int = 0,
+        capacity: int = 0,
+        facilities: Iterable[str] = (),
+    ):
+        self.id = id
+        self.building = building
+        self.floor = floor
+        self.capacity = capacity
+        self.facilities: FrozenSet[str] = frozenset(facilities)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "building": self.building,
+            "floor": self.floor,
+            "capacity": self.capacity,
+            "facilities": sorted(self.facilities),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Room":
+        return cls(
+            data["id"],
+            data.get("building", "-"),
+            int(data.get("floor", 0)),
+            int(data.get("capacity", 0)),
+            data.get("facilities", ()),
+        )
+
+
+class RoomRequirements:
+    """Kebutuhan satu kelas: jumlah mahasiswa dan fasilitas yang wajib ada"""
+
+    __slots__ = ("students", "facilities")
+
+    def __init__(self, students: int = 0, facilities: Iterable[str] = ()):
+        self.students = students
+        self.facilities: FrozenSet[str] = frozenset(facilities)
+
+    def __bool__(self) -> bool:
+        return bool(self.students or self.facilities)
+
+    def missing(self, room: Room) -> List[str]:
+        """Kebutuhan yang tidak dipenuhi ruangan, kosong jika cocok"""
+        problems = []
+        if room.capacity < self.students:
+            problems.append(f"kapasitas {room.capacity} < {self.students} mahasiswa")
+        problems.extend(sorted(self.facilities - room.facilities))
+        return problems
+
+    def to_dict(self) -> dict:
+        return {"students": self.students, "facilities": sorted(self.facilities)}
+
+
+def _masks(
+    rooms: List[Room], keys: Callable[[Room], Iterable[Hashable]]
+) -> Dict[Hashable, np.ndarray]:
+    """Satu bitset (array boolean per posisi ruangan) untuk setiap nilai atribut"""
+    masks: Dict[Hashable, np.ndarray] = {}
+    for i, room in enumerate(rooms):
+        for key in keys(room):
+            if key not in masks:
+                masks[key] = np.zeros(len(rooms), dtype=bool)
+            masks[key][i] = True
+    return masks
+
+
+class RoomCatalog:
+    """Daftar ruangan beserta bitset per gedung, lantai, fasilitas dan kapasitas.
+
+    Bitset dan tabel metadata dibangun sekali setiap isi file berubah, jadi
+    filter hanya meng-AND-kan beberapa array boolean, tanpa memeriksa ruangan
+    satu per satu di setiap rerun.
+    """
+
+    def __init__(
+        self,
+        rooms_file: Optional[str] = ROOMS_FILE,
+        check_interval: float = 1.0,
+    ):
+        self.rooms_file = rooms_file
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._version: Hashable = None
+        self._checked_at = 0.0
+        self._build([])
+        self._loaded = False
+
+    @classmethod
+    def from_rooms(cls, rooms: Iterable[Room]) -> "RoomCatalog":
+        """Katalog di memori, tanpa file (misalnya untuk benchmark)"""
+        catalog = cls(rooms_file=None)
+        catalog._build(list(rooms))
+        catalog._loaded = True
+        return catalog
+
+    @classmethod
+    def from_ids(cls, room_ids: Iterable[str]) -> "RoomCatalog":
+        return cls.from_rooms(Room(room_id) for room_id in room_ids)
+
+    def _build(self, rooms: List[Room]):
+        self._rooms = rooms
+        self._ids = [room.id for room in rooms]
+        self._by_id = {room.id: room for room in rooms}
+        self._position = {room.id: i for i, room in enumerate(rooms)}
+        self._building_masks = _masks(rooms, lambda room: (room.building,))
+        self._floor_masks = _masks(rooms, lambda room: (room.floor,))
+        self._facility_masks = _masks(rooms, lambda room: room.facilities)
+        self._capacities = np.array([room.capacity for room in rooms], dtype=np.int64)
+        self._frame: Optional["pd.DataFrame"] = None
+
+    def _refresh(self):
+        if self.rooms_file is None:
+            return
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = file_version(self.rooms_file)
+        if self._loaded and version == self._version:
+            return
+        try:
+            with open(self.rooms_file, "r") as f:
+                rooms = [Room.from_dict(item) for item in json.load(f)]
+        except Exception as e:
+            print(f"Error reading room catalog: {e}")
+            if self._loaded:
+                return
+            rooms = []
+        self._build(rooms)
+        self._version = version
+        self._loaded = True
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            self._refresh()
+            return self._ids
+
+    def get(self, room_id: str) -> Optional[Room]:
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(room_id)
+
+    def __contains__(self, room_id: str) -> bool:
+        return self.get(room_id) is not None
+
+    def positions(self, room_ids: Iterable[str]) -> List[int]:
+        """Posisi baris ruangan di katalog (dan di frame())"""
+        with self._lock:
+            self._refresh()
+            return [self._position[room_id] for room_id in room_ids]
+
+    def buildings(self) -> List[str]:
+        with self._lock:
+            self._refresh()
+            return sorted(self._building_masks)
+
+    def floors(self) -> List[int]:
+        with self._lock:
+            self._refresh()
+            return sorted(self._floor_masks)
+
+    def facilities(self) -> List[str]:
+        with self._lock:
+            self._refresh()
+            return sorted(self._facility_masks)
+
+    def _mask(
+        self,
+        buildings: Iterable[str] = (),
+        floors: Iterable[int] = (),
+        min_capacity: int = 0,
+        facilities: Iterable[str] = (),
+        within: Optional[Iterable[str]] = None,
+    ) -> np.ndarray:
+        n = len(self._ids)
+        mask = np.ones(n, dtype=bool)
+        none = np.zeros(n, dtype=bool)
+        for selected, masks in (
+            (buildings, self._building_masks),
+            (floors, self._floor_masks),
+        ):
+            selected = list(selected)
+            if selected:
+                mask &= np.logical_or.reduce([masks.get(v, none) for v in selected])
+        for facility in facilities:
+            mask &= self._facility_masks.get(facility, none)
+        if min_capacity:
+            mask &= self._capacities >= min_capacity
+        if within is not None:
+            chosen = np.zeros(n, dtype=bool)
+            chosen[[self._position[r] for r in within if r in self._position]] = True
+            mask &= chosen
+        return mask
+
+    def filter(
+        self,
+        buildings: Iterable[str] = (),
+        floors: Iterable[int] = (),
+        min_capacity: int = 0,
+        facilities: Iterable[str] = (),
+        within: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """Id ruangan yang cocok dengan semua kriteria, urut seperti di katalog"""
+        with self._lock:
+            self._refresh()
+            if not (buildings or floors or min_capacity or facilities) and (
+                within is None
+            ):
+                return self._ids
+            mask = self._mask(buildings, floors, min_capacity, facilities, within)
+            return [self._ids[i] for i in np.flatnonzero(mask)]
+
+    def best_fit(
+        self,
+        requirements: RoomRequirements,
+        within: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """Ruangan yang memenuhi kebutuhan, kapasitas terkecil dulu.
+
+        Ruangan besar baru ditawarkan jika yang lebih kecil sudah habis, jadi
+        kelas kecil tidak menghabiskan aula.
+        """
+        with self._lock:
+            self._refresh()
+            mask = self._mask(
+                min_capacity=requirements.students,
+                facilities=requirements.facilities,
+                within=within,
+            )
+            positions = np.flatnonzero(mask)
+            order = positions[np.argsort(self._capacities[positions], kind="stable")]
+            return [self._ids[i] for i in order]
+
+    def frame(self) -> "pd.DataFrame":
+        """Tabel metadata semua ruangan (index = id), dibangun sekali per versi"""
+        with self._lock:
+            self._refresh()
+            if self._frame is None:
+                import pandas as pd
+
+                self._frame = pd.DataFrame(
+                    {
+                        "Gedung": [room.building for room in self._rooms],
+                        "Lantai": [room.floor for room in self._rooms],
+                        "Kapasitas": [room.capacity for room in self._rooms],
+                        "Fasilitas": [
+                            ", ".join(sorted(room.facilities)) for room in self._rooms
+                        ],
+                    },
+                    index=pd.Index(self._ids, name="Nama Ruangan"),
+                )
+            return self._frame
+
+
+_shared_catalog: Optional[RoomCatalog] = None
+_shared_lock = threading.Lock()
+
+
+def get_room_catalog() -> RoomCatalog:
+    global _shared_catalog
+    with _shared_lock:
+        if _shared_catalog is None:
+            _shared_catalog = RoomCatalog()
+        return _shared_catalog
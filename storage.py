@@ -0,0 +1,1109 @@
+# storage.py
+"""Backend penyimpanan data booking ruangan (journal, JSON atau SQLite)."""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+JSON_FILE = "data/ruangans.json"
+SQLITE_FILE = "data/ruangans.db"
+PARTITION_DIR = "data/bookings"
+JOURNAL_DIR = "data/journal"
+# Snapshot ditulis ulang setiap sekian event journal
+SNAPSHOT_EVERY = int(os.environ.get("JOURNAL_SNAPSHOT_EVERY", "1000"))
+JSON_FORMAT_VERSION = 2
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+BOOKING_ID_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})-(\d{2})(\d{2})-(.+)")
+
+
+def slot_key(date: str, hour: int) -> str:
+    """Key slot booking format lama, contoh: 2025-01-03_07:00"""
+    return f"{date}_{hour:02d}:00"
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_minutes(time_str: str) -> int:
+    hour, minute = time_str.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def parse_booking_id(booking_id: str) -> Tuple[str, str, int]:
+    """(room, date, start) dari ID booking, ValueError jika formatnya salah"""
+    match = BOOKING_ID_PATTERN.fullmatch(booking_id)
+    if match is None:
+        raise ValueError(f"ID booking tidak valid: {booking_id}")
+    date, hour, minute, room = match.groups()
+    return room, date, int(hour) * 60 + int(minute)
+
+
+# Objek int bersama untuk setiap menit dalam sehari, supaya ratusan ribu
+# booking tidak masing-masing menyimpan salinan int start/end sendiri
+_MINUTES = tuple(range(24 * 60 + 1))
+
+
+def _shared_minute(minute: int) -> int:
+    return _MINUTES[minute] if 0 <= minute <= 24 * 60 else minute
+
+
+class BookingRecord:
+    """Satu booking sebagai interval [start, end) dalam menit sejak 00:00.
+
+    Nilai teks di-intern: ruangan, tanggal, dosen dan matkul yang sama
+    dipakai bersama oleh semua booking, bukan disalin per record.
+    """
+
+    __slots__ = (
+        "room",
+        "date",
+        "start",
+        "end",
+        "booked_by",
+        "matkul",
+        "status",
+        "booking_type",
+    )
+
+    def __init__(
+        self,
+        room: str,
+        date: str,
+        start: int,
+        end: int,
+        booked_by: str,
+        matkul: str = "-",
+        status: str = "Booked",
+        booking_type: Optional[str] = None,
+    ):
+        self.room = sys.intern(room)
+        self.date = sys.intern(date)
+        self.start = _shared_minute(start)
+        self.end = _shared_minute(end)
+        self.booked_by = sys.intern(booked_by)
+        self.matkul = sys.intern(matkul) if matkul is not None else None
+        self.status = sys.intern(status)
+        self.booking_type = (
+            sys.intern(booking_type) if booking_type is not None else None
+        )
+
+    @property
+    def id(self) -> str:
+        """ID stabil dari tanggal, jam mulai dan ruangan: 2025-02-03-0900-A10.01.01.
+
+        Booking dalam satu ruangan tidak pernah tumpang tindih, jadi ketiganya
+        unik tanpa perlu kolom ID tersimpan di setiap backend.
+        """
+        return f"{self.date}-{self.start // 60:02d}{self.start % 60:02d}-{self.room}"
+
+    @property
+    def duration(self):
+        """Durasi dalam jam (float jika tidak bulat, misal slot 30 menit)"""
+        hours = (self.end - self.start) / 60
+        return int(hours) if hours.is_integer() else hours
+
+    def overlaps(self, start: int, end: int) -> bool:
+        return self.start < end and start < self.end
+
+    def to_dict(self) -> dict:
+        data = {
+            "room": self.room,
+            "date": self.date,
+            "start": format_minutes(self.start),
+            "end": format_minutes(self.end),
+            "status": self.status,
+            "bookedBy": self.booked_by,
+            "matkul": self.matkul,
+        }
+        if self.booking_type is not None:
+            data["type"] = self.booking_type
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BookingRecord":
+        return cls(
+            room=data["room"],
+            date=data["date"],
+            start=parse_minutes(data["start"]),
+            end=parse_minutes(data["end"]),
+            booked_by=data["bookedBy"],
+            matkul=data.get("matkul", "-"),
+            status=data.get("status", "Booked"),
+            booking_type=data.get("type"),
+        )
+
+    def to_slot_dict(self) -> dict:
+        """Data per slot jam seperti layout lama ruangans.json"""
+        data = {
+            "status": self.status,
+            "bookedBy": self.booked_by,
+            "duration": self.duration,
+            "endTime": format_minutes(self.end),
+            "matkul": self.matkul,
+        }
+        if self.booking_type is not None:
+            data["type"] = self.booking_type
+        return data
+
+
+def records_from_slots(slots: Dict[str, Dict[str, dict]]) -> List[BookingRecord]:
+    """Gabungkan layout lama {slot_key: {room: data}} menjadi interval.
+
+    Slot berurutan di ruangan yang sama dengan dosen, mata kuliah dan endTime
+    yang sama dianggap satu booking.
+    """
+    cells: Dict[tuple, Dict[int, dict]] = {}
+    for key, rooms in slots.items():
+        date, time_str = key.split("_")
+        hour = int(time_str.split(":")[0])
+        for room, data in rooms.items():
+            cells.setdefault((room, date), {})[hour] = data
+
+    records: List[BookingRecord] = []
+    for (room, date), hours in sorted(cells.items()):
+        current: Optional[BookingRecord] = None
+        current_key = None
+        for hour in sorted(hours):
+            data = hours[hour]
+            key = (data["bookedBy"], data.get("matkul"), data.get("endTime"))
+            if current is not None and current.end == hour * 60 and key == current_key:
+                current.end += 60
+                continue
+            current = BookingRecord(
+                room,
+                date,
+                hour * 60,
+                (hour + 1) * 60,
+                data["bookedBy"],
+                data.get("matkul", "-"),
+                data.get("status", "Booked"),
+                data.get("type"),
+            )
+            current_key = key
+            records.append(current)
+    return records
+
+
+def find_conflicts(
+    existing: Iterable[BookingRecord], new_records: List[BookingRecord]
+) -> List[BookingRecord]:
+    """Record baru yang bentrok dengan booking lama atau dengan sesama record baru"""
+    taken: Dict[tuple, List[BookingRecord]] = {}
+    for record in existing:
+        taken.setdefault((record.date, record.room), []).append(record)
+
+    conflicts = []
+    for record in new_records:
+        same_room = taken.setdefault((record.date, record.room), [])
+        if any(other.overlaps(record.start, record.end) for other in same_room):
+            conflicts.append(record)
+        else:
+            same_room.append(record)
+    return conflicts
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Lock antar-proses memakai file <path>.lock"""
+    with open(f"{path}.lock", "a+") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_json(path: str, data, **kwargs):
+    """Tulis ke file sementara lalu rename, pembaca tidak pernah melihat file setengah jadi"""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=".tmp-", suffix=".json"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, **kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def file_version(path: str) -> Hashable:
+    # File selalu diganti lewat rename, jadi inode ikut berubah setiap commit
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    except FileNotFoundError:
+        return None
+
+
+def read_records(path: str) -> List[BookingRecord]:
+    """Isi file booking JSON (format baru atau layout lama per slot)"""
+    with open(path, "r") as f:
+        content = f.read().strip()
+    data = json.loads(content) if content else {}
+    if "bookings" in data:
+        return [BookingRecord.from_dict(item) for item in data["bookings"]]
+    # Layout lama per slot jam, dikonversi saat commit berikutnya
+    return records_from_slots(data)
+
+
+def write_records(path: str, records: List[BookingRecord]):
+    atomic_write_json(
+        path,
+        {
+            "version": JSON_FORMAT_VERSION,
+            "bookings": [record.to_dict() for record in records],
+        },
+        separators=(",", ":"),
+    )
+
+
+# Dipanggil setelah commit berhasil: (perubahan, versi sebelum, versi sesudah)
+CommitListener = Callable[[dict, Hashable, Hashable], None]
+# Menerima booking yang akan dihapus; jika melempar error, tidak ada yang dihapus
+RemovedSink = Callable[[List[BookingRecord]], None]
+
+
+class BookingStorage(ABC):
+    """Tempat menyimpan booking, satu record per booking"""
+
+    def __init__(self):
+        self._listeners: List[CommitListener] = []
+
+    def add_listener(self, listener: CommitListener):
+        self._listeners.append(listener)
+
+    def _notify(self, change: dict, before: Hashable, after: Hashable):
+        for listener in self._listeners:
+            listener(change, before, after)
+
+    # Backend yang tidak dipartisi dianggap satu partisi (key None) berisi
+    # semua tanggal. Backend berpartisi memanggil _notify sekali per partisi,
+    # dengan versi partisi tersebut sebagai before/after.
+
+    def partitions(self) -> List[Hashable]:
+        return [None]
+
+    def partition_of(self, date: str) -> Hashable:
+        return None
+
+    def partition_version(self, key: Hashable) -> Hashable:
+        return self.version()
+
+    def load_partition(self, key: Hashable) -> List[BookingRecord]:
+        return self.load_records()
+
+    @abstractmethod
+    def version(self) -> Hashable:
+        """Token yang berubah setiap kali isi penyimpanan berubah"""
+        pass
+
+    @abstractmethod
+    def load_records(self) -> List[BookingRecord]:
+        pass
+
+    @abstractmethod
+    def add_bookings(self, records: List[BookingRecord]) -> bool:
+        """Simpan semua record secara atomik, gagal jika ada yang bentrok"""
+        pass
+
+    @abstractmethod
+    def remove_booking(
+        self,
+        room: str,
+        date: str,
+        start: int,
+        booked_by: Optional[str] = None,
+        actor: Optional[str] = None,
+    ) -> bool:
+        """Hapus booking, hanya jika masih milik booked_by (jika diisi).
+
+        actor adalah yang membatalkan (pemilik, admin atau API), dicatat di
+        jejak audit bila backend-nya punya.
+        """
+        pass
+
+    @abstractmethod
+    def remove_before(self, date: str, sink: RemovedSink) -> int:
+        """Hapus semua booking sebelum tanggal, setelah sink(records) berhasil"""
+        pass
+
+
+class JsonBookingStorage(BookingStorage):
+    def __init__(self, json_file: str = JSON_FILE):
+        super().__init__()
+        self.json_file = json_file
+        self._initialize_json()
+
+    def _initialize_json(self):
+        try:
+            if not os.path.exists(self.json_file):
+                self._write([])
+        except Exception as e:
+            print(f"Error initializing JSON: {e}")
+
+    def _write(self, records: List[BookingRecord]):
+        write_records(self.json_file, records)
+
+    def version(self) -> Hashable:
+        return file_version(self.json_file)
+
+    def load_records(self) -> List[BookingRecord]:
+        try:
+            return read_records(self.json_file)
+        except Exception as e:
+            print(f"Error reading JSON: {e}")
+            return []
+
+    def add_bookings(self, records: List[BookingRecord]) -> bool:
+        try:
+            with file_lock(self.json_file):
+                before = self.version()
+                existing = self.load_records()
+                # Compare-and-swap: semua interval harus masih kosong saat lock dipegang
+                if find_conflicts(existing, records):
+                    return False
+                self._write(existing + records)
+                self._notify({"op": "add", "records": records}, before, self.version())
+            return True
+        except Exception as e:
+            print(f"Error saving booking: {e}")
+            return False
+
+    def remove_booking(
+        self,
+        room: str,
+        date: str,
+        start: int,
+        booked_by: Optional[str] = None,
+        actor: Optional[str] = None,
+    ) -> bool:
+        try:
+            with file_lock(self.json_file):
+                before = self.version()
+                records = self.load_records()
+                for i, record in enumerate(records):
+                    if (record.room, record.date, record.start) == (room, date, start):
+                        break
+                else:
+                    return False
+                if booked_by is not None and record.booked_by != booked_by:
+                    return False
+                del records[i]
+                self._write(records)
+                self._notify({"op": "remove", "record": record}, before, self.version())
+            return True
+        except Exception as e:
+            print(f"Error deleting booking: {e}")
+            return False
+
+    def remove_before(self, date: str, sink: RemovedSink) -> int:
+        with file_lock(self.json_file):
+            before = self.version()
+            records = self.load_records()
+            old = [record for record in records if record.date < date]
+            if not old:
+                return 0
+            sink(old)
+            self._write([record for record in records if record.date >= date])
+            self._notify({"op": "purge", "records": old}, before, self.version())
+        return len(old)
+
+
+class PartitionedBookingStorage(BookingStorage):
+    """Satu file JSON per tanggal: data/bookings/YYYY-MM-DD.json.
+
+    Baca dan tulis untuk satu tanggal hanya menyentuh file tanggal itu, jadi
+    biayanya tidak ikut naik seiring bertambahnya semester yang tersimpan.
+    Commit yang mencakup beberapa tanggal mengunci semua partisinya (urut
+    tanggal, supaya tidak deadlock) sebelum mengecek bentrok.
+    """
+
+    def __init__(self, directory: str = PARTITION_DIR):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, date: str) -> str:
+        return os.path.join(self.directory, f"{date}.json")
+
+    def partitions(self) -> List[Hashable]:
+        names = (
+            name[: -len(".json")]
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        )
+        return sorted(name for name in names if DATE_PATTERN.fullmatch(name))
+
+    def partition_of(self, date: str) -> Hashable:
+        if not DATE_PATTERN.fullmatch(date):
+            raise ValueError(f"Tanggal tidak valid: {date}")
+        return date
+
+    def partition_version(self, key: Hashable) -> Hashable:
+        return file_version(self._path(key))
+
+    def load_partition(self, key: Hashable) -> List[BookingRecord]:
+        try:
+            return read_records(self._path(key))
+        except FileNotFoundError:
+            return []
+
+    def _write_partition(self, date: str, records: List[BookingRecord]):
+        if records:
+            write_records(self._path(date), records)
+        elif os.path.exists(self._path(date)):
+            os.unlink(self._path(date))
+
+    @contextmanager
+    def _lock_dates(self, dates: Iterable[str]) -> Iterator[None]:
+        with ExitStack() as stack:
+            for date in sorted(set(dates)):
+                stack.enter_context(file_lock(self._path(self.partition_of(date))))
+            yield
+
+    def version(self) -> Hashable:
+        return tuple((key, self.partition_version(key)) for key in self.partitions())
+
+    def load_records(self) -> List[BookingRecord]:
+        return [
+            record for key in self.partitions() for record in self.load_partition(key)
+        ]
+
+    def add_bookings(self, records: List[BookingRecord]) -> bool:
+        try:
+            if find_conflicts([], records):
+                return False
+            by_date: Dict[str, List[BookingRecord]] = {}
+            for record in records:
+                by_date.setdefault(record.date, []).append(record)
+            with self._lock_dates(by_date):
+                existing = {date: self.load_partition(date) for date in by_date}
+                if any(
+                    find_conflicts(existing[date], new) for date, new in by_date.items()
+                ):
+                    return False
+                changes = []
+                for date, new in by_date.items():
+                    before = self.partition_version(date)
+                    self._write_partition(date, existing[date] + new)
+                    changes.append((new, before, self.partition_version(date)))
+            for new, before, after in changes:
+                self._notify({"op": "add", "records": new}, before, after)
+            return True
+        except Exception as e:
+            print(f"Error saving booking: {e}")
+            return False
+
+    def remove_booking(
+        self,
+        room: str,
+        date: str,
+        start: int,
+        booked_by: Optional[str] = None,
+        actor: Optional[str] = None,
+    ) -> bool:
+        try:
+            with self._lock_dates([date]):
+                before = self.partition_version(date)
+                records = self.load_partition(date)
+                for i, record in enumerate(records):
+                    if (record.room, record.start) == (room, start):
+                        break
+                else:
+                    return False
+                if booked_by is not None and record.booked_by != booked_by:
+                    return False
+                del records[i]
+                self._write_partition(date, records)
+                after = self.partition_version(date)
+            self._notify({"op": "remove", "record": record}, before, after)
+            return True
+        except Exception as e:
+            print(f"Error deleting booking: {e}")
+            return False
+
+    def remove_before(self, date: str, sink: RemovedSink) -> int:
+        old_dates = [key for key in self.partitions() if key < date]
+        if not old_dates:
+            return 0
+        with self._lock_dates(old_dates):
+            old = {key: self.load_partition(key) for key in old_dates}
+            sink([record for key in old_dates for record in old[key]])
+            changes = []
+            for key in old_dates:
+                before = self.partition_version(key)
+                self._write_partition(key, [])
+                changes.append((old[key], before))
+        for records, before in changes:
+            if records:
+                self._notify({"op": "purge", "records": records}, before, None)
+        return sum(len(records) for records, _ in changes)
+
+
+class JournalBookingStorage(BookingStorage):
+    """Log event append-only: data/journal/bookings.jsonl, satu baris per event.
+
+    Setiap booking, pembatalan dan pengarsipan ditambahkan sebagai satu baris
+    JSON ringkas (seq, waktu, op, siapa, booking), jadi commit hanya satu
+    append dan journal sekaligus menjadi jejak audit. Baris terakhir yang
+    terpotong karena crash diabaikan dan dibuang oleh penulis berikutnya;
+    baris sebelumnya tidak pernah ditulis ulang.
+
+    State booking disimpan di memori dan diperbarui dengan membaca bagian
+    journal yang belum terbaca saja. snapshot.json (semua booking + offset
+    journal) ditulis setiap SNAPSHOT_EVERY event, sehingga proses baru hanya
+    me-replay ekor journal. Snapshot hanya cache: jika dihapus, state dibangun
+    ulang dari journal.
+    """
+
+    def __init__(
+        self,
+        directory: str = JOURNAL_DIR,
+        snapshot_every: int = SNAPSHOT_EVERY,
+        import_from: Optional[str] = None,
+    ):
+        super().__init__()
+        self.directory = directory
+        self.journal_file = os.path.join(directory, "bookings.jsonl")
+        self.snapshot_file = os.path.join(directory, "snapshot.json")
+        self.snapshot_every = snapshot_every
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._days: Dict[Tuple[str, str], Dict[int, BookingRecord]] = {}
+        self._offset = 0
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._synced = 0
+        self._loaded = False
+        os.makedirs(directory, exist_ok=True)
+        if import_from and not os.path.exists(self.journal_file):
+            self._import(import_from)
+
+    def _import(self, json_file: str):
+        """Jadikan isi ruangans.json event pertama journal (sekali saja)"""
+        try:
+            records = read_records(json_file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Error importing {json_file}: {e}")
+            return
+        with self._commit():
+            if self._seq == 0 and records:
+                end = self._append(
+                    {
+                        "op": "add",
+                        "by": f"import {json_file}",
+                        "bookings": [record.to_dict() for record in records],
+                    }
+                )
+                self._sync(end)
+
+    def _reset(self):
+        self._days = {}
+        self._offset = 0
+        self._seq = 0
+        self._snapshot_seq = 0
+
+    def _load_snapshot(self):
+        self._reset()
+        try:
+            with open(self.snapshot_file, "r") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Error reading journal snapshot: {e}")
+            return
+        for item in snapshot["bookings"]:
+            self._put(BookingRecord.from_dict(item))
+        self._offset = snapshot["offset"]
+        self._seq = self._snapshot_seq = snapshot["seq"]
+
+    def _put(self, record: BookingRecord):
+        self._days.setdefault((record.date, record.room), {})[record.start] = record
+
+    def _apply(self, event: dict):
+        op = event["op"]
+        if op == "add":
+            for item in event["bookings"]:
+                self._put(BookingRecord.from_dict(item))
+        elif op == "remove":
+            record = BookingRecord.from_dict(event["booking"])
+            day = self._days.get((record.date, record.room), {})
+            day.pop(record.start, None)
+            if not day:
+                self._days.pop((record.date, record.room), None)
+        elif op == "purge":
+            for key in [key for key in self._days if key[0] < event["before"]]:
+                del self._days[key]
+        self._seq = event["seq"]
+
+    def _catch_up(self, repair: bool = False):
+        """Terapkan event yang belum terbaca. repair=True (hanya saat memegang
+        file lock) juga membuang baris terakhir yang terpotong."""
+        if not self._loaded:
+            self._load_snapshot()
+            self._loaded = True
+        try:
+            f = open(self.journal_file, "rb")
+        except FileNotFoundError:
+            if self._offset:
+                self._reset()
+            return
+        with f:
+            if os.fstat(f.fileno()).st_size < self._offset:
+                # Journal diganti atau dipotong dari luar: mulai ulang dari awal
+                self._reset()
+            f.seek(self._offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line))
+            except Exception as e:
+                print(f"Error replaying journal event: {e}")
+        self._offset += complete
+        if repair and complete < len(data):
+            print("Journal: membuang event terakhir yang tidak lengkap")
+            os.truncate(self.journal_file, self._offset)
+
+    @contextmanager
+    def _commit(self) -> Iterator[None]:
+        with self._lock, file_lock(self.journal_file):
+            self._catch_up(repair=True)
+            yield
+
+    def _append(self, event: dict) -> int:
+        """Tambahkan satu event (di dalam _commit), return offset akhir journal"""
+        event = {
+            "seq": self._seq + 1,
+            "at": datetime.now().isoformat(timespec="seconds"),
+            **event,
+        }
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode()
+        with open(self.journal_file, "ab") as f:
+            f.write(line)
+        self._apply(event)
+        self._offset += len(line)
+        if self._seq - self._snapshot_seq >= self.snapshot_every:
+            self._write_snapshot()
+        return self._offset
+
+    def _sync(self, offset: int):
+        """fsync journal sampai offset. Thread yang commit bersamaan berbagi
+        satu fsync: yang datang belakangan biasanya sudah ikut tersinkron."""
+        with self._sync_lock:
+            if self._synced >= offset:
+                return
+            fd = os.open(self.journal_file, os.O_RDONLY)
+            try:
+                size = os.fstat(fd).st_size
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._synced = size
+
+    def _write_snapshot(self):
+        self._sync(self._offset)
+        atomic_write_json(
+            self.snapshot_file,
+            {
+                "seq": self._seq,
+                "offset": self._offset,
+                "bookings": [record.to_dict() for record in self._all_records()],
+            },
+            separators=(",", ":"),
+        )
+        self._snapshot_seq = self._seq
+
+    def _all_records(self) -> List[BookingRecord]:
+        return [
+            self._days[key][start]
+            for key in sorted(self._days)
+            for start in sorted(self._days[key])
+        ]
+
+    def version(self) -> Hashable:
+        return file_version(self.journal_file)
+
+    def load_records(self) -> List[BookingRecord]:
+        try:
+            with self._lock:
+                self._catch_up()
+                return self._all_records()
+        except Exception as e:
+            print(f"Error reading journal: {e}")
+            return []
+
+    def history(self) -> Iterator[dict]:
+        """Semua event journal dari awal, untuk audit: siapa booking/hapus apa"""
+        with open(self.journal_file, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n") and line.strip():
+                    yield json.loads(line)
+
+    def add_bookings(self, records: List[BookingRecord]) -> bool:
+        try:
+            with self._commit():
+                before = self.version()
+                existing = [
+                    record
+                    for key in {(r.date, r.room) for r in records}
+                    for record in self._days.get(key, {}).values()
+                ]
+                if find_conflicts(existing, records):
+                    return False
+                end = self._append(
+                    {
+                        "op": "add",
+                        "by": records[0].booked_by,
+                        "bookings": [record.to_dict() for record in records],
+                    }
+                )
+                after = self.version()
+            self._sync(end)
+            self._notify({"op": "add", "records": records}, before, after)
+            return True
+        except Exception as e:
+            print(f"Error saving booking: {e}")
+            return False
+
+    def remove_booking(
+        self,
+        room: str,
+        date: str,
+        start: int,
+        booked_by: Optional[str] = None,
+        actor: Optional[str] = None,
+    ) -> bool:
+        try:
+            with self._commit():
+                before = self.version()
+                record = self._days.get((date, room), {}).get(start)
+                if record is None:
+                    return False
+                if booked_by is not None and record.booked_by != booked_by:
+                    return False
+                end = self._append(
+                    # "by" = yang membatalkan; pemiliknya ada di booking.bookedBy
+                    {"op": "remove", "by": actor, "booking": record.to_dict()}
+                )
+                after = self.version()
+            self._sync(end)
+            self._notify({"op": "remove", "record": record}, before, after)
+            return True
+        except Exception as e:
+            print(f"Error deleting booking: {e}")
+            return False
+
+    def remove_before(self, date: str, sink: RemovedSink) -> int:
+        with self._commit():
+            before = self.version()
+            old = [record for record in self._all_records() if record.date < date]
+            if not old:
+                return 0
+            sink(old)
+            end = self._append({"op": "purge", "before": date, "count": len(old)})
+            after = self.version()
+        self._sync(end)
+        self._notify({"op": "purge", "records": old}, before, after)
+        return len(old)
+
+
+class SQLiteBookingStorage(BookingStorage):
+    """Satu baris per booking, cek bentrok memakai index (date, room, start_min)"""
+
+    def __init__(self, db_file: str = SQLITE_FILE):
+        super().__init__()
+        self.db_file = db_file
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bookings (
+                    room TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    start_min INTEGER NOT NULL,
+                    end_min INTEGER NOT NULL,
+                    booked_by TEXT NOT NULL,
+                    matkul TEXT,
+                    status TEXT NOT NULL,
+                    type TEXT,
+                    PRIMARY KEY (date, room, start_min)
+                )
+                """)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta"
+                " (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('version', 0)")
+            self._migrate_slots_table(conn)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Satu koneksi per operasi, karena tiap sesi Streamlit berjalan di thread sendiri
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE mengambil write lock di awal, jadi cek bentrok dan INSERT
+        # tidak bisa diselipi penulis lain
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _migrate_slots_table(self, conn: sqlite3.Connection):
+        """Pindahkan tabel per-slot versi lama ke tabel interval"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'slots'"
+        ).fetchone()
+        if not exists:
+            return
+        slots: Dict[str, Dict[str, dict]] = {}
+        for row in conn.execute(
+            "SELECT date, hour, room, status, booked_by, duration, end_time, matkul,"
+            " type FROM slots"
+        ):
+            date, hour, room, status, booked_by, duration, end_time, matkul, kind = row
+            data = {"status": status, "bookedBy": booked_by, "duration": duration}
+            for field, value in (
+                ("endTime", end_time),
+                ("matkul", matkul),
+                ("type", kind),
+            ):
+                if value is not None:
+                    data[field] = value
+            slots.setdefault(slot_key(date, hour), {})[room] = data
+        self._insert(conn, records_from_slots(slots))
+        conn.execute("DROP TABLE slots")
+        self._bump_version(conn)
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, records: List[BookingRecord]):
+        conn.executemany(
+            "INSERT INTO bookings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    r.room,
+                    r.date,
+                    r.start,
+                    r.end,
+                    r.booked_by,
+                    r.matkul,
+                    r.status,
+                    r.booking_type,
+                )
+                for r in records
+            ],
+        )
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection) -> int:
+        """Naikkan counter versi di dalam transaksi yang sedang berjalan"""
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[
+            0
+        ]
+
+    def version(self) -> Hashable:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()[0]
+
+    def load_records(self) -> List[BookingRecord]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT room, date, start_min, end_min, booked_by, matkul, status,"
+                    " type FROM bookings ORDER BY date, room, start_min"
+                ).fetchall()
+            return [BookingRecord(*row) for row in rows]
+        except Exception as e:
+            print(f"Error reading SQLite: {e}")
+            return []
+
+    def add_bookings(self, records: List[BookingRecord]) -> bool:
+        try:
+            if find_conflicts([], records):
+                return False
+            with self._transaction() as conn:
+                for r in records:
+                    if conn.execute(
+                        "SELECT 1 FROM bookings WHERE date = ? AND room = ?"
+                        " AND start_min < ? AND end_min > ? LIMIT 1",
+                        (r.date, r.room, r.end, r.start),
+                    ).fetchone():
+                        return False
+                self._insert(conn, records)
+                after = self._bump_version(conn)
+            self._notify({"op": "add", "records": records}, after - 1, after)
+            return True
+        except Exception as e:
+            print(f"Error saving booking: {e}")
+            return False
+
+    def remove_booking(
+        self,
+        room: str,
+        date: str,
+        start: int,
+        booked_by: Optional[str] = None,
+        actor: Optional[str] = None,
+    ) -> bool:
+        try:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT room, date, start_min, end_min, booked_by, matkul, status,"
+                    " type FROM bookings WHERE date = ? AND room = ? AND start_min = ?",
+                    (date, room, start),
+                ).fetchone()
+                if row is None:
+                    return False
+                record = BookingRecord(*row)
+                if booked_by is not None and record.booked_by != booked_by:
+                    return False
+                conn.execute(
+                    "DELETE FROM bookings WHERE date = ? AND room = ? AND start_min = ?",
+                    (date, room, start),
+                )
+                after = self._bump_version(conn)
+            self._notify({"op": "remove", "record": record}, after - 1, after)
+            return True
+        except Exception as e:
+            print(f"Error deleting booking: {e}")
+            return False
+
+    def remove_before(self, date: str, sink: RemovedSink) -> int:
+        with self._transaction() as conn:
+            old = [
+                BookingRecord(*row)
+                for row in conn.execute(
+                    "SELECT room, date, start_min, end_min, booked_by, matkul, status,"
+                    " type FROM bookings WHERE date < ? ORDER BY date, room, start_min",
+                    (date,),
+                )
+            ]
+            if not old:
+                return 0
+            sink(old)
+            conn.execute("DELETE FROM bookings WHERE date < ?", (date,))
+            after = self._bump_version(conn)
+        self._notify({"op": "purge", "records": old}, after - 1, after)
+        return len(old)
+
+
+def migrate_json_to_sqlite(
+    json_file: str = JSON_FILE, db_file: str = SQLITE_FILE
+) -> int:
+    """Impor isi ruangans.json (layout lama atau baru) ke SQLite, return jumlah booking"""
+    records = JsonBookingStorage(json_file).load_records()
+    storage = SQLiteBookingStorage(db_file)
+    with storage._transaction() as conn:
+        conn.execute("DELETE FROM bookings")
+        storage._insert(conn, records)
+        storage._bump_version(conn)
+    return len(records)
+
+
+def migrate_json_to_partitions(
+    json_file: str = JSON_FILE, directory: str = PARTITION_DIR
+) -> int:
+    """Pecah isi ruangans.json menjadi satu file per tanggal"""
+    records = JsonBookingStorage(json_file).load_records()
+    storage = PartitionedBookingStorage(directory)
+    by_date: Dict[str, List[BookingRecord]] = {}
+    for record in records:
+        by_date.setdefault(record.date, []).append(record)
+    with storage._lock_dates(by_date):
+        for date, date_records in by_date.items():
+            storage._write_partition(date, date_records)
+    return len(records)
+
+
+def migrate_json_to_journal(
+    json_file: str = JSON_FILE, directory: str = JOURNAL_DIR
+) -> int:
+    """Impor isi ruangans.json sebagai event pertama journal"""
+    storage = JournalBookingStorage(directory, import_from=json_file)
+    return len(storage.load_records())
+
+
+def get_storage(backend: Optional[str] = None) -> BookingStorage:
+    """Pilih backend dari env BOOKING_STORAGE (journal, json, sqlite atau partitioned).
+
+    Default: SQLite jika database sudah ada, lalu partisi per tanggal jika
+    foldernya sudah ada, selain itu journal. Saat journal pertama kali dibuat,
+    isi ruangans.json lama diimpor sekali. Nama backend lain ditolak dengan
+    ValueError, supaya salah ketik tidak diam-diam menulis ke storage lain.
+    """
+    backend = backend or os.environ.get("BOOKING_STORAGE")
+    if not backend:
+        if os.path.exists(SQLITE_FILE):
+            backend = "sqlite"
+        elif os.path.isdir(PARTITION_DIR):
+            backend = "partitioned"
+        else:
+            backend = "journal"
+    if backend == "sqlite":
+        return SQLiteBookingStorage()
+    if backend == "partitioned":
+        return PartitionedBookingStorage()
+    if backend == "json":
+        return JsonBookingStorage()
+    if backend == "journal":
+        return JournalBookingStorage(import_from=JSON_FILE)
+    raise ValueError(
+        f"Backend storage tidak dikenal: {backend!r} "
+        "(pilih journal, json, sqlite atau partitioned)"
+    )
+
+
+if __name__ == "__main__":
+    # python storage.py [sqlite|partitioned|journal] -> pindahkan data/ruangans.json
+    if sys.argv[1:] == ["partitioned"]:
+        total = migrate_json_to_partitions()
+        print(f"{total} booking berhasil dimigrasi ke {PARTITION_DIR}/")
+    elif sys.argv[1:] == ["journal"]:
+        total = migrate_json_to_journal()
+        print(f"{total} booking ada di {JOURNAL_DIR}/")
+    else:
+        total = migrate_json_to_sqlite()
+        print(f"{total} booking berhasil dimigrasi ke {SQLITE_FILE}")
@@ -1,13 +1,20 @@
 import streamlit as st
 from verifikasi import signIn
-import time
+from notifikasi import flash
+
+
+@st.cache_resource
+def load_css(path: str = "styles.css") -> str:
+    """Dibaca sekali per proses, bukan di setiap rerun"""
+    with open(path) as f:
+        return f"<style>{f.read()}</style>"
+
 
 st.set_page_config(page_title="Booking Ruangan", page_icon="🎓")
 st.title("🎓Sistem Booking Ruangan")
 
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
 
 st.markdown(
     '<link rel="stylesheet" type="text/css" href="https://github.com/ZulhanF/booking-ruang/blob/main/styles.css">',
@@ -32,11 +39,12 @@ with st.form("login_form"):
 if submitted:
     role = signIn(username, password)
     if role:
-        st.success(f"Anda berhasil login sebagai {role}")
-        time.sleep(2)
+        flash(f"Anda berhasil login sebagai {role}")
         if role == "Mahasiswa":
             st.switch_page("pages/halaman_siswa.py")
         elif role == "Dosen":
             st.switch_page("pages/halaman_dosen.py")
+        elif role == "Admin":
+            st.switch_page("pages/halaman_laporan.py")
     else:
         st.error("Username atau password salah!")
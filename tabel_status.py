@@ -0,0 +1,96 @@
+# tabel_status.py
+"""Tabel status ruangan yang memperbarui dirinya sendiri lewat st.fragment.
+
+Setiap sesi menyimpan tabel terakhir beserta nomor perubahan (seq) index.
+Fragment berjalan ulang setiap beberapa detik, menanyakan ruangan mana yang
+berubah sejak seq itu, dan hanya mengisi ulang baris ruangan tersebut. Jika
+tidak ada yang berubah, tabel lama langsung ditampilkan lagi.
+"""
+
+import os
+from typing import List
+
+import numpy as np
+import streamlit as st
+
+from booking_service import BookingService
+
+LIVE_REFRESH = float(os.environ.get("STATUS_REFRESH_SECONDS", "5"))
+
+COLUMN_CONFIG = {
+    "Nama Ruangan": st.column_config.TextColumn("Nama Ruangan", width=200),
+    "Status": st.column_config.TextColumn("Status", width=150),
+    "Dosen": st.column_config.TextColumn("Dosen", width=200),
+    "Mata Kuliah": st.column_config.TextColumn("Mata Kuliah", width=250),
+}
+
+
+def _styled(frame):
+    return frame.style.apply(
+        lambda col: np.where(col == "Free", "color: green", "color: red"),
+        subset=["Status"],
+    )
+
+
+def _load(service: BookingService, date: str, hour: int, rooms: List[str]) -> dict:
+    # seq dibaca sebelum tabel dibuat: perubahan di antaranya diterapkan lagi
+    # pada refresh berikutnya, tidak pernah terlewat
+    seq = service.index.sequence
+    frame = service.status_frame(date, hour, rooms)
+    return {
+        "view": (date, hour, tuple(rooms)),
+        "seq": seq,
+        "frame": frame,
+        "rows": {room: i for i, room in enumerate(frame["Nama Ruangan"])},
+        "styled": None,
+    }
+
+
+def _apply_changes(service: BookingService, state: dict) -> dict:
+    date, hour, rooms = state["view"]
+    seq, changed = service.index.changes_since(state["seq"], date)
+    if changed is None:
+        return _load(service, date, hour, list(rooms))
+    changed = [room for room in changed if room in state["rows"]]
+    if changed:
+        frame = state["frame"]
+        columns = [frame.columns.get_loc(c) for c in ("Status", "Dosen", "Mata Kuliah")]
+        for room, status in service.get_room_status(date, hour, changed).items():
+            frame.iloc[state["rows"][room], columns] = [
+                status.status,
+                status.booked_by,
+                status.matkul,
+            ]
+        state["styled"] = None
+    state["seq"] = seq
+    return state
+
+
+@st.fragment(run_every=LIVE_REFRESH)
+def status_table(service: BookingService, date: str, hour: int, rooms: List[str]):
+    """Tampilkan status ruangan pada date/hour, diperbarui otomatis"""
+    view = (date, hour, tuple(rooms))
+    state = st.session_state.get("_status_table")
+    try:
+        if state is None or state["view"] != view:
+            state = _load(service, date, hour, rooms)
+        else:
+            state = _apply_changes(service, state)
+        st.session_state["_status_table"] = state
+    except Exception as e:
+        print(f"Error reading bookings: {e}")
+        if state is None or state["view"] != view:
+            import pandas as pd
+
+            frame = pd.DataFrame(
+                {
+                    "Nama Ruangan": rooms,
+                    "Status": "Free",
+                    "Dosen": "-",
+                    "Mata Kuliah": "-",
+                }
+            )
+            state = {"view": view, "frame": frame, "styled": None}
+    if state["styled"] is None:
+        state["styled"] = _styled(state["frame"])
+    st.dataframe(state["styled"], column_config=COLUMN_CONFIG, hide_index=True)
@@ -0,0 +1,541 @@
+# timetable.py
+"""Impor jadwal kuliah satu semester dari CSV, ruangan dipilihkan solver.
+
+Setiap baris CSV adalah satu mata kuliah: dosen, matkul, hari (satu atau
+beberapa, dipisah ";", kosong = Senin-Jumat bebas), durasi dalam jam,
+jumlah mahasiswa, dan opsional fasilitas, jam mulai dan ruangan yang
+ditetapkan. Satu pertemuan mingguan = satu hari dari kolom hari.
+
+Solver bekerja pada pola satu minggu: hunian setiap (hari, ruangan) dan
+jadwal setiap dosen disimpan sebagai bitmask jam. Slot yang sudah terisi
+booking lain pada tanggal mana pun di semester itu dianggap penuh.
+Pertemuan dengan pilihan paling sedikit ditempatkan dulu di ruangan
+terkecil yang muat (seperti pewarnaan graf interval). Pertemuan yang tidak
+kebagian tempat dicoba lewat jalur augmentasi: pertemuan yang
+menghalanginya dipindah ke pilihan lain, sampai kedalaman tertentu.
+Hasilnya di-commit sebagai satu booking massal.
+
+    python timetable.py jadwal.csv --first 2025-02-03 --last 2025-05-30
+    python timetable.py jadwal.csv --first 2025-02-03 --last 2025-05-30 --commit
+"""
+
+import argparse
+import csv
+import time
+from datetime import date as Date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from booking_service import (
+    CLOSING_HOUR,
+    OPENING_HOUR,
+    Booking,
+    BookingService,
+    BulkBookingResult,
+    get_booking_service,
+    make_booking,
+)
+from room_catalog import RoomRequirements
+
+WEEKDAYS = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+# Hari yang boleh dipilih solver jika kolom hari kosong
+DEFAULT_WEEKDAYS = (0, 1, 2, 3, 4)
+CSV_COLUMNS = [
+    "dosen",
+    "matkul",
+    "hari",
+    "durasi",
+    "mahasiswa",
+    "fasilitas",
+    "jam",
+    "ruangan",
+]
+# Berapa lapis pertemuan yang boleh digeser untuk memberi tempat
+REPAIR_DEPTH = 2
+
+
+class CourseRequest:
+    """Satu baris CSV: mata kuliah dengan pola mingguannya"""
+
+    __slots__ = (
+        "line",
+        "user",
+        "matkul",
+        "weekdays",
+        "duration",
+        "requirements",
+        "start_hour",
+        "room",
+    )
+
+    def __init__(
+        self,
+        line: int,
+        user: str,
+        matkul: str,
+        weekdays: List[int],
+        duration: int,
+        requirements: Optional[RoomRequirements] = None,
+        start_hour: Optional[int] = None,
+        room: Optional[str] = None,
+    ):
+        self.line = line
+        self.user = user
+        self.matkul = matkul
+        # Kosong: satu pertemuan pada salah satu DEFAULT_WEEKDAYS
+        self.weekdays = weekdays
+        self.duration = duration
+        self.requirements = requirements or RoomRequirements()
+        self.start_hour = start_hour
+        self.room = room
+
+    def label(self) -> str:
+        return f"baris {self.line}: {self.matkul} ({self.user})"
+
+
+class Placement:
+    __slots__ = ("course", "weekday", "start_hour", "room")
+
+    def __init__(self, course: CourseRequest, weekday: int, start_hour: int, room: str):
+        self.course = course
+        self.weekday = weekday
+        self.start_hour = start_hour
+        self.room = room
+
+    def booking(self) -> Booking:
+        course = self.course
+        return make_booking(
+            self.room,
+            self.start_hour,
+            course.duration,
+            course.user,
+            course.matkul,
+            course.requirements,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "dosen": self.course.user,
+            "matkul": self.course.matkul,
+            "hari": WEEKDAYS[self.weekday],
+            "jam": f"{self.start_hour:02d}:00 - "
+            f"{self.start_hour + self.course.duration:02d}:00",
+            "ruangan": self.room,
+        }
+
+
+class TimetablePlan:
+    """Hasil solver: pertemuan yang ditempatkan dan yang tidak, beserta alasannya"""
+
+    def __init__(self, first_date: Date, last_date: Date):
+        self.first_date = first_date
+        self.last_date = last_date
+        self.placed: List[Placement] = []
+        self.unplaced: List[Tuple[CourseRequest, str]] = []
+        self.solve_seconds = 0.0
+
+    def entries(self) -> List[Tuple[str, Booking]]:
+        """(tanggal, booking) untuk setiap minggu semester, siap di-commit massal"""
+        entries = []
+        for placement in self.placed:
+            current = self.first_date + timedelta(
+                days=(placement.weekday - self.first_date.weekday()) % 7
+            )
+            while current <= self.last_date:
+                entries.append((current.strftime("%Y-%m-%d"), placement.booking()))
+                current += timedelta(days=7)
+        return entries
+
+
+def parse_weekdays(value: str) -> List[int]:
+    names = {name.lower(): i for i, name in enumerate(WEEKDAYS)}
+    weekdays = []
+    for part in value.replace(",", ";").split(";"):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if part not in names:
+            raise ValueError(f"hari tidak dikenal: {part}")
+        weekdays.append(names[part])
+    return weekdays
+
+
+def _hour(value: str) -> int:
+    """Jam "9", "09" atau "09:00" menjadi 9"""
+    hour, _, minute = value.strip().partition(":")
+    if minute.strip("0"):
+        raise ValueError(f"jam harus tepat (menit 00): {value}")
+    return int(hour)
+
+
+def read_courses(
+    lines: Iterable[str],
+) -> Tuple[List[CourseRequest], List[Tuple[str, str]]]:
+    """Baca CSV mata kuliah; baris yang tidak bisa dibaca dikembalikan terpisah"""
+    reader = csv.DictReader(lines)
+    courses: List[CourseRequest] = []
+    errors: List[Tuple[str, str]] = []
+    for line, row in enumerate(reader, start=2):
+        row = {
+            (key or "").strip().lower(): (value or "").strip()
+            for key, value in row.items()
+        }
+        try:
+            if not row.get("dosen") or not row.get("matkul"):
+                raise ValueError("kolom dosen dan matkul wajib diisi")
+            facilities = [
+                f.strip() for f in row.get("fasilitas", "").split(";") if f.strip()
+            ]
+            courses.append(
+                CourseRequest(
+                    line,
+                    row["dosen"],
+                    row["matkul"],
+                    parse_weekdays(row.get("hari", "")),
+                    int(row.get("durasi") or 0),
+                    RoomRequirements(int(row.get("mahasiswa") or 0), facilities),
+                    _hour(row["jam"]) if row.get("jam") else None,
+                    row.get("ruangan") or None,
+                )
+            )
+        except (TypeError, ValueError) as e:
+            errors.append((f"baris {line}", str(e)))
+    return courses, errors
+
+
+def _bits(start: int, duration: int) -> int:
+    """Bitmask jam [start, start + duration), bit 0 = OPENING_HOUR"""
+    return ((1 << duration) - 1) << (start - OPENING_HOUR)
+
+
+# Satu pilihan pertemuan: (hari, jam mulai, ruangan, bitmask jam)
+Option = Tuple[int, int, str, int]
+
+
+class TimetableSolver:
+    """Penempatan pertemuan mingguan ke (hari, jam mulai, ruangan).
+
+    `room_busy[(hari, ruangan)]` dan `user_busy[(dosen, hari)]` adalah
+    bitmask jam yang sudah terisi booking lain dan tidak bisa digeser.
+    """
+
+    def __init__(
+        self,
+        room_busy: Dict[Tuple[int, str], int],
+        user_busy: Dict[Tuple[str, int], int],
+        repair_depth: int = REPAIR_DEPTH,
+    ):
+        self.room_busy = room_busy
+        self.user_busy = user_busy
+        self.repair_depth = repair_depth
+        # Hunian oleh pertemuan yang sudah ditempatkan solver
+        self._room_used: Dict[Tuple[int, str], int] = {}
+        self._user_used: Dict[Tuple[str, int], int] = {}
+        # Pemilik setiap jam yang terisi, untuk mencari penghalang
+        self._room_owner: Dict[Tuple[int, str, int], int] = {}
+        self._user_owner: Dict[Tuple[str, int, int], int] = {}
+        self._chosen: Dict[int, Option] = {}
+        self._meetings: List[CourseRequest] = []
+        self._options: List[List[Option]] = []
+
+    def add(self, course: CourseRequest, weekdays: List[int], rooms: List[str]) -> bool:
+        """Satu pertemuan: pilihan (hari, jam, ruangan) yang lolos booking lain.
+
+        Urutan pilihan = urutan preferensi: ruangan paling pas dulu, lalu
+        hari, lalu jam paling awal. False jika tidak ada pilihan sama sekali.
+        """
+        starts = (
+            [course.start_hour]
+            if course.start_hour is not None
+            else range(OPENING_HOUR, CLOSING_HOUR - course.duration + 1)
+        )
+        options = []
+        for room in rooms:
+            for weekday in weekdays:
+                busy = self.room_busy.get((weekday, room), 0) | self.user_busy.get(
+                    (course.user, weekday), 0
+                )
+                for start in starts:
+                    bits = _bits(start, course.duration)
+                    if not busy & bits:
+                        options.append((weekday, start, room, bits))
+        if not options:
+            return False
+        self._meetings.append(course)
+        self._options.append(options)
+        return True
+
+    def _first_free(self, meeting: int) -> Optional[Option]:
+        room_used, user_used = self._room_used, self._user_used
+        user = self._meetings[meeting].user
+        for option in self._options[meeting]:
+            weekday, _, room, bits = option
+            if not (
+                room_used.get((weekday, room), 0) & bits
+                or user_used.get((user, weekday), 0) & bits
+            ):
+                return option
+        return None
+
+    def _single_blocker(self, meeting: int, option: Option) -> Optional[int]:
+        """Pertemuan yang menghalangi pilihan ini, None jika lebih dari satu"""
+        weekday, start, room, _ = option
+        course = self._meetings[meeting]
+        blocker = None
+        for hour in range(start, start + course.duration):
+            for owner in (
+                self._room_owner.get((weekday, room, hour)),
+                self._user_owner.get((course.user, weekday, hour)),
+            ):
+                if owner is not None and owner != blocker:
+                    if blocker is not None:
+                        return None
+                    blocker = owner
+        return blocker
+
+    def _place(self, meeting: int, option: Option):
+        weekday, start, room, bits = option
+        course = self._meetings[meeting]
+        user_key = (course.user, weekday)
+        self._room_used[(weekday, room)] = (
+            self._room_used.get((weekday, room), 0) | bits
+        )
+        self._user_used[user_key] = self._user_used.get(user_key, 0) | bits
+        for hour in range(start, start + course.duration):
+            self._room_owner[(weekday, room, hour)] = meeting
+            self._user_owner[(course.user, weekday, hour)] = meeting
+        self._chosen[meeting] = option
+
+    def _unplace(self, meeting: int):
+        weekday, start, room, bits = self._chosen.pop(meeting)
+        course = self._meetings[meeting]
+        self._room_used[(weekday, room)] &= ~bits
+        self._user_used[(course.user, weekday)] &= ~bits
+        for hour in range(start, start + course.duration):
+            del self._room_owner[(weekday, room, hour)]
+            del self._user_owner[(course.user, weekday, hour)]
+
+    def _augment(self, meeting: int, depth: int, visited: Set[int]) -> bool:
+        """Tempatkan `meeting`, bila perlu dengan menggeser satu penghalang.
+
+        Seperti pencarian jalur augmentasi pada matching: `visited` dipakai
+        bersama selama satu pencarian, jadi setiap pertemuan paling banyak
+        sekali dicoba dipindah.
+        """
+        option = self._first_free(meeting)
+        if option is not None:
+            self._place(meeting, option)
+            return True
+        if depth == 0:
+            return False
+        for option in self._options[meeting]:
+            other = self._single_blocker(meeting, option)
+            if other is None or other in visited:
+                continue
+            visited.add(other)
+            previous = self._chosen[other]
+            self._unplace(other)
+            self._place(meeting, option)
+            if self._augment(other, depth - 1, visited):
+                return True
+            self._unplace(meeting)
+            self._place(other, previous)
+        return False
+
+    def solve(
+        self,
+    ) -> Tuple[List[Tuple[CourseRequest, int, int, str]], List[CourseRequest]]:
+        """(course, hari, jam, ruangan) yang ditempatkan dan pertemuan yang gagal"""
+        order = sorted(
+            range(len(self._meetings)),
+            key=lambda i: (len(self._options[i]), -self._meetings[i].duration),
+        )
+        failed = []
+        for meeting in order:
+            option = self._first_free(meeting)
+            if option is None:
+                failed.append(meeting)
+            else:
+                self._place(meeting, option)
+        # Perbaikan setelah semua pertemuan mendapat giliran pertama, supaya
+        # penghalang bisa digeser ke slot yang memang masih kosong
+        unplaced = [
+            self._meetings[meeting]
+            for meeting in failed
+            if not self._augment(meeting, self.repair_depth, {meeting})
+        ]
+        placed = [
+            (self._meetings[meeting], weekday, start, room)
+            for meeting, (weekday, start, room, _) in sorted(self._chosen.items())
+        ]
+        return placed, unplaced
+
+
+def _weekdays_between(first: Date, last: Date) -> Dict[int, List[str]]:
+    dates: Dict[int, List[str]] = {}
+    current = first
+    while current <= last:
+        dates.setdefault(current.weekday(), []).append(current.strftime("%Y-%m-%d"))
+        current += timedelta(days=1)
+    return dates
+
+
+def plan_timetable(
+    service: BookingService,
+    courses: List[CourseRequest],
+    first_date: Date,
+    last_date: Date,
+    repair_depth: int = REPAIR_DEPTH,
+) -> TimetablePlan:
+    """Cari penempatan semua mata kuliah untuk semester first_date..last_date"""
+    plan = TimetablePlan(first_date, last_date)
+    started = time.perf_counter()
+    rooms = service.rooms
+    dates = _weekdays_between(first_date, last_date)
+
+    # Booking lain pada salah satu tanggal dengan hari yang sama memenuhi
+    # slot itu untuk seluruh semester
+    room_busy: Dict[Tuple[int, str], int] = {}
+    for weekday, weekday_dates in dates.items():
+        occupied = service.index.occupancy(
+            weekday_dates, rooms, OPENING_HOUR, CLOSING_HOUR
+        ).any(axis=0)
+        for position, room in enumerate(rooms):
+            bits = 0
+            for slot in occupied[:, position].nonzero()[0]:
+                bits |= 1 << int(slot)
+            if bits:
+                room_busy[(weekday, room)] = bits
+    user_busy: Dict[Tuple[str, int], int] = {}
+    last = last_date.strftime("%Y-%m-%d")
+    for user in {course.user for course in courses}:
+        for record in service.index.bookings_of(user, first_date.strftime("%Y-%m-%d")):
+            if record.date > last:
+                break
+            weekday = datetime.strptime(record.date, "%Y-%m-%d").weekday()
+            start = record.start // 60
+            bits = _bits(start, -(-record.end // 60) - start)
+            user_busy[(user, weekday)] = user_busy.get((user, weekday), 0) | bits
+
+    solver = TimetableSolver(room_busy, user_busy, repair_depth)
+    for course in courses:
+        # Validasi yang sama dengan booking biasa (Regular/Extended)
+        start = OPENING_HOUR if course.start_hour is None else course.start_hour
+        probe = make_booking("-", start, course.duration, course.user, course.matkul)
+        if course.duration < 1 or not probe.validate():
+            plan.unplaced.append((course, "durasi atau jam mulai tidak valid"))
+            continue
+        if (
+            course.start_hour is not None
+            and course.start_hour + course.duration > CLOSING_HOUR
+        ):
+            plan.unplaced.append(
+                (course, f"melebihi jam operasional ({CLOSING_HOUR}:00)")
+            )
+            continue
+        # Ruangan tanpa fasilitas yang tidak dibutuhkan didahulukan, supaya
+        # lab tetap tersedia untuk kelas yang memang memerlukannya
+        candidates = sorted(
+            service.matching_rooms(course.requirements),
+            key=lambda room: len(
+                service.catalog.get(room).facilities - course.requirements.facilities
+            ),
+        )
+        if course.room is not None:
+            if course.room not in service.catalog:
+                plan.unplaced.append((course, f"ruangan {course.room} tidak dikenal"))
+                continue
+            candidates = [room for room in candidates if room == course.room]
+        if not candidates:
+            plan.unplaced.append((course, "tidak ada ruangan yang memenuhi kebutuhan"))
+            continue
+        weekday_sets = (
+            [[weekday] for weekday in course.weekdays]
+            if course.weekdays
+            else [list(DEFAULT_WEEKDAYS)]
+        )
+        for weekdays in weekday_sets:
+            weekdays = [weekday for weekday in weekdays if weekday in dates]
+            if not weekdays:
+                plan.unplaced.append((course, "hari tidak ada dalam rentang tanggal"))
+            elif not solver.add(course, weekdays, candidates):
+                plan.unplaced.append(
+                    (course, "semua slot yang cocok sudah terisi booking lain")
+                )
+
+    placed, unplaced = solver.solve()
+    plan.placed = [
+        Placement(course, weekday, start, room)
+        for course, weekday, start, room in placed
+    ]
+    plan.unplaced.extend(
+        (course, "tidak kebagian slot (ruangan atau dosen bentrok)")
+        for course in unplaced
+    )
+    plan.solve_seconds = time.perf_counter() - started
+    return plan
+
+
+def commit_plan(service: BookingService, plan: TimetablePlan) -> BulkBookingResult:
+    """Commit seluruh rencana dalam satu tulis; tidak ada yang tersimpan jika bentrok"""
+    return service.create_bookings_bulk(plan.entries())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", help=f"kolom: {', '.join(CSV_COLUMNS)}")
+    parser.add_argument("--first", required=True, help="awal semester, YYYY-MM-DD")
+    parser.add_argument("--last", required=True, help="akhir semester, YYYY-MM-DD")
+    parser.add_argument(
+        "--commit", action="store_true", help="simpan booking (default: hanya rencana)"
+    )
+    parser.add_argument("--output", help="tulis rencana penempatan ke CSV ini")
+    args = parser.parse_args()
+    first = datetime.strptime(args.first, "%Y-%m-%d").date()
+    last = datetime.strptime(args.last, "%Y-%m-%d").date()
+
+    with open(args.csv, newline="", encoding="utf-8-sig") as f:
+        courses, errors = read_courses(f)
+    service = get_booking_service()
+    plan = plan_timetable(service, courses, first, last)
+
+    rows = [placement.to_dict() for placement in plan.placed]
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, ["dosen", "matkul", "hari", "jam", "ruangan"])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        for row in rows:
+            print(
+                f"{row['hari']:<7} {row['jam']}  {row['ruangan']:<10} "
+                f"{row['matkul']} ({row['dosen']})"
+            )
+    print()
+    for where, reason in errors:
+        print(f"Tidak terbaca, {where}: {reason}")
+    for course, reason in plan.unplaced:
+        print(f"Tidak tertempatkan, {course.label()}: {reason}")
+    print(
+        f"{len(plan.placed)} pertemuan mingguan ditempatkan, "
+        f"{len(plan.unplaced) + len(errors)} gagal, "
+        f"solver {plan.solve_seconds * 1000:.0f} ms"
+    )
+    if not args.commit:
+        return
+    started = time.perf_counter()
+    result = commit_plan(service, plan)
+    if result.booked:
+        print(
+            f"{len(result.booked)} booking disimpan dalam "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+    else:
+        print(
+            f"Tidak ada yang disimpan: {len(result.conflicts)} bentrok, "
+            f"{len(result.invalid)} tidak valid. Jalankan ulang untuk "
+            "menyusun rencana dari booking terbaru."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# unduh_jadwal.py
+"""Tombol unduh jadwal booking dosen (.ics / CSV), dipakai halaman dosen."""
+
+import streamlit as st
+
+from booking_export import CONTENT_TYPES, export_filename, get_booking_exporter
+
+FORMAT_LABELS = {"ics": "📅 Kalender (.ics)", "csv": "📄 CSV"}
+
+
+def schedule_downloads(name: str):
+    """Unduh semua booking atas nama `name`; file baru dibuat saat tombol diklik"""
+    exporter = get_booking_exporter()
+    for column, fmt in zip(st.columns(len(FORMAT_LABELS)), FORMAT_LABELS):
+        with column:
+            st.download_button(
+                FORMAT_LABELS[fmt],
+                # Feed di-cache per versi booking, jadi klik berulang tidak
+                # membangun ulang file
+                data=lambda fmt=fmt: exporter.feed("booked_by", name, fmt).body,
+                file_name=export_filename("booked_by", name, fmt),
+                mime=CONTENT_TYPES[fmt].split(";")[0],
+                on_click="ignore",
+                key=f"unduh_jadwal_{fmt}",
+            )
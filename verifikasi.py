@@ -1,37 +1,174 @@
-# login.py
+# verifikasi.py
+import hashlib
+import hmac
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, Optional
+
 import streamlit as st
 
+from storage import atomic_write_json, file_lock, file_version
+
+USERS_FILE = "data/mahasiswa.json"
+HASH_ALGORITHM = "pbkdf2_sha256"
+# Biaya hash bisa dinaikkan lewat env; hash lama otomatis diperbarui saat login
+HASH_ITERATIONS = int(os.environ.get("PASSWORD_HASH_ITERATIONS", "200000"))
+LOGIN_WORKERS = int(os.environ.get("LOGIN_WORKERS", "4"))
+
+# Pool membatasi berapa hash yang dihitung bersamaan saat login ramai. signIn
+# tetap menunggu hasilnya; karena pbkdf2_hmac melepas GIL, sesi lain yang
+# tidak sedang login tetap jalan selama hash dihitung.
+_login_pool = ThreadPoolExecutor(max_workers=LOGIN_WORKERS, thread_name_prefix="login")
+_dummy_hash: Optional[str] = None
+
+
+def hash_password(password: str, iterations: int = HASH_ITERATIONS) -> str:
+    """Hash password dengan salt acak, format: pbkdf2_sha256$iterasi$salt$hash"""
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"{HASH_ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    if not stored.startswith(f"{HASH_ALGORITHM}$"):
+        # Password lama masih plaintext
+        return hmac.compare_digest(stored.encode(), password.encode())
+    _, iterations, salt, digest = stored.split("$")
+    candidate = hashlib.pbkdf2_hmac(
+        "sha256", password.encode(), bytes.fromhex(salt), int(iterations)
+    )
+    return hmac.compare_digest(candidate.hex(), digest)
+
+
+def needs_rehash(stored: str) -> bool:
+    return not stored.startswith(f"{HASH_ALGORITHM}${HASH_ITERATIONS}$")
+
+
+class UserStore:
+    """Data user dari mahasiswa.json, dimuat sekali dan dibaca ulang jika file berubah"""
+
+    def __init__(self, users_file: str = USERS_FILE):
+        self.users_file = users_file
+        self._lock = threading.Lock()
+        self._users: Dict[str, dict] = {}
+        self._version: Hashable = None
+
+    def _load(self) -> Dict[str, dict]:
+        with open(self.users_file, "r") as f:
+            return json.load(f)
+
+    def get(self, username: str) -> Optional[dict]:
+        with self._lock:
+            version = file_version(self.users_file)
+            if version != self._version:
+                self._users = self._load()
+                self._version = version
+            return self._users.get(username)
+
+    def _update(
+        self, username: str, fields: dict, expected_password=None, overwrite=True
+    ) -> bool:
+        """Ubah satu user di file secara atomik.
+
+        Jika expected_password diisi, perubahan hanya disimpan kalau password
+        user belum diganti oleh proses lain. Dengan overwrite=False user yang
+        sudah ada tidak diubah.
+        """
+        with file_lock(self.users_file):
+            users = self._load()
+            current = users.get(username)
+            if current is not None and not overwrite:
+                return False
+            if expected_password is not None and (
+                current is None or current["password"] != expected_password
+            ):
+                return False
+            users[username] = {**(current or {}), **fields}
+            atomic_write_json(self.users_file, users, indent=4)
+        with self._lock:
+            self._users = users
+            self._version = file_version(self.users_file)
+        return True
+
+    def add_user(
+        self, username: str, password: str, role: str, name: str, overwrite=False
+    ) -> bool:
+        """False jika username sudah dipakai, kecuali overwrite=True"""
+        return self._update(
+            username,
+            {"password": hash_password(password), "role": role, "name": name},
+            overwrite=overwrite,
+        )
+
+    def rehash_password(self, username: str, password: str, old_hash: str) -> bool:
+        return self._update(
+            username, {"password": hash_password(password)}, expected_password=old_hash
+        )
+
+
+_user_store: Optional[UserStore] = None
+_user_store_lock = threading.Lock()
+
+
+def get_user_store() -> UserStore:
+    global _user_store
+    with _user_store_lock:
+        if _user_store is None:
+            _user_store = UserStore()
+        return _user_store
+
+
+def _check_login(username: str, password: str) -> Optional[dict]:
+    global _dummy_hash
+    store = get_user_store()
+    user = store.get(username)
+    if user is None:
+        # Tetap hitung hash agar username yang tidak ada tidak lebih cepat ditolak
+        if _dummy_hash is None:
+            _dummy_hash = hash_password("dummy")
+        verify_password(password, _dummy_hash)
+        return None
+    if not verify_password(password, user["password"]):
+        return None
+    if needs_rehash(user["password"]):
+        store.rehash_password(username, password, user["password"])
+    return user
+
 
 def signIn(username, password):
     """Verifikasi login user"""
     try:
-        with open("data/mahasiswa.json", "r") as f:
-            users = json.load(f)
-
-        if username in users:
-            if users[username]["password"] == password:
-                st.session_state["user"] = users[
-                    username
-                ]  # Simpan seluruh informasi pengguna
-                return users[username]["role"]
+        user = _login_pool.submit(_check_login, username, password).result()
+        if user:
+            # Simpan informasi pengguna tanpa hash password
+            st.session_state["user"] = {
+                key: value for key, value in user.items() if key != "password"
+            }
+            return user["role"]
         return None
     except Exception as e:
         print(f"Error: {e}")
         return None
 
 
-def tambah_akun(username, password, role="user", name=""):
-    """Menambah user baru"""
+def tambah_akun(username, password, role="user", name="", overwrite=False):
+    """Menambah user baru; akun yang sudah ada hanya diganti jika overwrite=True"""
     try:
-        with open("data/mahasiswa.json", "r") as f:
-            users = json.load(f)
-
-        users[username] = {"password": password, "role": role, "name": name}
-
-        with open("users.json", "w") as f:
-            json.dump(users, f, indent=4)
-        return True
+        return get_user_store().add_user(username, password, role, name, overwrite)
     except Exception as e:
         print(f"Error: {e}")
         return False
+
+
+if __name__ == "__main__":
+    # python verifikasi.py -> hash semua password yang masih plaintext
+    store = get_user_store()
+    with file_lock(store.users_file):
+        users = store._load()
+        for user in users.values():
+            if not user["password"].startswith(f"{HASH_ALGORITHM}$"):
+                user["password"] = hash_password(user["password"])
+        atomic_write_json(store.users_file, users, indent=4)
+    print(f"Password {len(users)} user sudah di-hash")
@@ -0,0 +1,292 @@
+# waitlist.py
+"""Daftar tunggu booking per ruangan dan tanggal.
+
+Permintaan yang bentrok bisa diantrekan dengan prioritas (kuliah reguler
+didahulukan dari ad-hoc). Setiap (ruangan, tanggal) punya heap berurutan
+(prioritas, nomor daftar). Saat sebuah booking dibatalkan, heap slot itu
+dicoba dari depan dan setiap permintaan yang kini muat langsung di-commit,
+jadi dosen tidak perlu terus me-refresh halaman menunggu ruangan kosong.
+
+Antrean disimpan di data/waitlist.json supaya dipakai bersama semua proses
+(Streamlit dan api.py); perubahan selalu di bawah file lock.
+"""
+
+import heapq
+import json
+import os
+import threading
+from datetime import date as Date
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from storage import atomic_write_json, file_lock, file_version
+
+WAITLIST_FILE = "data/waitlist.json"
+# Angka kecil didahulukan
+PRIORITIES = {"reguler": 0, "adhoc": 1}
+PRIORITY_LABELS = {"reguler": "Kuliah reguler", "adhoc": "Ad-hoc"}
+# Pemberitahuan promosi yang disimpan per user sampai dibaca
+MAX_NOTICES = 20
+
+
+class WaitlistEntry:
+    __slots__ = (
+        "id",
+        "seq",
+        "room",
+        "date",
+        "start_hour",
+        "duration",
+        "user",
+        "matkul",
+        "priority",
+    )
+
+    def __init__(
+        self,
+        seq: int,
+        room: str,
+        date: str,
+        start_hour: int,
+        duration: int,
+        user: str,
+        matkul: str = "-",
+        priority: str = "reguler",
+    ):
+        self.id = f"W{seq}"
+        self.seq = seq
+        self.room = room
+        self.date = date
+        self.start_hour = start_hour
+        self.duration = duration
+        self.user = user
+        self.matkul = matkul
+        self.priority = priority
+
+    @property
+    def rank(self) -> Tuple[int, int]:
+        """Urutan di heap: prioritas, lalu siapa yang mendaftar lebih dulu"""
+        return PRIORITIES.get(self.priority, len(PRIORITIES)), self.seq
+
+    def to_dict(self) -> dict:
+        return {
+            "seq": self.seq,
+            "room": self.room,
+            "date": self.date,
+            "start_hour": self.start_hour,
+            "duration": self.duration,
+            "user": self.user,
+            "matkul": self.matkul,
+            "priority": self.priority,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WaitlistEntry":
+        return cls(
+            int(data["seq"]),
+            data["room"],
+            data["date"],
+            int(data["start_hour"]),
+            int(data["duration"]),
+            data["user"],
+            data.get("matkul", "-"),
+            data.get("priority", "reguler"),
+        )
+
+
+# Hasil mencoba satu permintaan: True di-commit, False belum muat (tetap
+# antre), None tidak berlaku lagi (dibuang)
+TryCommit = Callable[[WaitlistEntry], Optional[bool]]
+
+
+class Waitlist:
+    """Antrean dari waitlist.json dengan heap per (ruangan, tanggal) di memori"""
+
+    def __init__(self, waitlist_file: str = WAITLIST_FILE):
+        self.waitlist_file = waitlist_file
+        self._lock = threading.Lock()
+        self._version: Hashable = None
+        self._data: dict = {}
+        self._heaps: Dict[Tuple[str, str], List[Tuple[Tuple[int, int], str]]] = {}
+        self._entries: Dict[str, WaitlistEntry] = {}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.waitlist_file, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"next_seq": 1, "entries": [], "notices": {}}
+
+    def _build(self, data: dict, version: Hashable):
+        entries = [WaitlistEntry.from_dict(item) for item in data["entries"]]
+        heaps: Dict[Tuple[str, str], List[Tuple[Tuple[int, int], str]]] = {}
+        for entry in entries:
+            heaps.setdefault((entry.room, entry.date), []).append(
+                (entry.rank, entry.id)
+            )
+        for heap in heaps.values():
+            heapq.heapify(heap)
+        self._data = data
+        self._entries = {entry.id: entry for entry in entries}
+        self._heaps = heaps
+        self._version = version
+
+    def _refresh(self):
+        version = file_version(self.waitlist_file)
+        if version != self._version or not self._data:
+            self._build(self._load(), version)
+
+    def _write(self, data: dict):
+        # Permintaan untuk tanggal yang sudah lewat tidak akan pernah dipromosikan
+        today = Date.today().strftime("%Y-%m-%d")
+        data["entries"] = [item for item in data["entries"] if item["date"] >= today]
+        os.makedirs(os.path.dirname(self.waitlist_file) or ".", exist_ok=True)
+        atomic_write_json(self.waitlist_file, data, indent=2)
+        self._build(data, file_version(self.waitlist_file))
+
+    def entries_of(self, user: str) -> List[WaitlistEntry]:
+        with self._lock:
+            self._refresh()
+            return sorted(
+                (entry for entry in self._entries.values() if entry.user == user),
+                key=lambda entry: (entry.date, entry.start_hour, entry.room),
+            )
+
+    def queue(self, room: str, date: str) -> List[WaitlistEntry]:
+        """Antrean satu ruangan dan tanggal, urut seperti saat dipromosikan"""
+        with self._lock:
+            self._refresh()
+            heap = self._heaps.get((room, date), [])
+            return [self._entries[entry_id] for _, entry_id in sorted(heap)]
+
+    def add(
+        self,
+        room: str,
+        date: str,
+        start_hour: int,
+        duration: int,
+        user: str,
+        matkul: str = "-",
+        priority: str = "reguler",
+    ) -> Optional[WaitlistEntry]:
+        """Antrekan permintaan; None jika user sudah mengantre untuk slot yang sama"""
+        with self._lock, file_lock(self.waitlist_file):
+            data = self._load()
+            for item in data["entries"]:
+                if (item["room"], item["date"], item["start_hour"], item["user"]) == (
+                    room,
+                    date,
+                    start_hour,
+                    user,
+                ):
+                    return None
+            entry = WaitlistEntry(
+                data["next_seq"],
+                room,
+                date,
+                start_hour,
+                duration,
+                user,
+                matkul,
+                priority,
+            )
+            data["next_seq"] += 1
+            data["entries"].append(entry.to_dict())
+            self._write(data)
+            return entry
+
+    def remove(self, entry_id: str, user: str) -> bool:
+        """Keluarkan permintaan milik user dari antrean"""
+        with self._lock, file_lock(self.waitlist_file):
+            data = self._load()
+            kept = [
+                item
+                for item in data["entries"]
+                if f"W{item['seq']}" != entry_id or item["user"] != user
+            ]
+            if len(kept) == len(data["entries"]):
+                return False
+            data["entries"] = kept
+            self._write(data)
+            return True
+
+    def promote(
+        self, room: str, date: str, try_commit: TryCommit
+    ) -> List[WaitlistEntry]:
+        """Coba antrean (room, date) dari depan heap setelah ada slot kosong.
+
+        Jam yang diminta permintaan yang masih menunggu tidak diberikan ke
+        permintaan di belakangnya, jadi permintaan berprioritas rendah tidak
+        bisa mengambil sebagian jam yang sedang ditunggu permintaan di depannya.
+
+        Dijalankan di bawah file lock antrean, jadi dua pembatalan bersamaan
+        tidak mempromosikan permintaan yang sama dua kali. Commit booking
+        sendiri tetap atomik di storage, sehingga booking baru dari sesi lain
+        tidak bisa tertimpa.
+        """
+        with self._lock:
+            self._refresh()
+            if (room, date) not in self._heaps:
+                return []
+        with self._lock, file_lock(self.waitlist_file):
+            self._build(self._load(), file_version(self.waitlist_file))
+            heap = list(self._heaps.get((room, date), []))
+            promoted: List[WaitlistEntry] = []
+            dropped = set()
+            # Jam yang masih ditunggu permintaan di depan
+            waiting_hours = set()
+            while heap:
+                _, entry_id = heapq.heappop(heap)
+                entry = self._entries[entry_id]
+                hours = range(entry.start_hour, entry.start_hour + entry.duration)
+                if waiting_hours.intersection(hours):
+                    waiting_hours.update(hours)
+                    continue
+                result = try_commit(entry)
+                if result is None:
+                    dropped.add(entry_id)
+                elif result:
+                    promoted.append(entry)
+                    dropped.add(entry_id)
+                else:
+                    waiting_hours.update(hours)
+            if not dropped:
+                return []
+            data = self._data
+            data["entries"] = [
+                item for item in data["entries"] if f"W{item['seq']}" not in dropped
+            ]
+            for entry in promoted:
+                notices = data.setdefault("notices", {}).setdefault(entry.user, [])
+                notices.append(
+                    f"Daftar tunggu: ruangan {entry.room} berhasil dibooking untuk "
+                    f"{entry.date} jam {entry.start_hour:02d}:00 - "
+                    f"{entry.start_hour + entry.duration:02d}:00"
+                )
+                del notices[:-MAX_NOTICES]
+            self._write(data)
+            return promoted
+
+    def pop_notices(self, user: str) -> List[str]:
+        """Pemberitahuan promosi untuk user, dihapus setelah dibaca"""
+        with self._lock:
+            self._refresh()
+            if not self._data.get("notices", {}).get(user):
+                return []
+        with self._lock, file_lock(self.waitlist_file):
+            data = self._load()
+            notices = data.get("notices", {}).pop(user, [])
+            if notices:
+                self._write(data)
+            return notices
+
+
+_shared_waitlist: Optional[Waitlist] = None
+_shared_lock = threading.Lock()
+
+
+def get_waitlist() -> Waitlist:
+    global _shared_waitlist
+    with _shared_lock:
+        if _shared_waitlist is None:
+            _shared_waitlist = Waitlist()
+        return _shared_waitlist